@@ -0,0 +1,66 @@
+import time
+from urllib.parse import quote
+
+import pytest
+from selenium.webdriver.common.by import By
+
+from ..common.base_methods import BasePage
+from ..helpers.metrics import metrics
+
+CLICKS = 20
+BUTTONS_PAGE = 'data:text/html;charset=utf-8,' + quote(
+    '<html><body><p id="clicks">0</p>' +
+    ''.join(f'<button id="btn_{i}" onclick="var c = document.getElementById(\'clicks\');'
+            f'c.textContent = +c.textContent + 1">{i}</button>' for i in range(CLICKS)) +
+    '</body></html>')
+BUTTON = lambda i: (By.ID, f'btn_{i}')
+CLICKS_COUNTER = (By.ID, 'clicks')
+
+
+@pytest.mark.benchmark
+class TestClickLatency:
+    @pytest.fixture(autouse=True)
+    def setup(self, driver):
+        """
+        Setup fixture to initialize the BasePage object.
+
+        Args:
+            driver: WebDriver instance used for interacting with the browser.
+        """
+        self.page = BasePage(driver)
+
+    def legacy_click(self, locator):
+        """
+        Clicks an element the way BasePage.click did before the actionability check: a fixed sleep,
+        a polling clickability wait and a separate lookup.
+
+        Args:
+            locator (tuple): The locator tuple (By.<method>, <value>) for finding the element.
+        """
+        time.sleep(0.5)
+        self.page.wait_for_element_to_be_clickable(locator)
+        self.page.driver.find_element(*locator).click()
+
+    def test_click_latency(self):
+        """
+        Compares the total latency of clicking every button on a page with the legacy click and with the
+        actionability based BasePage.click.
+        """
+        self.page.open_url(BUTTONS_PAGE)
+
+        start = time.perf_counter()
+        for i in range(CLICKS):
+            self.legacy_click(BUTTON(i))
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(CLICKS):
+            self.page.click(BUTTON(i))
+        actionable = time.perf_counter() - start
+
+        metrics.record('benchmark.click.legacy', legacy, label=f'{CLICKS} clicks')
+        metrics.record('benchmark.click.actionable', actionable, label=f'{CLICKS} clicks')
+        clicks = int(self.page.find_element(CLICKS_COUNTER).text)
+
+        assert clicks == 2 * CLICKS, f"Expected {2 * CLICKS} clicks, but got {clicks}"
+        assert actionable < legacy, f"Actionable clicks took {actionable:.3f}s, legacy clicks {legacy:.3f}s"
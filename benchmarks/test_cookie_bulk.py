@@ -0,0 +1,74 @@
+import time
+
+import pytest
+
+from ..helpers.cookies import supports_cdp
+from ..helpers.metrics import CommandCounter, metrics
+from ..pages.cookies_page import CookiesLocators, CookiesPage
+
+PREFIX = 'bench_'
+KEPT_PER_DOMAIN = 150
+
+
+@pytest.mark.benchmark
+class TestCookieBulk:
+    @pytest.fixture(autouse=True)
+    def setup(self, driver):
+        """
+        Setup fixture to initialize the CookiesPage object.
+
+        Args:
+            driver: WebDriver instance used for interacting with the browser.
+        """
+        self.page = CookiesPage(driver)
+
+    def measure(self, name, count, operation):
+        """
+        Runs a cookie operation and records its duration and number of WebDriver commands.
+
+        Args:
+            name (str): The name of the operation and path, used in the metric names.
+            count (int): The number of cookies, used as label.
+            operation (callable): The operation to measure.
+
+        Returns:
+            The value returned by the operation.
+        """
+        with CommandCounter(self.page.driver) as commands:
+            start = time.perf_counter()
+            result = operation()
+            duration = time.perf_counter() - start
+        metrics.record(f'benchmark.cookies.{name}', duration, label=f'{count} cookies')
+        metrics.increment(f'benchmark.cookies.{name}.commands[{count}]', commands.total)
+        return result
+
+    def read_benchmark_cookies(self, name, count, use_cdp):
+        """Reads the cookies set by the benchmark, keyed by name."""
+        cookies = self.measure(name, count, lambda: self.page.get_all_cookies(use_cdp=use_cdp))
+        return {cookie['name']: cookie['value'] for cookie in cookies if cookie['name'].startswith(PREFIX)}
+
+    @pytest.mark.parametrize('count', [10, 100, 1000])
+    def test_cookie_bulk(self, count):
+        """
+        Compares setting and reading cookies one WebDriver command per cookie with the bulk DevTools calls.
+
+        Browsers keep a limited number of cookies per domain (about 180 in Chromium) and evict the oldest ones,
+        so with 1000 cookies both paths are compared on the cookies that were kept.
+        """
+        if not supports_cdp(self.page.driver):
+            pytest.skip('DevTools cookies are available in Chromium based browsers only')
+        cookies = [{'name': f'{PREFIX}{i}', 'value': str(i)} for i in range(count)]
+        self.page.open_url(CookiesLocators.URL_1)
+
+        self.page.delete_all_cookies()
+        self.measure('set.webdriver', count, lambda: self.page.set_cookies(cookies, use_cdp=False))
+        webdriver_cookies = self.read_benchmark_cookies('get.webdriver', count, use_cdp=False)
+
+        self.page.delete_all_cookies()
+        self.measure('set.cdp', count, lambda: self.page.set_cookies(cookies))
+        cdp_cookies = self.read_benchmark_cookies('get.cdp', count, use_cdp=True)
+
+        assert cdp_cookies == webdriver_cookies, \
+            f"DevTools kept {len(cdp_cookies)} cookies, WebDriver {len(webdriver_cookies)}"
+        if count <= KEPT_PER_DOMAIN:
+            assert len(cdp_cookies) == count, f"Expected {count} cookies, got {len(cdp_cookies)}"
@@ -0,0 +1,93 @@
+import time
+import tracemalloc
+from urllib.parse import quote
+
+import pytest
+from selenium.webdriver.common.by import By
+
+from ..helpers.metrics import metrics
+from ..helpers.streams import stream_sum
+from ..pages.scrolling_page import ScrollingPage
+
+ITEMS = 100000
+BATCH = 1000
+FEED_PAGE = 'data:text/html;charset=utf-8,' + quote(
+    '<html><body><div id="feed" style="height: 300px; overflow-y: scroll"></div><script>'
+    'var feed = document.getElementById("feed"), loaded = 0;'
+    'function load() {'
+    '  var end = Math.min(loaded + %d, %d), html = "";'
+    '  for (; loaded < end; loaded++) {'
+    '    html += "<span style=\\"display: block\\"" +'
+    '      (loaded === %d - 1 ? " class=\\"last-of-list\\"" : "") + ">" + loaded + "</span>";'
+    '  }'
+    '  feed.insertAdjacentHTML("beforeend", html);'
+    '}'
+    'feed.addEventListener("scroll", function () {'
+    '  if (feed.scrollTop + feed.clientHeight >= feed.scrollHeight - 10 && loaded < %d) { load(); }'
+    '});'
+    'load();'
+    '</script></body></html>' % (BATCH, ITEMS, ITEMS, ITEMS))
+FEED = (By.ID, 'feed')
+ITEM = (By.TAG_NAME, 'span')
+LAST_ITEM_CLASS = 'last-of-list'
+JS_HEAP = "return window.performance.memory ? performance.memory.usedJSHeapSize : null;"
+
+
+@pytest.mark.benchmark
+class TestStreamMemory:
+    @pytest.fixture(autouse=True)
+    def setup(self, driver):
+        """
+        Setup fixture to initialize the ScrollingPage object.
+
+        Args:
+            driver: WebDriver instance used for interacting with the browser.
+        """
+        self.page = ScrollingPage(driver)
+
+    def measure(self, name, reduce):
+        """
+        Runs a reduction over the synthetic feed and records its duration and memory use.
+
+        Args:
+            name (str): The name of the harvesting strategy, used in the metric names.
+            reduce (callable): Harvests the feed and returns the sum of its values.
+
+        Returns:
+            tuple: The sum, the peak of Python allocations in bytes and the JS heap size in bytes or None.
+        """
+        self.page.open_url(FEED_PAGE)
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            total = reduce()
+            duration = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        heap = self.page.driver.execute_script(JS_HEAP)
+        metrics.record(f'benchmark.stream.{name}', duration, label=f'{ITEMS} items')
+        metrics.increment(f'benchmark.stream.{name}.python_peak_bytes', peak)
+        if heap is not None:
+            metrics.increment(f'benchmark.stream.{name}.js_heap_bytes', heap)
+        return total, peak, heap
+
+    def test_stream_memory(self):
+        """
+        Compares harvesting the whole feed into a list with streaming it in chunks while pruning processed items
+        from the page.
+        """
+        expected = sum(range(ITEMS))
+
+        listed, listed_peak, listed_heap = self.measure(
+            'list', lambda: sum(int(value) for value in self.page.harvest_values(FEED, ITEM, LAST_ITEM_CLASS)))
+        streamed, streamed_peak, streamed_heap = self.measure(
+            'stream', lambda: stream_sum(self.page.iter_values(FEED, ITEM, LAST_ITEM_CLASS, prune=True)))
+
+        assert listed == expected, f"Should be - {expected}, got - {listed}"
+        assert streamed == expected, f"Should be - {expected}, got - {streamed}"
+        assert streamed_peak < listed_peak, \
+            f"Streaming peaked at {streamed_peak} bytes, the list at {listed_peak} bytes"
+        if listed_heap is not None and streamed_heap is not None:
+            assert streamed_heap < listed_heap, \
+                f"Streaming left a JS heap of {streamed_heap} bytes, the list {listed_heap} bytes"
@@ -0,0 +1,85 @@
+import time
+from urllib.parse import quote
+
+import pytest
+from selenium.webdriver.common.by import By
+
+from ..common.base_methods import BasePage
+from ..common.conditions import clickable, present, sequence, visible
+from ..helpers.metrics import CommandCounter, metrics
+
+DELAY_MS = 700
+DELAYED_TEXT_PAGE = 'data:text/html;charset=utf-8,' + quote(
+    '<html><body><p id="message"></p>'
+    '<button id="start" onclick="var m = document.getElementById(\'message\'); m.textContent = \'\';'
+    f'setTimeout(function () {{ m.textContent = \'done\'; }}, {DELAY_MS})">start</button>'
+    '</body></html>')
+START = (By.ID, 'start')
+MESSAGE = (By.ID, 'message')
+
+
+@pytest.mark.benchmark
+class TestWaitLatency:
+    @pytest.fixture(autouse=True)
+    def setup(self, driver):
+        """
+        Setup fixture to initialize the BasePage object.
+
+        Args:
+            driver: WebDriver instance used for interacting with the browser.
+        """
+        self.page = BasePage(driver)
+
+    def measure(self, name, wait):
+        """
+        Starts the delayed text change and records how long a wait for it blocked beyond the delay and how
+        many WebDriver commands it sent.
+
+        Args:
+            name (str): The name of the wait, used in the metric names.
+            wait (callable): Waits for the text and returns it.
+
+        Returns:
+            float: The seconds the wait blocked beyond the delay of the page.
+        """
+        self.page.driver.find_element(*START).click()
+        with CommandCounter(self.page.driver) as commands:
+            start = time.perf_counter()
+            text = wait()
+            latency = time.perf_counter() - start - DELAY_MS / 1000
+        metrics.record(f'benchmark.wait.{name}', latency, label=f'{DELAY_MS}ms delay')
+        metrics.increment(f'benchmark.wait.{name}.commands', commands.total)
+        assert text == 'done', f"Expected 'done', but got {text!r}"
+        return latency
+
+    def test_wait_latency(self):
+        """
+        Compares the detection latency and command traffic of a polling WebDriverWait at the default interval of
+        0.5s and of the MutationObserver based BasePage.observe_text.
+        """
+        self.page.open_url(DELAYED_TEXT_PAGE)
+        polling = self.measure('polling', lambda: self.page.wait_policy.wait(
+            self.page.driver, lambda driver: driver.find_element(*MESSAGE).text, 'text', poll_frequency=0.5,
+            label=str(MESSAGE)))
+        observed = self.measure('observed', lambda: self.page.observe_text(MESSAGE))
+
+        assert observed < polling, f"Observed wait took {observed:.3f}s, polling wait {polling:.3f}s beyond the delay"
+
+    def test_composite_wait_commands(self):
+        """
+        Compares the WebDriver commands of waiting for an element to be present, visible and clickable and reading
+        its text with chained WebDriverWaits and with a single composite BasePage.wait_for.
+        """
+        self.page.open_url(DELAYED_TEXT_PAGE)
+        with CommandCounter(self.page.driver) as chained:
+            self.page.wait_for_element_to_be_present(START)
+            self.page.wait_for_element_to_be_visible(START)
+            self.page.wait_for_element_to_be_clickable(START)
+            chained_text = self.page.driver.find_element(*START).text
+        with CommandCounter(self.page.driver) as composite:
+            result = self.page.wait_for(sequence(present(START), visible(START), clickable(START)), text=True)
+        metrics.increment('benchmark.wait.chained.commands', chained.total)
+        metrics.increment('benchmark.wait.composite.commands', composite.total)
+
+        assert result['text'] == chained_text, f"Expected {chained_text!r}, but got {result['text']!r}"
+        assert composite.total == 1, f"Composite wait sent {composite.total} commands"
@@ -0,0 +1,144 @@
+from selenium.webdriver.common.actions import interaction
+from selenium.webdriver.common.actions.action_builder import ActionBuilder
+from selenium.webdriver.common.actions.mouse_button import MouseButton
+from selenium.webdriver.common.actions.pointer_input import PointerInput
+from selenium.webdriver.remote.webelement import WebElement
+
+from ..helpers.metrics import metrics
+
+
+class ActionSequence:
+    """
+    Compiles pointer gestures into a single W3C Actions payload that is dispatched with one command.
+
+    Unlike a shared ActionChains that is performed step by step, a sequence collects every move, press and
+    release of a gesture, or of a batch of independent drags, and sends them in one `perform` call.
+    A point is either a WebElement, resolved by the browser when the move is dispatched, or a pre-resolved
+    (x, y) tuple of viewport coordinates.
+
+    Usage:
+        ActionSequence(driver).drag(source, target).drag(other, target).perform()
+    """
+
+    def __init__(self, driver, move_duration=250):
+        """
+        Initializes an empty sequence.
+
+        Args:
+            driver (WebDriver): The WebDriver instance the sequence is dispatched to.
+            move_duration (int): The default duration of a pointer move in milliseconds.
+        """
+        self.driver = driver
+        self.move_duration = move_duration
+        self.pointer = PointerInput(interaction.POINTER_MOUSE, 'mouse')
+        self.builder = ActionBuilder(driver, mouse=self.pointer)
+        self.size = 0
+
+    def _add(self, action, **kwargs):
+        """Appends a single pointer action."""
+        getattr(self.pointer, action)(**kwargs)
+        self.size += 1
+        return self
+
+    def move_to(self, point, x_offset=0, y_offset=0, duration=None):
+        """
+        Moves the pointer to a point.
+
+        Args:
+            point (WebElement or tuple): An element, whose in-view center is the origin of the offsets,
+                                         or (x, y) viewport coordinates.
+            x_offset (int): The horizontal offset from the point.
+            y_offset (int): The vertical offset from the point.
+            duration (int, optional): The duration of the move in milliseconds. Defaults to `move_duration`.
+
+        Returns:
+            ActionSequence: The sequence, for chaining.
+        """
+        duration = self.move_duration if duration is None else duration
+        if isinstance(point, WebElement):
+            return self._add('create_pointer_move', duration=duration, x=int(x_offset), y=int(y_offset),
+                             origin=point)
+        x, y = point
+        return self._add('create_pointer_move', duration=duration, x=int(x + x_offset), y=int(y + y_offset))
+
+    def move_by(self, x_offset, y_offset=0, duration=None):
+        """
+        Moves the pointer relative to its current position.
+
+        Args:
+            x_offset (int): The horizontal offset.
+            y_offset (int): The vertical offset.
+            duration (int, optional): The duration of the move in milliseconds. Defaults to `move_duration`.
+
+        Returns:
+            ActionSequence: The sequence, for chaining.
+        """
+        duration = self.move_duration if duration is None else duration
+        return self._add('create_pointer_move', duration=duration, x=int(x_offset), y=int(y_offset),
+                         origin='pointer')
+
+    def press(self):
+        """Presses the left mouse button."""
+        return self._add('create_pointer_down', button=MouseButton.LEFT)
+
+    def release(self):
+        """Releases the left mouse button."""
+        return self._add('create_pointer_up', button=MouseButton.LEFT)
+
+    def pause(self, seconds):
+        """
+        Waits between two actions without sending a command.
+
+        Args:
+            seconds (float): The duration of the pause.
+        """
+        return self._add('create_pause', pause_duration=seconds)
+
+    def drag(self, source, *points, duration=None):
+        """
+        Presses on the source, moves through every point and releases on the last one.
+
+        Args:
+            source (WebElement or tuple): Where the drag starts.
+            *points (WebElement or tuple): The points the pointer passes, the drop point last.
+            duration (int, optional): The duration of every move in milliseconds. Defaults to `move_duration`.
+
+        Returns:
+            ActionSequence: The sequence, for chaining.
+        """
+        self.move_to(source, duration=0).press()
+        for point in points:
+            self.move_to(point, duration=duration)
+        return self.release()
+
+    def drag_by(self, source, x_offset, y_offset=0, duration=None):
+        """
+        Presses on the source, moves the pointer by an offset and releases.
+
+        Args:
+            source (WebElement or tuple): Where the drag starts.
+            x_offset (int): The horizontal offset.
+            y_offset (int): The vertical offset.
+            duration (int, optional): The duration of the move in milliseconds. Defaults to `move_duration`.
+
+        Returns:
+            ActionSequence: The sequence, for chaining.
+        """
+        return self.move_to(source, duration=0).press().move_by(x_offset, y_offset, duration).release()
+
+    def perform(self, label=None):
+        """
+        Dispatches the whole sequence with a single W3C Actions command and clears it.
+
+        The dispatch time is recorded in `metrics` under 'actions.perform'.
+
+        Args:
+            label (str, optional): What the sequence does, used to list the slowest dispatches.
+        """
+        if not self.size:
+            return
+        label = f"{label or 'sequence'} ({self.size} actions)"
+        with metrics.timer('actions.perform', label):
+            self.builder.perform()
+        metrics.increment('actions.dispatched', self.size)
+        self.size = 0
@@ -1,11 +1,21 @@
+import time
+from collections import deque
+from contextlib import contextmanager
+
 import allure
 from allure_commons.types import AttachmentType
 
 from ..helpers.allure_helper import step
+from ..helpers.metrics import metrics
+from ..helpers.storage_state import capture, load, restore, save
+from .scripts import (FEED_PROMPTS, IS_NAVIGATED, NAVIGATE, OBSERVE, QUERY_FRAMES, SET_CONTROL_VALUES, SNAPSHOT,
+                      WAIT_FOR_ACTIONABLE, to_query)
+from .conditions import describe, visible
+from .wait_policy import DEFAULT_WAIT_POLICY
+from selenium.common import (InvalidSelectorException, JavascriptException, NoAlertPresentException,
+                             NoSuchElementException, NoSuchFrameException, TimeoutException)
 from selenium.webdriver import ActionChains
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
-import time
 
 
 class BasePage:
@@ -13,14 +23,19 @@ class BasePage:
     A base class for Selenium page object models. Provides common methods for interacting with web elements.
     """
 
-    def __init__(self, driver):
+    def __init__(self, driver, wait_policy=None):
         """
         Initializes the BasePage with a WebDriver instance.
 
         Args:
             driver (WebDriver): The Selenium WebDriver instance for interacting with the browser.
+            wait_policy (WaitPolicy, optional): The timeouts and polling intervals of explicit waits.
+                                                Defaults to the shared default policy.
         """
         self.driver = driver
+        self.wait_policy = wait_policy or DEFAULT_WAIT_POLICY
+        # The frame paths found by `query_frames` per page URL
+        self._frame_paths = {}
 
     def take_screenshot_as_png(self, name):
         """
@@ -42,7 +57,8 @@ class BasePage:
         Args:
             url (str): The URL to be opened.
         """
-        self.driver.get(url)
+        with metrics.timer('page.open_url', label=url):
+            self.driver.get(url)
 
     @step
     def refresh_page(self):
@@ -52,15 +68,12 @@ class BasePage:
     @step
     def click(self, locator):
         """
-        Clicks the specified web element.
+        Clicks the specified web element as soon as it is ready for interaction.
 
         Args:
             locator (tuple): The locator tuple (By.<method>, <value>) for finding the element.
         """
-        time.sleep(0.5)  # Ensures the element is ready for interaction
-        self.wait_for_element_to_be_clickable(locator=locator)
-        element = self.driver.find_element(*locator)
-        element.click()
+        self.wait_for_element_to_be_actionable(locator).click()
 
     @step
     def get_text_from_element(self, locator):
@@ -73,36 +86,267 @@ class BasePage:
         Returns:
             text[string]: text from element.
         """
-        self.wait_for_element_to_be_visible(locator=locator)
-        element = self.driver.find_element(*locator)
-        return element.text
+        return self.wait_for(visible(locator), text=True)['text']
 
     @step
-    def find_elements(self, locator):
+    def find_elements(self, locator, timeout=None):
         """
         Finds all web elements matching the given locator.
 
         Args:
             locator (tuple): The locator tuple (By.<method>, <value>) for finding the elements.
+            timeout (int): time to wait for the first element. Defaults to the wait policy, 0 returns at once.
 
         Returns:
             list[WebElement]: A list of found web elements.
         """
-        self.wait_for_element_to_be_present(locator=locator)
+        if timeout != 0:
+            self.wait_for_element_to_be_present(locator=locator, timeout=timeout)
         return self.driver.find_elements(*locator)
 
     @step
-    def find_element(self, locator):
+    def find_element(self, locator, timeout=None):
         """
-        Finds web element matching the given locator.
+        Finds web element matching the given locator, waiting for it to appear in the DOM.
 
         Args:
             locator (tuple): The locator tuple (By.<method>, <value>) for finding the elements.
+            timeout (int): time to wait for the element. Defaults to the wait policy.
+
+        Returns:
+            WebElement: found web element.
+        """
+        return self.wait_policy.wait(self.driver, lambda driver: driver.find_element(*locator), 'find', timeout,
+                                     label=str(locator))
+
+    @step
+    def find_child(self, parent, locator, timeout=None):
+        """
+        Finds web element matching the given locator inside a parent element, waiting for it to appear.
+
+        Args:
+            parent (WebElement): The element to search in.
+            locator (tuple): The locator tuple (By.<method>, <value>) relative to the parent element.
+            timeout (int): time to wait for the element. Defaults to the wait policy.
 
         Returns:
             WebElement: found web element.
         """
-        return self.driver.find_element(*locator)
+        return self.wait_policy.wait(parent, lambda element: element.find_element(*locator), 'find', timeout,
+                                     label=str(locator))
+
+    @step
+    def is_element_present(self, locator):
+        """
+        Checks without waiting whether an element matching the given locator is in the DOM.
+
+        Args:
+            locator (tuple): The locator tuple (By.<method>, <value>) for finding the element.
+
+        Returns:
+            bool: True if the element is present, False otherwise.
+        """
+        return len(self.driver.find_elements(*locator)) > 0
+
+    @step
+    def snapshot(self, elements_or_locator, text=True, attrs=(), css=(), rect=False, child_text=None, root=None):
+        """
+        Reads text, attributes, CSS properties and geometry of many elements in a single script execution.
+
+        Args:
+            elements_or_locator (list or tuple): A list of WebElements, or a locator tuple (By.<method>, <value>)
+                                                 resolved inside the browser.
+            text (bool): Whether to read the rendered text of every element (key 'text').
+            attrs (iterable): Attribute names to read (key 'attrs'), resolved like WebElement.get_attribute.
+            css (iterable): CSS property names to read as computed values (key 'css').
+            rect (bool): Whether to read the bounding client rect of every element (key 'rect').
+            child_text (tuple, optional): Locator of a descendant of every element whose text is read as well
+                                          (key 'child_text').
+            root (WebElement, optional): The element a locator is resolved against. Defaults to the document.
+
+        Returns:
+            list[dict]: One record per element, holding the WebElement under the key 'element' and the requested
+                        values under the keys listed above.
+        """
+        if isinstance(elements_or_locator, tuple):
+            elements, query = [], to_query(elements_or_locator)
+        else:
+            elements, query = list(elements_or_locator), None
+        options = {'text': text, 'attrs': list(attrs), 'css': list(css), 'rect': rect,
+                   'child_text': to_query(child_text) if child_text else None}
+        return self.driver.execute_script(SNAPSHOT, elements, query, root, options)
+
+    @step
+    def set_control_values(self, containers_or_locator, control_locator, target_locator, root=None):
+        """
+        Sets form controls to the values displayed next to them and fires their events in a single script execution.
+
+        Within every container the value of the control is replaced by the text of the target element, then
+        bubbling 'input' and 'change' events are dispatched on the control.
+
+        Args:
+            containers_or_locator (list or tuple): A list of container WebElements, or a locator tuple
+                                                   (By.<method>, <value>) resolved inside the browser.
+            control_locator (tuple): Locator of the control within every container.
+            target_locator (tuple): Locator of the element within every container whose text is the new value.
+            root (WebElement, optional): The element a container locator is resolved against. Defaults to the
+                                         document.
+
+        Returns:
+            list[dict]: One report per container with the 'before', 'target' and 'after' values of the control,
+                        whether the control now holds the target value ('ok') and an 'error' if the control or
+                        the target was not found.
+        """
+        if isinstance(containers_or_locator, tuple):
+            containers, query = [], to_query(containers_or_locator)
+        else:
+            containers, query = list(containers_or_locator), None
+        return self.driver.execute_script(
+            SET_CONTROL_VALUES, containers, query, root, to_query(control_locator), to_query(target_locator))
+
+    @step
+    def query_frames(self, values, click=None, timeout=None):
+        """
+        Reads values from every frame of the page in a single script execution started in the top document.
+
+        The script visits the frames of the page, nested ones included, clicks the `click` element of every
+        same-origin frame and waits until all `values` of the clicked frames have text. Cross-origin frames
+        cannot be reached by the script and fall back to switching into them. The frame paths of a URL are
+        cached by the page object with the number of child frames of each frame. Before anything is clicked the
+        script checks that every cached frame still exists with the same number of child frames, nested frames
+        included, and discovers the frames again otherwise, so every frame is clicked once per query.
+
+        Args:
+            values (dict): The values to read, a locator tuple (By.<method>, <value>) of the element whose text
+                           is read by name.
+            click (tuple, optional): Locator of the element to click in every frame before reading. The script
+                                     clicks with `HTMLElement.click`, which dispatches an untrusted event.
+            timeout (float, optional): time to wait for the values after a click. Defaults to the wait policy.
+
+        Returns:
+            dict: A result per frame by its path, a tuple of indices into the frames of the top document, with
+                  the text of every value by name ('values', None for values not found), whether the frame was
+                  'clicked', whether it is 'cross_origin' and an 'error' or None.
+        """
+        url = self.driver.current_url
+        paths = self._frame_paths.get(url)
+        queries = {name: to_query(locator) for name, locator in values.items()}
+        with self.wait_policy.measure('frames', label=url):
+            reply = self.driver.execute_async_script(QUERY_FRAMES, paths, to_query(click) if click else None,
+                                                     queries, self.wait_policy.timeout('frames', timeout))
+        self._frame_paths[url] = [{'path': result['path'], 'crossOrigin': result['crossOrigin'],
+                                   'frames': result['frames']} for result in reply]
+
+        results = {}
+        for result in reply:
+            if result['crossOrigin']:
+                result = self._query_frame_by_switching(result['path'], values, click, timeout)
+            results[tuple(result['path'])] = {'values': result['values'], 'clicked': result['clicked'],
+                                              'cross_origin': result['crossOrigin'], 'error': result['error']}
+        metrics.increment('frames.switched', sum(result['cross_origin'] for result in results.values()))
+        return results
+
+    def _query_frame_by_switching(self, path, values, click, timeout):
+        """Queries a single frame like `query_frames` by switching into it, for cross-origin frames."""
+        result = {'path': path, 'crossOrigin': True, 'clicked': False, 'values': None, 'error': None}
+        try:
+            for index in path:
+                self.driver.switch_to.frame(index)
+            if click:
+                if not self.driver.find_elements(*click):
+                    result['error'] = 'click target not found'
+                    return result
+                self.click(click)
+                result['clicked'] = True
+            result['values'] = {name: self._frame_text(locator, timeout if result['clicked'] else 0)
+                                for name, locator in values.items()}
+            if result['clicked'] and not all(result['values'].values()):
+                result['error'] = 'values not found'
+        except (NoSuchElementException, NoSuchFrameException, TimeoutException) as error:
+            result['error'] = error.msg or type(error).__name__
+        finally:
+            self.driver.switch_to.default_content()
+        return result
+
+    def _frame_text(self, locator, timeout):
+        """Waits for the element of a locator in the current frame to have text, returns None if it has none."""
+        def has_text(driver):
+            elements = driver.find_elements(*locator)
+            return elements and elements[0].text.strip()
+
+        try:
+            return self.wait_policy.wait(self.driver, has_text, 'frames', timeout, label=str(locator))
+        except TimeoutException:
+            return None
+
+    @step
+    def feed_prompts(self, trigger, result, answers, rejected=None, timeout=None):
+        """
+        Answers the prompt opened by a trigger element with every answer in turn in a single script execution.
+
+        While the script runs, `window.prompt`, `window.alert` and `window.confirm` of the page are replaced by
+        stubs: prompts return the current answer, alerts are recorded and confirms are accepted, so no native
+        dialog opens. After every click on the trigger the text of the result element is read as soon as the
+        page changes it. Use the native dialog methods for tests that check the dialogs themselves.
+
+        Args:
+            trigger (tuple): Locator of the element whose click opens the prompt. The script clicks with
+                             `HTMLElement.click`, which dispatches an untrusted event.
+            result (tuple): Locator of the element the page writes the outcome to.
+            answers (iterable): The answers to try, in order.
+            rejected (str, optional): The result text of a wrong answer. If given, the script stops at the first
+                                      answer with another result.
+            timeout (float, optional): time to wait for the result of every answer. Defaults to the wait policy.
+
+        Returns:
+            list[dict]: One outcome per tried answer with the 'answer', the 'result' text, None if the page did
+                        not change the result element in time, and the 'dialogs' opened by the page, dicts with
+                        'type' and 'message' keys.
+
+        Raises:
+            NoSuchElementException: If the trigger or the result element is not found.
+        """
+        answers = [str(answer) for answer in answers]
+        with self.wait_policy.measure('prompts', label=f'{len(answers)} answers'):
+            reply = self.driver.execute_async_script(FEED_PROMPTS, to_query(trigger), to_query(result), answers,
+                                                     rejected, self.wait_policy.timeout('prompts', timeout))
+        if reply['error']:
+            raise NoSuchElementException(f"Prompts were not fed: {reply['error']}")
+        return reply['outcomes']
+
+    @step
+    def export_storage_state(self, path=None):
+        """
+        Exports the storage state of the session: every cookie and the local and session storage of the origin
+        of the current page. The storage of other origins is not exported.
+
+        Args:
+            path (str, optional): Also writes the state to this JSON file.
+
+        Returns:
+            dict: The state, see `helpers.storage_state.capture`.
+        """
+        state = capture(self.driver)
+        if path:
+            save(state, path)
+        return state
+
+    @step
+    def restore_storage_state(self, state):
+        """
+        Restores an exported storage state, without loading a page in Chromium based browsers.
+
+        The storage of an origin is written when the first page of the origin is loaded afterwards.
+
+        Args:
+            state (dict or str): The state, or the path of the JSON file it was exported to.
+
+        Returns:
+            str: The identifier of the storage seeding script, see `helpers.storage_state.restore`.
+        """
+        if isinstance(state, str):
+            state = load(state)
+        return restore(self.driver, state)
 
     @step
     def is_displayed(self, locator):
@@ -130,7 +374,7 @@ class BasePage:
         Returns:
             bool: True if the element is enabled, False otherwise.
         """
-        element = self.driver.find_element(*locator)
+        element = self.find_element(locator)
         return element.is_enabled()
 
     @step
@@ -142,117 +386,279 @@ class BasePage:
             locator (tuple): The locator tuple (By.<method>, <value>) for finding the element.
             keys (str): The text to be entered into the input field.
         """
-        self.wait_for_element_to_be_visible(locator=locator)
-        element = self.driver.find_element(*locator)
+        element = self.wait_for(visible(locator))['element']
         element.clear()
         element.send_keys(keys)
 
     @step
-    def wait_for_element_to_be_clickable(self, locator, timeout=10):
+    def wait_for_element_to_be_clickable(self, locator, timeout=None):
         """
         Waits until the specified element is clickable.
 
         Args:
             locator (tuple): The locator tuple (By.<method>, <value>) for finding the element.
-            timeout (int): time to wait until expected condition.
+            timeout (int): time to wait until expected condition. Defaults to the wait policy.
 
         Returns:
             WebElement: The clickable web element.
         """
-        wait = WebDriverWait(self.driver, timeout)
-        return wait.until(EC.element_to_be_clickable(locator))
+        return self.wait_policy.wait(self.driver, EC.element_to_be_clickable(locator), 'clickable',
+                                     timeout, label=str(locator))
+
+    @step
+    def wait_for_element_to_be_actionable(self, locator, timeout=None):
+        """
+        Waits in a single browser round trip until the specified element can be clicked: it is attached,
+        visible, enabled, has the same position in two consecutive animation frames and is not obscured
+        by another element at its click point.
+
+        Args:
+            locator (tuple): The locator tuple (By.<method>, <value>) for finding the element.
+            timeout (int): time to wait until expected condition. Defaults to the wait policy.
+
+        Returns:
+            WebElement: The actionable web element.
+
+        Raises:
+            TimeoutException: If the element is not actionable within the timeout.
+        """
+        with self.wait_policy.measure('actionable', label=str(locator)):
+            result = self.driver.execute_async_script(
+                WAIT_FOR_ACTIONABLE, to_query(locator), self.wait_policy.timeout('actionable', timeout))
+        if 'error' in result:
+            raise TimeoutException(f'Element {locator} is not actionable: {result["error"]}')
+        return result['element']
 
     @step
-    def wait_for_element_to_be_visible(self, locator, timeout=10):
+    def wait_for_element_to_be_visible(self, locator, timeout=None):
         """
         Waits until the specified element is visible on the page.
 
         Args:
             locator (tuple): The locator tuple (By.<method>, <value>) for finding the element.
-            timeout (int): time to wait until expected condition.
+            timeout (int): time to wait until expected condition. Defaults to the wait policy.
 
         Returns:
             WebElement: The visible web element.
         """
-        wait = WebDriverWait(self.driver, timeout)
-        return wait.until(EC.visibility_of_element_located(locator))
+        return self.wait_policy.wait(self.driver, EC.visibility_of_element_located(locator), 'visible',
+                                     timeout, label=str(locator))
 
     @step
-    def wait_for_element_to_be_invisible(self, locator, timeout=10):
+    def wait_for_element_to_be_invisible(self, locator, timeout=None):
         """
         Waits until the specified element is invisible on the page.
 
         Args:
             locator (tuple): The locator tuple (By.<method>, <value>) for finding the element.
-            timeout (int): time to wait until expected condition.
+            timeout (int): time to wait until expected condition. Defaults to the wait policy.
 
         Returns:
             WebElement: The visible web element.
         """
-        wait = WebDriverWait(self.driver, timeout)
-        return wait.until(EC.invisibility_of_element_located(locator))
+        return self.wait_policy.wait(self.driver, EC.invisibility_of_element_located(locator), 'invisible',
+                                     timeout, label=str(locator))
 
     @step
-    def wait_for_element_to_be_present(self, locator, timeout=10):
+    def wait_for_element_to_be_present(self, locator, timeout=None):
         """
         Waits until the specified element is present in the DOM.
 
         Args:
             locator (tuple): The locator tuple (By.<method>, <value>) for finding the element.
-            timeout (int): time to wait until expected condition.
+            timeout (int): time to wait until expected condition. Defaults to the wait policy.
 
         Returns:
             WebElement: The web element present in the DOM.
         """
-        wait = WebDriverWait(self.driver, timeout)
-        return wait.until(EC.presence_of_element_located(locator))
+        return self.wait_policy.wait(self.driver, EC.presence_of_element_located(locator), 'present',
+                                     timeout, label=str(locator))
 
     @step
-    def wait_for_text_to_be_present_in_element(self, locator, text, timeout=10):
+    def wait_for_text_to_be_present_in_element(self, locator, text, timeout=None):
         """
         Waits until the specified element is present in the DOM with text.
 
         Args:
             locator (tuple): The locator tuple (By.<method>, <value>) for finding the element.
             text (string): text to be present in element.
-            timeout (int): time to wait until expected condition.
+            timeout (int): time to wait until expected condition. Defaults to the wait policy.
 
         Returns:
             WebElement: The web element present in the DOM with text.
         """
-        wait = WebDriverWait(self.driver, timeout)
-        return wait.until(EC.text_to_be_present_in_element(locator, text))
+        return self.wait_policy.wait(self.driver, EC.text_to_be_present_in_element(locator, text), 'text',
+                                     timeout, label=str(locator))
 
     @step
-    def wait_element_to_be_selected(self, element, timeout=10):
+    def wait_element_to_be_selected(self, element, timeout=None):
         """
         Waits until the specified element is selected in the DOM.
 
         Args:
             element (WebElement): WbElement.
-            timeout (int): time to wait until expected condition.
+            timeout (int): time to wait until expected condition. Defaults to the wait policy.
 
         Returns:
             WebElement: The web element selected in the DOM.
         """
-        wait = WebDriverWait(self.driver, timeout)
-        return wait.until(EC.element_to_be_selected(element))
+        return self.wait_policy.wait(self.driver, EC.element_to_be_selected(element), 'selected',
+                                     timeout, label=element.id)
 
     @step
-    def wait_title_contain_text(self, text, timeout=30, poll_frequency=0.5):
+    def wait_title_contain_text(self, text, timeout=None, poll_frequency=None):
         """
         Waits until the page title contains text.
 
         Args:
             text (string): text.
-            timeout (int): time to wait until expected condition.
-            poll_frequency (float): sleep interval between calls. By default, it is 0.5 second.
+            timeout (int): time to wait until expected condition. Defaults to the wait policy.
+            poll_frequency (float): sleep interval between calls. Defaults to the wait policy.
 
         Returns:
             WebElement: The web element in the DOM.
         """
-        wait = WebDriverWait(self.driver, timeout, poll_frequency)
-        return wait.until(EC.title_contains(text))
+        return self.wait_policy.wait(self.driver, EC.title_contains(text), 'title', timeout, poll_frequency,
+                                     label=text)
+
+    @step
+    def wait_for(self, condition, text=False, attrs=(), rect=False, timeout=None):
+        """
+        Waits for a condition in a single browser round trip, resolving on the DOM mutation that meets it, and
+        reads values of the resolved element in the same round trip.
+
+        The condition, built with `common.conditions`, may combine several checks with `all_of`, `any_of` and
+        `sequence`. It is evaluated inside the page whenever a MutationObserver reports a change of the
+        document and every 100ms for changes without mutations, so no WebDriver commands are sent while waiting.
+        How long the condition took to be met in the page is recorded in `metrics` under 'observe.<kind>'.
+
+        Args:
+            condition (dict): The condition, see `common.conditions`.
+            text (bool): Whether to read the rendered text of the resolved element (key 'text').
+            attrs (iterable): Attribute names of the resolved element to read (key 'attrs'), resolved like
+                              WebElement.get_attribute.
+            rect (bool): Whether to read the bounding client rect of the resolved element (key 'rect').
+            timeout (float, optional): time to wait until the condition is met. Defaults to the wait policy.
+
+        Returns:
+            dict: The resolved 'element' (None for conditions without one), the text or title as 'value' for
+                  text and title checks, the 'seconds' it took to meet the condition, the requested values and,
+                  for composites, the 'results' of all_of and sequence or the 'index' of the met any_of condition.
+
+        Raises:
+            TimeoutException: If the condition is not met within the timeout.
+            InvalidSelectorException: If a locator of the condition is not a valid selector.
+            JavascriptException: If the condition cannot be evaluated, e.g. because of an unknown kind.
+        """
+        label = describe(condition)
+        read = {'text': text, 'attrs': list(attrs), 'rect': rect}
+        timeout = self.wait_policy.timeout('observe', timeout)
+        with self.wait_policy.measure('observe', label=label):
+            result = self.driver.execute_async_script(OBSERVE, condition, read, timeout)
+        if result.get('error') == 'timeout':
+            raise TimeoutException(f'Condition {label} was not met within {timeout}s')
+        if result.get('invalidSelector'):
+            raise InvalidSelectorException(f'Condition {label} has an invalid selector: {result["error"]}')
+        if 'error' in result:
+            raise JavascriptException(f'Condition {label} could not be evaluated: {result["error"]}')
+        metrics.record(f'observe.{condition["kind"]}', result['seconds'], label)
+        return result
+
+    @step
+    def observe(self, condition, locator=None, expected=None, timeout=None):
+        """
+        Waits for a single condition in a single browser round trip, see `wait_for`.
+
+        Args:
+            condition (str): 'present', 'visible', 'invisible', 'clickable', 'text' (the element has text
+                             containing `expected`, or any text if it is None) or 'title' (the title contains
+                             `expected`).
+            locator (tuple, optional): The locator tuple (By.<method>, <value>) of the element, not used for 'title'.
+            expected (str, optional): The text to wait for with 'text' and 'title'.
+            timeout (float, optional): time to wait until the condition is met. Defaults to the wait policy.
+
+        Returns:
+            dict: The matched 'element' (None for 'invisible' and 'title'), the text or title as 'value' for
+                  'text' and 'title' and the 'seconds' it took to meet the condition.
+
+        Raises:
+            TimeoutException: If the condition is not met within the timeout.
+            InvalidSelectorException: If the locator is not a valid selector.
+            JavascriptException: If the condition is unknown.
+        """
+        leaf = {'kind': condition, 'query': to_query(locator) if locator else None, 'expected': expected}
+        return self.wait_for(leaf, timeout=timeout)
+
+    @step
+    def observe_present(self, locator, timeout=None):
+        """
+        Waits until the specified element is present in the DOM, see `observe`.
+
+        Args:
+            locator (tuple): The locator tuple (By.<method>, <value>) for finding the element.
+            timeout (float, optional): time to wait until the condition is met. Defaults to the wait policy.
+
+        Returns:
+            WebElement: The web element present in the DOM.
+        """
+        return self.observe('present', locator, timeout=timeout)['element']
+
+    @step
+    def observe_visible(self, locator, timeout=None):
+        """
+        Waits until the specified element is visible on the page, see `observe`.
+
+        Args:
+            locator (tuple): The locator tuple (By.<method>, <value>) for finding the element.
+            timeout (float, optional): time to wait until the condition is met. Defaults to the wait policy.
+
+        Returns:
+            WebElement: The visible web element.
+        """
+        return self.observe('visible', locator, timeout=timeout)['element']
+
+    @step
+    def observe_invisible(self, locator, timeout=None):
+        """
+        Waits until the specified element is invisible or removed from the DOM, see `observe`.
+
+        Args:
+            locator (tuple): The locator tuple (By.<method>, <value>) for finding the element.
+            timeout (float, optional): time to wait until the condition is met. Defaults to the wait policy.
+
+        Returns:
+            float: The seconds it took the element to disappear.
+        """
+        return self.observe('invisible', locator, timeout=timeout)['seconds']
+
+    @step
+    def observe_text(self, locator, text=None, timeout=None):
+        """
+        Waits until the specified element has text, or text containing the given text, see `observe`.
+
+        Args:
+            locator (tuple): The locator tuple (By.<method>, <value>) for finding the element.
+            text (str, optional): The text to wait for. By default any text.
+            timeout (float, optional): time to wait until the condition is met. Defaults to the wait policy.
+
+        Returns:
+            str: The text of the element.
+        """
+        return self.observe('text', locator, text, timeout)['value']
+
+    @step
+    def observe_title(self, text, timeout=None):
+        """
+        Waits until the page title contains text, see `observe`.
+
+        Args:
+            text (str): The text to wait for.
+            timeout (float, optional): time to wait until the condition is met. Defaults to the wait policy.
+
+        Returns:
+            str: The title of the page.
+        """
+        return self.observe('title', expected=text, timeout=timeout)['value']
 
     @step
     def execute_script(self, script, *args):
@@ -276,14 +682,105 @@ class BasePage:
         self.driver.execute_script("arguments[0].scrollIntoView();", element)
 
     @step
-    def get_alert_text(self):
+    def wait_for_alert(self, timeout=None):
         """
-        Retrieves the text from the alert dialog.
+        Waits until an alert, confirm or prompt dialog is open.
+
+        With a BiDi dialog listener on the driver (--bidi) the wait ends on the event of the opened dialog, a
+        dialog returned by an earlier wait does not count again even if its closed event is still on its way.
+        As the event can arrive after the dialog opened, an open dialog without its event yet is found by
+        switching to it once the wait is over, e.g. at once with a timeout of 0, and its event is then given
+        one polling interval to arrive so that it does not count for a later wait. Otherwise the presence of an
+        alert is polled.
+
+        Args:
+            timeout (float, optional): time to wait for the dialog. Defaults to the wait policy.
+
+        Returns:
+            Alert: The open dialog.
+
+        Raises:
+            TimeoutException: If no dialog is open within the timeout.
+            NoAlertPresentException: If the page closed the dialog before it could be switched to.
+        """
+        listener = getattr(self.driver, 'dialog_listener', None)
+        if listener is None:
+            return self.wait_policy.wait(self.driver, EC.alert_is_present(), 'dialog', timeout, label='alert')
+        timeout = self.wait_policy.timeout('dialog', timeout)
+        with self.wait_policy.measure('dialog', label='alert'):
+            try:
+                listener.open_dialog(timeout)
+            except TimeoutException:
+                try:
+                    alert = self.driver.switch_to.alert
+                except NoAlertPresentException:
+                    raise TimeoutException(f'No dialog opened within {timeout}s') from None
+                try:
+                    listener.open_dialog(self.wait_policy.settings['dialog'][1])
+                except TimeoutException:
+                    pass
+                return alert
+        return self.driver.switch_to.alert
+
+    @contextmanager
+    def expect_dialog(self, timeout=None, accept=None, prompt_text=None):
+        """
+        Waits for a dialog opened by the actions in the `with` block.
+
+        Usage:
+            with page.expect_dialog(accept=True) as dialog:
+                page.click(locator)
+            text = dialog['message']
+
+        With a BiDi dialog listener on the driver (--bidi) only a dialog opened after entering the block counts
+        and the wait ends on its event. Otherwise an open dialog is polled for when the block exits.
+
+        Args:
+            timeout (float, optional): time to wait for the dialog after the block. Defaults to the wait policy.
+            accept (bool, optional): Accepts (True) or dismisses (False) the dialog. By default it stays open.
+            prompt_text (str, optional): Text to enter into a prompt before it is accepted.
+
+        Yields:
+            dict: Filled when the block exits with the 'type' of the dialog (None without the listener), its
+                  'message' and the 'seconds' waited for it after the block.
+
+        Raises:
+            TimeoutException: If no dialog opens within the timeout.
+        """
+        listener = getattr(self.driver, 'dialog_listener', None)
+        mark = listener.mark() if listener else None
+        dialog = {}
+        yield dialog
+        start = time.perf_counter()
+        timeout = self.wait_policy.timeout('dialog', timeout)
+        if listener is None:
+            alert = self.wait_policy.wait(self.driver, EC.alert_is_present(), 'dialog', timeout, label='dialog')
+            dialog.update(type=None, message=alert.text)
+        else:
+            with self.wait_policy.measure('dialog', label='dialog'):
+                opened = listener.next_dialog(mark, timeout)
+            dialog.update(type=opened['type'], message=opened['message'])
+            alert = self.driver.switch_to.alert
+        dialog['seconds'] = time.perf_counter() - start
+        if prompt_text is not None:
+            alert.send_keys(prompt_text)
+        if accept is True:
+            alert.accept()
+        elif accept is False:
+            alert.dismiss()
+
+    @step
+    def get_alert_text(self, timeout=None):
+        """
+        Retrieves the text from the alert dialog, waiting for it to open.
+
+        Args:
+            timeout (float, optional): time to wait for the dialog. Defaults to the wait policy.
 
         Returns:
             The text displayed in the alert dialog.
         """
-        return self.driver.switch_to.alert.text
+        return self.wait_for_alert(timeout).text
 
     @step
     def scroll_to_element(self, element):
@@ -294,3 +791,64 @@ class BasePage:
             element: The WebElement to scroll to.
         """
         ActionChains(self.driver).scroll_to_element(element).perform()
+
+    @step
+    def sweep_tabs(self, urls, collect, concurrency=4, prepare=None, timeout=None):
+        """
+        Loads URLs in a bounded number of tabs of the current session at the same time and collects a result
+        from every page as soon as it has finished loading.
+
+        The tabs are opened for the sweep and closed afterwards, the original window is active again when the
+        method returns. While a tab is collected the others keep loading, so with enough tabs a sweep takes
+        about as long as its slowest page.
+
+        Args:
+            urls (iterable): The URLs to load.
+            collect (callable): Called with the URL and the value returned by `prepare` while the loaded page is
+                                active, returns the result of the URL.
+            concurrency (int): The number of tabs loading at the same time.
+            prepare (callable, optional): Called with the URL in its tab right before the navigation starts.
+            timeout (float, optional): time to wait for every page load. Defaults to the wait policy.
+
+        Returns:
+            dict: The result of every URL.
+
+        Raises:
+            TimeoutException: If a page does not finish loading within the timeout.
+        """
+        timeout = self.wait_policy.timeout('page_load', timeout)
+        poll_frequency = self.wait_policy.settings['page_load'][1]
+        pending = deque(urls)
+        original = self.driver.current_window_handle
+        handles, active, results = [], {}, {}
+        with metrics.timer('page.sweep_tabs', label=f'{len(pending)} URLs in {concurrency} tabs'):
+            try:
+                for _ in range(min(concurrency, len(pending))):
+                    self.driver.switch_to.new_window('tab')
+                    handles.append(self.driver.current_window_handle)
+                idle = list(handles)
+                while pending or active:
+                    while idle and pending:
+                        handle, url = idle.pop(), pending.popleft()
+                        self.driver.switch_to.window(handle)
+                        context = prepare(url) if prepare else None
+                        self.driver.execute_script(NAVIGATE, url)
+                        active[handle] = (url, context, time.monotonic() + timeout)
+                    finished = False
+                    for handle, (url, context, deadline) in list(active.items()):
+                        self.driver.switch_to.window(handle)
+                        if self.driver.execute_script(IS_NAVIGATED):
+                            results[url] = collect(url, context)
+                            del active[handle]
+                            idle.append(handle)
+                            finished = True
+                        elif time.monotonic() > deadline:
+                            raise TimeoutException(f"{url} did not finish loading within {timeout}s")
+                    if not finished:
+                        time.sleep(poll_frequency)
+            finally:
+                for handle in handles:
+                    self.driver.switch_to.window(handle)
+                    self.driver.close()
+                self.driver.switch_to.window(original)
+        return results
@@ -0,0 +1,147 @@
+"""
+Conditions evaluated inside the browser by `BasePage.wait_for`.
+
+A condition is a JSON serializable dict, either a single check of an element or the title, or a composite of
+other conditions, so a whole chain of waits runs as one script execution.
+"""
+from .scripts import to_query
+
+
+def _element(kind, locator, expected=None):
+    """Builds the condition of a single element check."""
+    return {'kind': kind, 'query': to_query(locator), 'expected': expected}
+
+
+def present(locator):
+    """
+    The element is in the DOM.
+
+    Args:
+        locator (tuple): The locator tuple (By.<method>, <value>) for finding the element.
+
+    Returns:
+        dict: The condition.
+    """
+    return _element('present', locator)
+
+
+def visible(locator):
+    """
+    The element is rendered and neither hidden nor fully transparent.
+
+    Args:
+        locator (tuple): The locator tuple (By.<method>, <value>) for finding the element.
+
+    Returns:
+        dict: The condition.
+    """
+    return _element('visible', locator)
+
+
+def invisible(locator):
+    """
+    The element is not visible or not in the DOM. Resolves without an element.
+
+    Args:
+        locator (tuple): The locator tuple (By.<method>, <value>) for finding the element.
+
+    Returns:
+        dict: The condition.
+    """
+    return _element('invisible', locator)
+
+
+def clickable(locator):
+    """
+    The element is visible and not disabled.
+
+    Args:
+        locator (tuple): The locator tuple (By.<method>, <value>) for finding the element.
+
+    Returns:
+        dict: The condition.
+    """
+    return _element('clickable', locator)
+
+
+def has_text(locator, expected=None):
+    """
+    The element has text containing the expected text, or any text.
+
+    Args:
+        locator (tuple): The locator tuple (By.<method>, <value>) for finding the element.
+        expected (str, optional): The text to wait for. By default any text.
+
+    Returns:
+        dict: The condition.
+    """
+    return _element('text', locator, expected)
+
+
+def title_contains(expected):
+    """
+    The title of the page contains the expected text. Resolves without an element.
+
+    Args:
+        expected (str): The text to wait for.
+
+    Returns:
+        dict: The condition.
+    """
+    return {'kind': 'title', 'query': None, 'expected': expected}
+
+
+def all_of(*conditions):
+    """
+    All conditions are met at the same time. Resolves with the element of the first condition that has one.
+
+    Args:
+        *conditions (dict): The conditions.
+
+    Returns:
+        dict: The condition.
+    """
+    return {'kind': 'all', 'conditions': list(conditions)}
+
+
+def any_of(*conditions):
+    """
+    At least one condition is met. Resolves with the element of the first met condition.
+
+    Args:
+        *conditions (dict): The conditions.
+
+    Returns:
+        dict: The condition.
+    """
+    return {'kind': 'any', 'conditions': list(conditions)}
+
+
+def sequence(*conditions):
+    """
+    The conditions are met one after the other, a met condition is not checked again. Resolves with the element
+    of the last condition that has one.
+
+    Args:
+        *conditions (dict): The conditions, in order.
+
+    Returns:
+        dict: The condition.
+    """
+    return {'kind': 'sequence', 'conditions': list(conditions)}
+
+
+def describe(condition):
+    """
+    Describes a condition for wait labels and error messages.
+
+    Args:
+        condition (dict): The condition.
+
+    Returns:
+        str: A short description, e.g. "sequence(present(#id), visible(#id))".
+    """
+    if 'conditions' in condition:
+        return f"{condition['kind']}({', '.join(describe(child) for child in condition['conditions'])})"
+    argument = next(iter(condition['query'].values())) if condition['query'] else condition['expected']
+    return f"{condition['kind']}({argument})"
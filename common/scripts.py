@@ -0,0 +1,705 @@
+from selenium.webdriver.common.by import By
+
+FIND_ALL = """
+function findAll(query, root) {
+    root = root || document;
+    if (query.css !== undefined) {
+        return Array.prototype.slice.call(root.querySelectorAll(query.css));
+    }
+    var doc = root.ownerDocument || root;
+    var result = doc.evaluate(query.xpath, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var nodes = [];
+    for (var i = 0; i < result.snapshotLength; i++) {
+        nodes.push(result.snapshotItem(i));
+    }
+    return nodes;
+}
+"""
+
+
+def _quote_css(value):
+    """Quotes a value for a CSS attribute selector."""
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _quote_xpath(value):
+    """Quotes a value for an XPath expression."""
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    return 'concat(' + ', \'"\', '.join(f'"{part}"' for part in value.split('"')) + ')'
+
+
+def to_query(locator):
+    """
+    Translates a Selenium locator into a query understood by the `findAll` function of in-page scripts.
+
+    Args:
+        locator (tuple): The locator tuple (By.<method>, <value>).
+
+    Returns:
+        dict: Either a {'css': selector} or an {'xpath': expression} query.
+
+    Raises:
+        ValueError: If the locator strategy is not supported.
+    """
+    by, value = locator
+    if by == By.CSS_SELECTOR:
+        return {'css': value}
+    if by == By.XPATH:
+        return {'xpath': value}
+    if by == By.ID:
+        return {'css': f'[id={_quote_css(value)}]'}
+    if by == By.NAME:
+        return {'css': f'[name={_quote_css(value)}]'}
+    if by == By.CLASS_NAME:
+        return {'css': f'[class~={_quote_css(value)}]'}
+    if by == By.TAG_NAME:
+        return {'css': value}
+    if by == By.LINK_TEXT:
+        return {'xpath': f'.//a[normalize-space(.)={_quote_xpath(value)}]'}
+    if by == By.PARTIAL_LINK_TEXT:
+        return {'xpath': f'.//a[contains(., {_quote_xpath(value)})]'}
+    raise ValueError(f'Locator strategy "{by}" is not supported in page scripts')
+
+
+WAIT_FOR_ACTIONABLE = FIND_ALL + """
+var query = arguments[0], timeout = arguments[1], done = arguments[arguments.length - 1];
+var deadline = Date.now() + timeout * 1000;
+var nextFrame = document.hidden ? function (callback) { setTimeout(callback, 16); } : requestAnimationFrame;
+var lastRect = null, reason = 'not attached', scrolled = false;
+
+function sameRect(a, b) {
+    return a.x === b.x && a.y === b.y && a.width === b.width && a.height === b.height;
+}
+
+function inViewport(rect) {
+    return rect.top >= 0 && rect.left >= 0 &&
+        rect.bottom <= window.innerHeight && rect.right <= window.innerWidth;
+}
+
+function check() {
+    var element = findAll(query)[0];
+    if (!element || !element.isConnected) {
+        reason = 'not attached';
+        lastRect = null;
+    } else {
+        var rect = element.getBoundingClientRect();
+        var style = getComputedStyle(element);
+        if (rect.width === 0 || rect.height === 0 || style.visibility !== 'visible' ||
+                parseFloat(style.opacity) === 0) {
+            reason = 'not visible';
+            lastRect = null;
+        } else if (element.disabled || element.getAttribute('aria-disabled') === 'true') {
+            reason = 'disabled';
+        } else if (!inViewport(rect) && !scrolled) {
+            element.scrollIntoView({block: 'center', inline: 'center'});
+            scrolled = true;
+            reason = 'not in viewport';
+            lastRect = null;
+        } else if (!lastRect || !sameRect(lastRect, rect)) {
+            reason = 'not stable';
+            lastRect = rect;
+        } else {
+            var hit = document.elementFromPoint(rect.left + rect.width / 2, rect.top + rect.height / 2);
+            if (hit === element || element.contains(hit)) {
+                done({element: element});
+                return;
+            }
+            reason = 'obscured by <' + (hit ? hit.tagName.toLowerCase() : 'nothing') + '>';
+            lastRect = null;
+        }
+    }
+    if (Date.now() > deadline) {
+        done({error: reason});
+    } else {
+        nextFrame(check);
+    }
+}
+
+nextFrame(check);
+"""
+
+
+# Navigates without waiting for the load. The marker lives on the old document, so its absence shows that the new
+# document has replaced it. A URL that differs from the current one only by its fragment scrolls within the same
+# document, so the marker is not set for it
+NAVIGATE = """
+var target = new URL(arguments[0], window.location.href).href;
+var sameDocument = target.indexOf('#') !== -1 && target.split('#')[0] === window.location.href.split('#')[0];
+window.__navigating = !sameDocument;
+window.location.href = target;
+"""
+IS_NAVIGATED = "return !window.__navigating && document.readyState === 'complete';"
+
+
+# Frames are addressed by their path of indices into `window.frames`, the same indices WebDriver switches by.
+# Windows of cross-origin frames expose their child frames but not their document. Cached paths are checked before
+# anything is clicked and discovered again when a frame is gone or any frame has a different number of child frames.
+QUERY_FRAMES = FIND_ALL + """
+var paths = arguments[0], clickQuery = arguments[1], valueQueries = arguments[2], timeout = arguments[3],
+    done = arguments[arguments.length - 1];
+var deadline = Date.now() + timeout * 1000;
+
+function documentOf(win) {
+    try {
+        return win.document;
+    } catch (e) {
+        return null;
+    }
+}
+
+function discover(win, path, found) {
+    for (var i = 0; i < win.frames.length; i++) {
+        var child = win.frames[i], childPath = path.concat([i]);
+        found.push({path: childPath, crossOrigin: !documentOf(child), frames: child.frames.length});
+        discover(child, childPath, found);
+    }
+    return found;
+}
+
+function resolve(path) {
+    var win = window;
+    for (var i = 0; i < path.length; i++) {
+        if (path[i] >= win.frames.length) {
+            return null;
+        }
+        win = win.frames[path[i]];
+    }
+    return win;
+}
+
+function text(element) {
+    return (element.innerText === undefined ? element.textContent : element.innerText).trim();
+}
+
+function visit(entry) {
+    var result = {path: entry.path, crossOrigin: entry.crossOrigin, frames: entry.frames, clicked: false,
+                  values: null, error: null};
+    var win = resolve(entry.path);
+    if (!win) {
+        result.error = 'frame not found';
+        return result;
+    }
+    result.crossOrigin = !documentOf(win);
+    if (result.crossOrigin || !clickQuery) {
+        return result;
+    }
+    var target = findAll(clickQuery, win.document)[0];
+    if (!target) {
+        result.error = 'click target not found';
+        return result;
+    }
+    target.click();
+    result.clicked = true;
+    return result;
+}
+
+function read(result) {
+    var doc = documentOf(resolve(result.path)), complete = true;
+    result.values = {};
+    Object.keys(valueQueries).forEach(function (name) {
+        var element = doc && findAll(valueQueries[name], doc)[0];
+        result.values[name] = element ? text(element) : null;
+        complete = complete && !!result.values[name];
+    });
+    return complete;
+}
+
+function unchanged(paths) {
+    if (!paths || paths.filter(function (entry) { return entry.path.length === 1; }).length !== window.frames.length) {
+        return false;
+    }
+    return paths.every(function (entry) {
+        var win = resolve(entry.path);
+        return !!win && win.frames.length === entry.frames;
+    });
+}
+
+var results = (unchanged(paths) ? paths : discover(window, [], [])).map(visit);
+var local = results.filter(function (result) { return !result.crossOrigin && !result.error; });
+
+function poll() {
+    var pending = local.filter(function (result) { return !read(result) && result.clicked; });
+    if (pending.length && Date.now() < deadline) {
+        setTimeout(poll, 16);
+        return;
+    }
+    pending.forEach(function (result) { result.error = 'values not found'; });
+    done(results);
+}
+
+poll();
+"""
+
+
+SETTLE_VIEWPORT = FIND_ALL + """
+var width = arguments[0], height = arguments[1], resultQuery = arguments[2], timeout = arguments[3],
+    done = arguments[arguments.length - 1];
+var deadline = Date.now() + timeout * 1000;
+var nextFrame = document.hidden ? function (callback) { setTimeout(callback, 16); } : requestAnimationFrame;
+var frames = 0;
+
+function check() {
+    frames = window.innerWidth === width && window.innerHeight === height ? frames + 1 : 0;
+    if (frames < 2 && Date.now() < deadline) {
+        nextFrame(check);
+        return;
+    }
+    var result = findAll(resultQuery)[0];
+    done({width: window.innerWidth, height: window.innerHeight, settled: frames >= 2,
+          result: result ? (result.innerText === undefined ? result.textContent : result.innerText).trim() : null});
+}
+
+check();
+"""
+
+# Reads values of an element like WebElement.text and WebElement.get_attribute
+ELEMENT_VALUES = """
+function attribute(element, name) {
+    var property = element[name];
+    if (typeof property === 'boolean') {
+        return property ? 'true' : null;
+    }
+    if (typeof property === 'string' || typeof property === 'number') {
+        return String(property);
+    }
+    return element.getAttribute(name);
+}
+
+function text(element) {
+    return (element.innerText === undefined ? element.textContent : element.innerText).trim();
+}
+"""
+
+
+# Resolves on the first DOM mutation that meets the condition, see common/conditions.py; the ticker catches
+# changes without mutations, such as finished CSS transitions. Selectors that cannot be parsed throw a DOMException
+# named SyntaxError, which is reported as an invalid selector.
+OBSERVE = FIND_ALL + ELEMENT_VALUES + """
+var condition = arguments[0], read = arguments[1], timeout = arguments[2], done = arguments[arguments.length - 1];
+var start = performance.now(), settled = false, observer, timer, ticker;
+
+function visible(element) {
+    var style = getComputedStyle(element);
+    return element.getClientRects().length > 0 && style.visibility !== 'hidden' && style.opacity !== '0';
+}
+
+function check(leaf) {
+    if (leaf.kind === 'title') {
+        return document.title.indexOf(leaf.expected) !== -1 ? {element: null, value: document.title} : null;
+    }
+    var element = findAll(leaf.query)[0];
+    if (leaf.kind === 'invisible') {
+        return !element || !visible(element) ? {element: null, value: null} : null;
+    }
+    if (!element) {
+        return null;
+    }
+    if (leaf.kind === 'present') {
+        return {element: element, value: null};
+    }
+    if (leaf.kind === 'visible') {
+        return visible(element) ? {element: element, value: null} : null;
+    }
+    if (leaf.kind === 'clickable') {
+        return visible(element) && !element.disabled ? {element: element, value: null} : null;
+    }
+    if (leaf.kind === 'text') {
+        var value = text(element);
+        return (leaf.expected === null ? value : value.indexOf(leaf.expected) !== -1) ?
+            {element: element, value: value} : null;
+    }
+    throw new Error('unknown condition ' + leaf.kind);
+}
+
+function firstElement(results) {
+    return results.reduce(function (found, result) { return found || result.element; }, null);
+}
+
+function evaluate(node) {
+    var results = [];
+    if (node.kind === 'all') {
+        for (var i = 0; i < node.conditions.length; i++) {
+            results.push(evaluate(node.conditions[i]));
+            if (!results[i]) {
+                return null;
+            }
+        }
+        return {element: firstElement(results), value: null, results: results};
+    }
+    if (node.kind === 'any') {
+        for (var j = 0; j < node.conditions.length; j++) {
+            var result = evaluate(node.conditions[j]);
+            if (result) {
+                return {element: result.element, value: result.value, index: j};
+            }
+        }
+        return null;
+    }
+    if (node.kind === 'sequence') {
+        node.met = node.met || [];
+        while (node.met.length < node.conditions.length) {
+            var next = evaluate(node.conditions[node.met.length]);
+            if (!next) {
+                return null;
+            }
+            next.seconds = (performance.now() - start) / 1000;
+            node.met.push(next);
+        }
+        return {element: firstElement(node.met.slice().reverse()), value: null, results: node.met};
+    }
+    return check(node);
+}
+
+function finish(result) {
+    settled = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    clearInterval(ticker);
+    result.seconds = (performance.now() - start) / 1000;
+    if (result.element && read) {
+        if (read.text) {
+            result.text = text(result.element);
+        }
+        if (read.attrs.length) {
+            result.attrs = {};
+            read.attrs.forEach(function (name) { result.attrs[name] = attribute(result.element, name); });
+        }
+        if (read.rect) {
+            var rect = result.element.getBoundingClientRect();
+            result.rect = {x: rect.x, y: rect.y, width: rect.width, height: rect.height};
+        }
+    }
+    done(result);
+}
+
+function poll() {
+    if (settled) {
+        return;
+    }
+    var result;
+    try {
+        result = evaluate(condition);
+    } catch (e) {
+        return finish({error: String(e), invalidSelector: e.name === 'SyntaxError'});
+    }
+    if (result) {
+        finish(result);
+    }
+}
+
+observer = new MutationObserver(poll);
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+timer = setTimeout(function () { finish({error: 'timeout'}); }, timeout * 1000);
+ticker = setInterval(poll, 100);
+poll();
+"""
+
+
+SNAPSHOT = FIND_ALL + ELEMENT_VALUES + """
+var elements = arguments[0], query = arguments[1], root = arguments[2], options = arguments[3];
+if (query) {
+    elements = findAll(query, root);
+}
+
+return elements.map(function (element) {
+    var record = {element: element};
+    if (options.text) {
+        record.text = text(element);
+    }
+    if (options.attrs.length) {
+        record.attrs = {};
+        options.attrs.forEach(function (name) { record.attrs[name] = attribute(element, name); });
+    }
+    if (options.css.length) {
+        var style = getComputedStyle(element);
+        record.css = {};
+        options.css.forEach(function (name) { record.css[name] = style.getPropertyValue(name); });
+    }
+    if (options.rect) {
+        var rect = element.getBoundingClientRect();
+        record.rect = {x: rect.x, y: rect.y, width: rect.width, height: rect.height};
+    }
+    if (options.child_text) {
+        var child = findAll(options.child_text, element)[0];
+        record.child_text = child ? text(child) : null;
+    }
+    return record;
+});
+"""
+
+
+SET_CONTROL_VALUES = FIND_ALL + """
+var containers = arguments[0], query = arguments[1], root = arguments[2], controlQuery = arguments[3],
+    targetQuery = arguments[4];
+if (query) {
+    containers = findAll(query, root);
+}
+
+function setValue(control, value) {
+    var prototype = Object.getPrototypeOf(control);
+    var descriptor = Object.getOwnPropertyDescriptor(prototype, 'value');
+    control.setAttribute('value', value);
+    if (descriptor && descriptor.set) {
+        descriptor.set.call(control, value);
+    } else {
+        control.value = value;
+    }
+}
+
+return containers.map(function (container) {
+    var control = findAll(controlQuery, container)[0], target = findAll(targetQuery, container)[0];
+    if (!control || !target) {
+        return {before: control ? control.value : null, target: null, after: null, ok: false,
+                error: control ? 'target not found' : 'control not found'};
+    }
+    var value = (target.innerText === undefined ? target.textContent : target.innerText).trim();
+    var before = control.value;
+    setValue(control, value);
+    control.dispatchEvent(new Event('input', {bubbles: true}));
+    control.dispatchEvent(new Event('change', {bubbles: true}));
+    return {before: before, target: value, after: control.value, ok: control.value === value, error: null};
+});
+"""
+
+
+HARVEST = FIND_ALL + """
+var containerQuery = arguments[0], itemQuery = arguments[1], lastClass = arguments[2], timeout = arguments[3],
+    chunkSize = arguments[4], key = arguments[5], prune = arguments[6], keep = arguments[7],
+    done = arguments[arguments.length - 1];
+var container = findAll(containerQuery)[0];
+if (!container) {
+    done({values: [], finished: false, reason: 'container not found'});
+    return;
+}
+var harvesters = window.__harvesters = window.__harvesters || {};
+var state = harvesters[key] = harvesters[key] || {cursor: null, tagName: null, finished: false};
+var values = [], settled = false, observer, timer, ticker;
+
+function nextItem() {
+    var node = state.cursor ? state.cursor.nextElementSibling : findAll(itemQuery, container)[0];
+    while (node && state.cursor && node.tagName !== state.tagName) {
+        node = node.nextElementSibling;
+    }
+    return node || null;
+}
+
+function finish(reason) {
+    if (settled) {
+        return;
+    }
+    settled = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    clearInterval(ticker);
+    if (state.finished || !keep) {
+        delete harvesters[key];
+    }
+    done({values: values, finished: state.finished, reason: reason});
+}
+
+function collect() {
+    if (settled) {
+        return;
+    }
+    var node = nextItem();
+    while (node) {
+        var previous = state.cursor;
+        state.cursor = node;
+        state.tagName = state.tagName || node.tagName;
+        if (prune && previous) {
+            previous.remove();
+        }
+        values.push((node.innerText === undefined ? node.textContent : node.innerText).trim());
+        if (node.classList.contains(lastClass)) {
+            state.finished = true;
+            return finish('last item reached');
+        }
+        if (values.length >= chunkSize) {
+            return finish('chunk complete');
+        }
+        node = nextItem();
+    }
+    if (state.cursor) {
+        state.cursor.scrollIntoView();
+    }
+    container.scrollTop = container.scrollHeight;
+}
+
+observer = new MutationObserver(collect);
+observer.observe(container, {childList: true, subtree: true});
+timer = setTimeout(function () { finish('timeout'); }, timeout * 1000);
+ticker = setInterval(collect, 100);
+collect();
+"""
+
+
+# Inspects handlers only, no event is dispatched. `listeners` is the getEventListeners function of the DevTools
+# command line API, which also sees handlers added with addEventListener, or null to inspect handler properties only
+DRAG_SUPPORT = """
+function dragSupport(pairs, listeners) {
+    function handles(element, types) {
+        var nodes = [];
+        for (var node = element; node; node = node.parentNode) {
+            nodes.push(node);
+        }
+        nodes.push(window);
+        return nodes.some(function (node) {
+            return types.some(function (type) {
+                return typeof node['on' + type] === 'function' ||
+                    !!(listeners && (listeners(node)[type] || []).length);
+            });
+        });
+    }
+
+    return pairs.map(function (pair) {
+        var source = pair[0], target = pair[1];
+        return {
+            source: source.getAttribute('draggable') === 'true' || handles(source, ['dragstart']) ?
+                null : 'source is not draggable',
+            target: handles(target, ['dragover', 'drop']) ? null : 'target has no drop handler'
+        };
+    });
+}
+"""
+HTML5_DRAG_SUPPORT = DRAG_SUPPORT + "return dragSupport(arguments[0], null);"
+STASH_DRAG_PAIRS = "window.__dragPairs = arguments[0];"
+# Evaluated through DevTools with the command line API on the pairs stashed by STASH_DRAG_PAIRS, null without them
+HTML5_DRAG_LISTENERS = "(function () {" + DRAG_SUPPORT + """
+var pairs = window.__dragPairs;
+delete window.__dragPairs;
+return pairs ? dragSupport(pairs, getEventListeners) : null;
+})()"""
+
+
+# Stops at the first drag that is not dropped, so the caller can continue with another strategy in order
+HTML5_DRAG_AND_DROP = """
+var pairs = arguments[0];
+
+function center(element) {
+    var rect = element.getBoundingClientRect();
+    return {x: rect.left + rect.width / 2, y: rect.top + rect.height / 2};
+}
+
+function fire(element, type, dataTransfer, point) {
+    var init = {bubbles: true, cancelable: true, composed: true, clientX: point.x, clientY: point.y};
+    var event;
+    try {
+        event = new DragEvent(type, Object.assign({dataTransfer: dataTransfer}, init));
+    } catch (e) {
+        event = new MouseEvent(type, init);
+    }
+    if (event.dataTransfer !== dataTransfer) {
+        Object.defineProperty(event, 'dataTransfer', {value: dataTransfer});
+    }
+    element.dispatchEvent(event);
+    return event;
+}
+
+function drag(source, target) {
+    var dataTransfer = new DataTransfer(), from = center(source), to = center(target);
+    if (fire(source, 'dragstart', dataTransfer, from).defaultPrevented) {
+        return 'dragstart was cancelled';
+    }
+    fire(target, 'dragenter', dataTransfer, to);
+    if (!fire(target, 'dragover', dataTransfer, to).defaultPrevented) {
+        fire(target, 'dragleave', dataTransfer, to);
+        fire(source, 'dragend', dataTransfer, to);
+        return 'target does not accept drops';
+    }
+    dataTransfer.dropEffect = dataTransfer.effectAllowed === 'copy' ? 'copy' : 'move';
+    fire(target, 'drop', dataTransfer, to);
+    fire(source, 'dragend', dataTransfer, to);
+    return null;
+}
+
+var results = [];
+for (var i = 0; i < pairs.length; i++) {
+    var start = performance.now();
+    var reason = drag(pairs[i][0], pairs[i][1]);
+    results.push({dropped: reason === null, reason: reason, seconds: (performance.now() - start) / 1000});
+    if (reason !== null) {
+        break;
+    }
+}
+return results;
+"""
+
+
+# Replaces the native dialogs while it runs: prompts are answered with the current answer, confirms are accepted
+FEED_PROMPTS = FIND_ALL + """
+var triggerQuery = arguments[0], resultQuery = arguments[1], answers = arguments[2], rejected = arguments[3],
+    timeout = arguments[4], done = arguments[arguments.length - 1];
+var trigger = findAll(triggerQuery)[0], result = findAll(resultQuery)[0];
+if (!trigger || !result) {
+    done({outcomes: [], error: trigger ? 'result not found' : 'trigger not found'});
+    return;
+}
+var native = {prompt: window.prompt, alert: window.alert, confirm: window.confirm};
+var outcomes = [], index = 0, dialogs = [], waiting = false, timer;
+
+function dialog(type, returns) {
+    return function (message) {
+        dialogs.push({type: type, message: message === undefined ? '' : String(message)});
+        return returns();
+    };
+}
+
+window.prompt = dialog('prompt', function () { return answers[index]; });
+window.alert = dialog('alert', function () { return undefined; });
+window.confirm = dialog('confirm', function () { return true; });
+
+var observer = new MutationObserver(function () {
+    if (waiting) {
+        record();
+    }
+});
+observer.observe(result, {childList: true, characterData: true, subtree: true});
+
+function finish(error) {
+    observer.disconnect();
+    window.prompt = native.prompt;
+    window.alert = native.alert;
+    window.confirm = native.confirm;
+    done({outcomes: outcomes, error: error || null});
+}
+
+function record() {
+    waiting = false;
+    clearTimeout(timer);
+    var text = (result.innerText === undefined ? result.textContent : result.innerText).trim();
+    outcomes.push({answer: answers[index], result: text, dialogs: dialogs});
+    index++;
+    if (rejected !== null && text !== rejected) {
+        return finish();
+    }
+    next();
+}
+
+function next() {
+    if (index >= answers.length) {
+        return finish();
+    }
+    dialogs = [];
+    observer.takeRecords();
+    try {
+        trigger.click();
+    } catch (e) {
+        return finish(String(e));
+    }
+    if (observer.takeRecords().length) {
+        return record();
+    }
+    waiting = true;
+    timer = setTimeout(function () {
+        waiting = false;
+        outcomes.push({answer: answers[index], result: null, dialogs: dialogs});
+        index++;
+        next();
+    }, timeout * 1000);
+}
+
+next();
+"""
@@ -0,0 +1,102 @@
+import time
+from contextlib import contextmanager
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+from ..helpers.metrics import metrics
+
+
+class WaitPolicy:
+    """
+    Central source of the timeouts and polling intervals of the explicit waits used by the page objects.
+
+    Implicit waits are disabled in every browser, so a lookup blocks only as long as its operation allows:
+    positive lookups wait for the element to appear, negative checks return at once. Every wait records
+    how long it actually blocked in `metrics` under 'wait.<operation>', labelled with what it waited for.
+    """
+
+    DEFAULTS = {
+        'find': (10, 0.1),
+        'present': (10, 0.1),
+        'visible': (10, 0.1),
+        'invisible': (10, 0.1),
+        'clickable': (10, 0.1),
+        'selected': (10, 0.1),
+        'text': (10, 0.1),
+        'title': (30, 0.5),
+        'actionable': (10, 0),
+        'harvest': (60, 0),
+        'page_load': (30, 0.05),
+        'windows': (10, 0.05),
+        'frames': (10, 0.1),
+        'prompts': (5, 0),
+        'dialog': (10, 0.05),
+        'viewport': (5, 0),
+        'observe': (10, 0),
+    }
+
+    def __init__(self, overrides=None):
+        """
+        Initializes the policy.
+
+        Args:
+            overrides (dict, optional): Mapping of operation name to a (timeout, poll_frequency) tuple that
+                                        replaces the default settings of the operation.
+        """
+        self.settings = {**self.DEFAULTS, **(overrides or {})}
+
+    def wait(self, driver, condition, operation, timeout=None, poll_frequency=None, label=None):
+        """
+        Waits until the condition returns a truthy value.
+
+        Args:
+            driver (WebDriver or WebElement): The context the condition is evaluated against.
+            condition (callable): The expected condition.
+            operation (str): The name of the operation, selects the default timeout and polling interval.
+            timeout (float, optional): Overrides the timeout of the operation.
+            poll_frequency (float, optional): Overrides the polling interval of the operation.
+            label (str, optional): What is waited for, used to list the slowest waits.
+
+        Returns:
+            The value returned by the condition.
+
+        Raises:
+            TimeoutException: If the condition is not met within the timeout.
+        """
+        default_timeout, default_poll_frequency = self.settings[operation]
+        wait = WebDriverWait(driver,
+                             default_timeout if timeout is None else timeout,
+                             default_poll_frequency if poll_frequency is None else poll_frequency)
+        with self.measure(operation, label):
+            return wait.until(condition)
+
+    def timeout(self, operation, timeout=None):
+        """
+        Resolves the timeout of an operation.
+
+        Args:
+            operation (str): The name of the operation.
+            timeout (float, optional): An explicit timeout that takes precedence over the policy.
+
+        Returns:
+            float: The timeout in seconds.
+        """
+        return self.settings[operation][0] if timeout is None else timeout
+
+    @contextmanager
+    def measure(self, operation, label=None):
+        """
+        Records how long the wrapped wait blocked, also for waits that are evaluated inside the browser.
+
+        Args:
+            operation (str): The name of the operation.
+            label (str, optional): What is waited for, used to list the slowest waits.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            metrics.record(f'wait.{operation}', time.perf_counter() - start, label)
+
+
+DEFAULT_WAIT_POLICY = WaitPolicy()
@@ -1,9 +1,24 @@
+import functools
 import os
 
 import pytest
-from selenium import webdriver
 
 from .common.base_methods import BasePage
+from .helpers.driver_factory import DriverLauncher, create_driver, quit_driver
+from .helpers.driver_pool import DriverPool
+from .helpers.driver_prewarmer import DriverPrewarmer
+from .helpers.local_server import MIRROR_DIR, MirrorServer, SnapshotStore
+from .helpers.metrics import CommandCounter, format_report, metrics, worker_reports
+from .helpers.record_replay import ARCHIVE_PATH, ArchiveStore
+from .helpers.request_blocking import RequestBlocker
+from .helpers.storage_state import STATES_DIR, build_once, forget, load, restore
+from .pages.checkboxes_page import CheckboxesLocators
+from .pages.cookies_page import CookiesLocators
+from .pages.drag_and_drop_page import DragAndDropLocators
+from .pages.scrolling_page import ScrollingLocators
+from .pages.windows_frames_prompts_page import WFPsPageLocators
+
+LOCATOR_CLASSES = (CheckboxesLocators, CookiesLocators, DragAndDropLocators, ScrollingLocators, WFPsPageLocators)
 
 
 def pytest_addoption(parser):
@@ -17,6 +32,65 @@ def pytest_addoption(parser):
     parser.addoption('--headless', help='headless or non-headless?', choices=['true', 'false'], default='false')
     parser.addoption(
         '--extension', help='load "coordinates.crx" extension?', choices=['true', 'false'], default='false')
+    parser.addoption(
+        '--driver-reuse', help='reuse browsers between tests?', choices=['true', 'false'], default='false')
+    parser.addoption(
+        '--driver-pool-size', help='how many live browsers to keep per worker with --driver-reuse?', type=int,
+        default=1)
+    parser.addoption(
+        '--driver-prewarm', help='launch the next browser in the background while a test runs?',
+        choices=['true', 'false'], default='false')
+    parser.addoption(
+        '--target', help='run against the remote site, the local mirror of it or the record/replay archive?',
+        choices=['remote', 'local', 'record', 'replay'], default='remote')
+    parser.addoption('--archive', help='path of the record/replay archive', default=ARCHIVE_PATH)
+    parser.addoption(
+        '--block-resources', help='block fonts, analytics and ad scripts in chrome?', choices=['true', 'false'],
+        default='false')
+    parser.addoption('--benchmark', help='run the benchmarks?', choices=['true', 'false'], default='false')
+    parser.addoption(
+        '--bidi', help='record dialogs through a WebDriver BiDi connection?', choices=['true', 'false'],
+        default='false')
+
+
+def pytest_configure(config):
+    """
+    Registers the custom markers of the test suite and rejects recording with several xdist workers.
+
+    Args:
+        config (Config): The pytest config object.
+
+    Raises:
+        UsageError: If --target=record is combined with xdist workers, which would overwrite each other's archive.
+    """
+    if config.getoption('--target') == 'record' and (
+            hasattr(config, 'workerinput') or config.getoption('numprocesses', default=None)):
+        raise pytest.UsageError('--target=record writes a single archive, run it without -n')
+    config.addinivalue_line(
+        'markers', 'block_resources(block=None, allow=None, enabled=True): override the blocked URL patterns '
+                   'of --block-resources for a test')
+    config.addinivalue_line('markers', 'benchmark: performance benchmark, runs only with --benchmark=true')
+    config.addinivalue_line(
+        'markers', 'storage_state(name, build=None): restore the cookies and storage saved in resources/states/<name> '
+                   'before the test, or built once per run by build(driver)')
+    config.addinivalue_line(
+        'markers', 'bidi: run the test in a browser that records dialogs through WebDriver BiDi, also without --bidi')
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Skips the benchmarks unless they are requested with --benchmark.
+
+    Args:
+        config (Config): The pytest config object.
+        items (list): The collected test items.
+    """
+    if config.getoption('--benchmark') == 'true':
+        return
+    skip_benchmark = pytest.mark.skip(reason='benchmarks run only with --benchmark=true')
+    for item in items:
+        if item.get_closest_marker('benchmark'):
+            item.add_marker(skip_benchmark)
 
 
 @pytest.fixture(scope='session')
@@ -61,15 +135,134 @@ def extension(request):
     return request.config.getoption('--extension')
 
 
+@pytest.fixture(scope='session', autouse=True)
+def target(request):
+    """
+    Starts the local server for every target except the remote site and points the URLs of all locator
+    classes at it.
+
+    --target=local serves the captured snapshots, --target=record forwards requests to the remote site
+    and records them into the archive, --target=replay serves only the recorded archive.
+
+    Args:
+        request (FixtureRequest): A pytest fixture that provides information about the requesting test function.
+
+    Yields:
+        MirrorServer: The running local server, or None when the tests run against the remote site.
+    """
+    target_option = request.config.getoption('--target')
+    if target_option == 'remote':
+        yield None
+        return
+    if target_option == 'local':
+        store = SnapshotStore(MIRROR_DIR)
+        if not store.responses:
+            pytest.exit(f'No snapshots in {MIRROR_DIR}, capture them with "python -m helpers.local_server"')
+    else:
+        store = ArchiveStore(request.config.getoption('--archive'), record=target_option == 'record')
+    server = MirrorServer(store)
+    server.start()
+    with pytest.MonkeyPatch.context() as patch:
+        for locators in LOCATOR_CLASSES:
+            for name, value in list(vars(locators).items()):
+                if name.startswith('URL_'):
+                    patch.setattr(locators, name, server.local_url(value))
+        yield server
+    server.stop()
+    if target_option != 'local':
+        metrics.increment('archive.hits', store.hits)
+        metrics.increment('archive.misses', store.misses)
+    if target_option == 'record':
+        store.save()
+
+
+@pytest.fixture(scope='session')
+def request_blocker(request):
+    """
+    Creates the blocker of unneeded resources when --block-resources is enabled.
+
+    Args:
+        request (FixtureRequest): A pytest fixture that provides information about the requesting test function.
+
+    Returns:
+        RequestBlocker: The blocker applied to every browser, or None if nothing is blocked.
+    """
+    if request.config.getoption('--block-resources') != 'true':
+        return None
+    return RequestBlocker()
+
+
+@pytest.fixture(scope='session')
+def driver_launcher(request, test_browser, headless, extension, request_blocker):
+    """
+    Creates the launcher that starts and shuts down browsers for the current worker.
+
+    With --driver-prewarm the next browser is launched on a background thread while the current test runs.
+    With --bidi every browser records the dialogs it opens through a WebDriver BiDi connection.
+
+    Args:
+        request (FixtureRequest): A pytest fixture that provides information about the requesting test function.
+        test_browser (str): The name of the browser to use ('chrome' or 'firefox').
+        headless (str): Specifies whether to run the browser in headless mode ('true' or 'false').
+        extension (str): Specifies whether to load the 'coordinates' extension ('true' or 'false').
+        request_blocker (RequestBlocker): The blocker of unneeded resources, or None.
+
+    Yields:
+        DriverLauncher: The launcher of browsers.
+    """
+    factory = functools.partial(create_driver, test_browser, headless, extension, request_blocker,
+                                request.config.getoption('--bidi'))
+    if request.config.getoption('--driver-prewarm') == 'true':
+        launcher = DriverPrewarmer(factory)
+        launcher.start()
+    else:
+        launcher = DriverLauncher(factory)
+    yield launcher
+    launcher.close()
+
+
+@pytest.fixture(scope='session')
+def driver_pool(request, driver_launcher):
+    """
+    Creates a pool of live browsers shared by all tests of the current worker when --driver-reuse is enabled.
+
+    Args:
+        request (FixtureRequest): A pytest fixture that provides information about the requesting test function.
+        driver_launcher (DriverLauncher): The launcher of browsers.
+
+    Yields:
+        DriverPool: The pool of browsers, or None if browsers are launched per test.
+    """
+    if request.config.getoption('--driver-reuse') != 'true':
+        yield None
+        return
+    pool = DriverPool(driver_launcher.launch, size=request.config.getoption('--driver-pool-size'))
+    pool.warm_up()
+    yield pool
+    pool.close()
+
+
 @pytest.fixture(scope='function', autouse=True)
-def driver(request, test_browser, headless):
+def driver(request, test_browser, headless, extension, driver_launcher, driver_pool, request_blocker):
     """
-    Initializes the WebDriver instance based on the selected browser and headless mode.
+    Provides the WebDriver instance for a test based on the selected browser and headless mode.
+
+    With --driver-reuse the browser is taken from the worker's pool and reset after the test,
+    otherwise a new browser is launched and shut down for every test. A test marked `bidi` gets a browser of
+    its own with a BiDi dialog listener unless --bidi already provides one, and is skipped if the browser does
+    not support BiDi. With --block-resources the
+    `block_resources` marker overrides the blocked URL patterns for the test and the number of blocked
+    requests and loaded bytes is recorded per test. The duration of the test body, the number of WebDriver
+    commands it sent, in total and per command, and its page loads are recorded as well.
 
     Args:
         request (FixtureRequest): A pytest fixture that provides information about the requesting test function.
         test_browser (str): The name of the browser to use ('chrome' or 'firefox').
         headless (str): Specifies whether to run the browser in headless mode ('true' or 'false').
+        extension (str): Specifies whether to load the 'coordinates' extension ('true' or 'false').
+        driver_launcher (DriverLauncher): The launcher of browsers.
+        driver_pool (DriverPool): The pool of live browsers, or None if browsers are launched per test.
+        request_blocker (RequestBlocker): The blocker of unneeded resources, or None.
 
     Yields:
         WebDriver: The initialized WebDriver instance.
@@ -77,30 +270,84 @@ def driver(request, test_browser, headless):
     Raises:
         ValueError: If an unsupported browser is specified.
     """
-    if test_browser == 'firefox':
-        if headless == 'false':
-            driver = webdriver.Firefox()
-        else:
-            geco_options = webdriver.FirefoxOptions()
-            geco_options.add_argument("-headless")
-            driver = webdriver.Firefox(options=geco_options)
-    elif test_browser == 'chrome':
-        chrome_options = webdriver.ChromeOptions()
-        if headless == 'true':
-            chrome_options.add_argument("--headless=new")
-        if extension == 'true':
-            chrome_options.add_extension(f'{os.path.dirname(os.path.abspath(__file__))}/resources/0.2_0.crx')
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.implicitly_wait(10)
+    own = bool(request.node.get_closest_marker('bidi')) and request.config.getoption('--bidi') != 'true'
+    if own:
+        driver = create_driver(test_browser, headless, extension, request_blocker, 'true')
+        if driver.dialog_listener is None:
+            quit_driver(driver)
+            pytest.skip(f'{test_browser} does not support WebDriver BiDi')
+    elif driver_pool is None:
+        driver = driver_launcher.launch()
     else:
-        raise ValueError(f'--browser="{test_browser}" is not chrome or firefox')
+        driver = driver_pool.acquire()
+
+    marker = request.node.get_closest_marker('block_resources')
+    if request_blocker:
+        request_blocker.collect_stats(driver)
+        if marker and not marker.kwargs.get('enabled', True):
+            request_blocker.apply(driver, block=(), allow=())
+        elif marker:
+            request_blocker.apply(driver, block=marker.kwargs.get('block'), allow=marker.kwargs.get('allow'))
 
     request.cls.driver = driver
-    yield driver
+    with CommandCounter(driver) as commands, metrics.timer('test.call', label=request.node.nodeid):
+        yield driver
+    metrics.increment('commands.total', commands.total)
+    request.node.user_properties.append(('webdriver_commands', commands.total))
+    request.node.user_properties.append(('webdriver_command_counts', dict(commands.counts)))
+    page_loads = commands.counts.get('get', 0) + commands.counts.get('refresh', 0)
+    request.node.user_properties.append(('page_loads', page_loads))
+    if request_blocker:
+        stats = request_blocker.collect_stats(driver)
+        metrics.increment('blocking.requests', stats['requests'])
+        metrics.increment('blocking.blocked_requests', stats['blocked'])
+        metrics.increment('blocking.loaded_bytes', stats['loaded_bytes'])
+        request.node.user_properties.append(('request_stats', stats))
+        if marker:
+            request_blocker.reset(driver)
     result = request.session.testsfailed
     if result != 0:
         BasePage.take_screenshot_as_png(request.cls, name=request.node.originalname + "_Failed_Screenshot")
-    driver.quit()
+    if own:
+        quit_driver(driver)
+    elif driver_pool is None:
+        driver_launcher.retire(driver)
+    else:
+        driver_pool.release(driver)
+
+
+@pytest.fixture(scope='function', autouse=True)
+def storage_state(request, driver, tmp_path_factory):
+    """
+    Restores the storage state named by the `storage_state` marker before the test body starts.
+
+    A state with a `build` callable is built once per run, by the first worker that needs it, and shared with
+    all other workers through the base temporary directory of the run. Without it the state is read from
+    resources/states.
+
+    Args:
+        request (FixtureRequest): A pytest fixture that provides information about the requesting test function.
+        driver (WebDriver): The WebDriver instance of the test.
+        tmp_path_factory (TempPathFactory): The factory of the temporary directories of the run.
+
+    Yields:
+        dict: The restored state, or None if the test has no `storage_state` marker.
+    """
+    marker = request.node.get_closest_marker('storage_state')
+    if marker is None:
+        yield None
+        return
+    name, builder = marker.args[0], marker.kwargs.get('build')
+    if builder is None:
+        state = load(name if os.path.isabs(name) else os.path.join(STATES_DIR, name))
+    else:
+        base_temp = tmp_path_factory.getbasetemp()
+        shared_temp = base_temp.parent if hasattr(request.config, 'workerinput') else base_temp
+        state = build_once(str(shared_temp / 'storage_states' / name), builder, driver)
+    with metrics.timer('storage_state.restore', label=name):
+        identifier = restore(driver, state)
+    yield state
+    forget(driver, identifier)
 
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
@@ -111,3 +358,46 @@ def pytest_runtest_makereport(item):
         setattr(item, "rep_outcome", rep.outcome)
     else:
         setattr(item, "rep_outcome", "")
+
+
+def pytest_sessionfinish(session):
+    """
+    Hands the metrics collected by an xdist worker over to the controller process.
+
+    Args:
+        session (Session): The pytest session object.
+    """
+    if hasattr(session.config, 'workeroutput'):
+        session.config.workeroutput['metrics'] = metrics.as_dict()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """
+    Stores the metrics reported by a finished xdist worker.
+
+    Args:
+        node (WorkerController): The finished worker.
+        error: The error of the worker, if any.
+    """
+    report = getattr(node, 'workeroutput', {}).get('metrics')
+    if report:
+        worker_reports[node.gateway.id] = report
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """
+    Prints the collected performance metrics per worker at the end of the run.
+
+    Args:
+        terminalreporter (TerminalReporter): The pytest terminal reporter.
+        config (Config): The pytest config object.
+    """
+    if hasattr(config, 'workeroutput'):
+        return
+    reports = worker_reports or {'main': metrics.as_dict()}
+    lines = format_report(reports)
+    if lines:
+        terminalreporter.write_sep('=', 'performance metrics')
+        for line in lines:
+            terminalreporter.write_line(line)
@@ -0,0 +1,128 @@
+from collections import namedtuple
+
+import numpy as np
+from selenium.webdriver.support.color import Color
+
+DEFAULT_TOLERANCE = {'rgb': 10.0, 'lab': 5.0}
+BLOCK_SIZE = 256
+
+# Linear sRGB to CIE XYZ (D65) and the D65 reference white
+RGB_TO_XYZ = np.array([[0.4124564, 0.3575761, 0.1804375],
+                       [0.2126729, 0.7151522, 0.0721750],
+                       [0.0193339, 0.1191920, 0.9503041]])
+WHITE_D65 = np.array([0.95047, 1.0, 1.08883])
+
+ColorMatch = namedtuple('ColorMatch', ['indices', 'distances', 'matched', 'ambiguous', 'duplicates'])
+ColorMatch.__doc__ = """
+The nearest target color of every source color.
+
+Attributes:
+    indices (ndarray): Index of the nearest target per source, the last one of equally near targets.
+    distances (ndarray): Distance to the nearest target per source.
+    matched (ndarray): Whether the nearest target is within the tolerance.
+    ambiguous (ndarray): Whether another target is within the tolerance as well.
+    duplicates (ndarray): Whether the matched target is the match of other sources as well.
+"""
+
+
+def parse_colors(values):
+    """
+    Parses CSS color strings into an array of RGBA values, parsing every distinct string only once.
+
+    Args:
+        values (iterable): CSS colors in any form understood by selenium's Color, e.g. 'rgb(0, 128, 0)',
+                           'rgba(0, 128, 0, 0.5)', '#008000' or 'green'.
+
+    Returns:
+        ndarray: An (N, 4) float array of red, green and blue in 0-255 and alpha in 0-1.
+
+    Raises:
+        ValueError: If a value is not a valid color.
+    """
+    values = np.asarray(list(values), dtype=str)
+    if not values.size:
+        return np.empty((0, 4))
+    unique, inverse = np.unique(values, return_inverse=True)
+    parsed = []
+    for value in unique:
+        color = Color.from_string(value)
+        parsed.append((color.red, color.green, color.blue, float(color.alpha)))
+    return np.array(parsed, dtype=float)[inverse.reshape(-1)]
+
+
+def to_lab(rgba):
+    """
+    Converts RGBA values to CIE L*a*b*, keeping the alpha channel.
+
+    Args:
+        rgba (ndarray): An (N, 4) array as returned by `parse_colors`.
+
+    Returns:
+        ndarray: An (N, 4) array of L*, a*, b* and alpha in 0-1.
+    """
+    srgb = rgba[:, :3] / 255.0
+    linear = np.where(srgb <= 0.04045, srgb / 12.92, ((srgb + 0.055) / 1.055) ** 2.4)
+    xyz = linear @ RGB_TO_XYZ.T / WHITE_D65
+    f = np.where(xyz > (6 / 29) ** 3, np.cbrt(xyz), xyz / (3 * (6 / 29) ** 2) + 4 / 29)
+    lab = np.stack([116 * f[:, 1] - 16, 500 * (f[:, 0] - f[:, 1]), 200 * (f[:, 1] - f[:, 2])], axis=1)
+    return np.concatenate([lab, rgba[:, 3:]], axis=1)
+
+
+def _coordinates(rgba, space):
+    """Projects RGBA values into the space distances are measured in, alpha scaled like the color channels."""
+    if space == 'rgb':
+        return np.concatenate([rgba[:, :3], rgba[:, 3:] * 255], axis=1)
+    if space == 'lab':
+        lab = to_lab(rgba)
+        return np.concatenate([lab[:, :3], lab[:, 3:] * 100], axis=1)
+    raise ValueError(f'Color space "{space}" is not "rgb" or "lab"')
+
+
+def match_colors(sources, targets, tolerance=None, space='rgb'):
+    """
+    Finds the nearest target color of every source color.
+
+    Distances are Euclidean in RGBA or, with space='lab', in the perceptual CIE L*a*b* space (delta E 1976),
+    computed block-wise with NumPy so thousands of colors are matched without Python loops over pairs.
+
+    Args:
+        sources (iterable): The CSS colors to match, e.g. of the draggables.
+        targets (iterable): The CSS colors to match against, e.g. of the droppables.
+        tolerance (float, optional): The largest distance of a match. Defaults to `DEFAULT_TOLERANCE` of the space.
+        space (str): 'rgb' or 'lab'.
+
+    Returns:
+        ColorMatch: The nearest target per source and which matches are missing, ambiguous or shared.
+
+    Raises:
+        ValueError: If the color space is unknown or a value is not a valid color.
+    """
+    tolerance = DEFAULT_TOLERANCE.get(space, 0) if tolerance is None else tolerance
+    source_points = _coordinates(parse_colors(sources), space)
+    target_points = _coordinates(parse_colors(targets), space)
+    count = len(source_points)
+    indices = np.zeros(count, dtype=int)
+    distances = np.full(count, np.inf)
+    runner_up = np.full(count, np.inf)
+
+    if len(target_points):
+        target_norms = (target_points ** 2).sum(axis=1)
+        for start in range(0, count, BLOCK_SIZE):
+            block = source_points[start:start + BLOCK_SIZE]
+            # Squared distances of the block to every target, ||a||^2 + ||b||^2 - 2ab, without (N, M, 4) temporaries
+            matrix = (block ** 2).sum(axis=1)[:, None] + target_norms[None, :] - 2 * block @ target_points.T
+            np.maximum(matrix, 0, out=matrix)
+            rows = np.arange(len(block))
+            # The last of equally near targets wins, like a later droppable of the same color
+            nearest = matrix.shape[1] - 1 - np.argmin(matrix[:, ::-1], axis=1)
+            indices[start:start + len(block)] = nearest
+            distances[start:start + len(block)] = np.sqrt(matrix[rows, nearest])
+            if len(target_points) > 1:
+                matrix[rows, nearest] = np.inf
+                runner_up[start:start + len(block)] = np.sqrt(matrix.min(axis=1))
+
+    matched = distances <= tolerance
+    ambiguous = matched & (runner_up <= tolerance)
+    shares = np.bincount(indices[matched], minlength=len(target_points))
+    duplicates = matched & (shares[indices] > 1) if len(target_points) else np.zeros(count, dtype=bool)
+    return ColorMatch(indices, distances, matched, ambiguous, duplicates)
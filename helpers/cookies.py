@@ -0,0 +1,124 @@
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+SAME_SITE = {'Strict', 'Lax', 'None'}
+
+
+def supports_cdp(driver):
+    """
+    Checks whether cookies of the browser can be read and written through DevTools.
+
+    Args:
+        driver (WebDriver): The WebDriver instance.
+
+    Returns:
+        bool: True for Chromium based browsers.
+    """
+    return hasattr(driver, 'execute_cdp_cmd')
+
+
+def to_cdp_cookie(cookie, url):
+    """
+    Converts a WebDriver cookie into a `Network.CookieParam` of DevTools.
+
+    Args:
+        cookie (dict): A cookie as passed to WebDriver.add_cookie, with at least 'name' and 'value' keys.
+        url (str): The URL the cookie is set for when it has no 'domain', like WebDriver uses the current page.
+
+    Returns:
+        dict: The cookie in the DevTools format.
+    """
+    param = {'name': cookie['name'], 'value': str(cookie['value']), 'path': cookie.get('path', '/')}
+    if cookie.get('domain'):
+        param['domain'] = cookie['domain']
+        param['secure'] = cookie.get('secure', False)
+    else:
+        param['url'] = url
+        if 'secure' in cookie:
+            param['secure'] = cookie['secure']
+    if 'httpOnly' in cookie:
+        param['httpOnly'] = cookie['httpOnly']
+    if cookie.get('expiry') is not None:
+        param['expires'] = cookie['expiry']
+    if cookie.get('sameSite') in SAME_SITE:
+        param['sameSite'] = cookie['sameSite']
+    return param
+
+
+def from_cdp_cookie(cookie):
+    """
+    Converts a `Network.Cookie` of DevTools into the format returned by WebDriver.get_cookies.
+
+    Args:
+        cookie (dict): The cookie as returned by DevTools.
+
+    Returns:
+        dict: The cookie in the WebDriver format. Session cookies have no 'expiry' key.
+    """
+    result = {'name': cookie['name'], 'value': cookie['value'], 'domain': cookie['domain'],
+              'path': cookie['path'], 'secure': cookie['secure'], 'httpOnly': cookie['httpOnly'],
+              'sameSite': cookie.get('sameSite', 'Lax')}
+    if not cookie.get('session', cookie.get('expires', -1) < 0):
+        result['expiry'] = int(cookie['expires'])
+    return result
+
+
+def parse_set_cookie(header, url):
+    """
+    Parses the value of a `Set-Cookie` response header into the format returned by WebDriver.get_cookies.
+
+    Args:
+        header (str): The header value, e.g. 'id=1; Max-Age=60; Path=/'.
+        url (str): The URL of the response, which sets the host and default path of the cookie.
+
+    Returns:
+        dict: The cookie. Host-only cookies have a domain without a leading dot, session cookies no 'expiry' key.
+    """
+    pair, *attributes = header.split(';')
+    name, _, value = pair.partition('=')
+    parts = urlsplit(url)
+    path = parts.path[:parts.path.rfind('/')] if parts.path.startswith('/') else ''
+    cookie = {'name': name.strip(), 'value': value.strip(), 'domain': parts.hostname, 'path': path or '/',
+              'secure': False, 'httpOnly': False, 'sameSite': 'Lax'}
+    expiry = max_age = None
+    for attribute in attributes:
+        key, _, argument = attribute.partition('=')
+        key, argument = key.strip().lower(), argument.strip()
+        if key == 'domain' and argument:
+            cookie['domain'] = '.' + argument.lstrip('.').lower()
+        elif key == 'path' and argument.startswith('/'):
+            cookie['path'] = argument
+        elif key == 'secure':
+            cookie['secure'] = True
+        elif key == 'httponly':
+            cookie['httpOnly'] = True
+        elif key == 'samesite' and argument.capitalize() in SAME_SITE:
+            cookie['sameSite'] = argument.capitalize()
+        elif key == 'max-age' and argument.lstrip('-').isdigit():
+            max_age = int(argument)
+        elif key == 'expires':
+            try:
+                expiry = int(parsedate_to_datetime(argument.replace('-', ' ')).timestamp())
+            except (TypeError, ValueError):
+                pass
+    if max_age is not None:
+        expiry = int(time.time()) + max_age
+    if expiry is not None:
+        cookie['expiry'] = expiry
+    return cookie
+
+
+def same_origin(first, second):
+    """
+    Checks whether two URLs share scheme, host and port.
+
+    Args:
+        first (str): A URL.
+        second (str): Another URL.
+
+    Returns:
+        bool: True if both URLs are on the same origin.
+    """
+    first, second = urlsplit(first), urlsplit(second)
+    return (first.scheme, first.netloc) == (second.scheme, second.netloc)
@@ -0,0 +1,166 @@
+import json
+import threading
+import urllib.request
+
+import websocket
+from selenium.common import TimeoutException, WebDriverException
+
+# Passed as the session to `take_events` and `wait_for_event` to match the events of every session.
+ANY_SESSION = object()
+
+
+def _matches(event, session_id):
+    """Checks whether an event belongs to a session, see `ANY_SESSION`."""
+    return session_id is ANY_SESSION or event.get('sessionId') == session_id
+
+
+def devtools_url(driver):
+    """
+    Looks up the browser level DevTools endpoint of a local Chromium based browser.
+
+    Args:
+        driver (WebDriver): The WebDriver instance.
+
+    Returns:
+        str: The websocket URL, or None if the session does not report a debugger address.
+    """
+    for name, options in driver.capabilities.items():
+        if name.endswith('Options') and isinstance(options, dict) and options.get('debuggerAddress'):
+            with urllib.request.urlopen(f"http://{options['debuggerAddress']}/json/version", timeout=5) as response:
+                return json.load(response)['webSocketDebuggerUrl']
+    return None
+
+
+class DevToolsConnection:
+    """
+    A DevTools connection of its own to the browser, able to address every target and to receive events.
+
+    WebDriver only sends DevTools commands to the target of the current window and never delivers events. This
+    connection attaches to any target in flat mode and sends commands to it by its session, without switching
+    windows. A daemon thread reads the connection: responses are handed to the waiting `send` and events are
+    kept, per session, until they are taken with `take_events`.
+    """
+
+    def __init__(self, url):
+        """
+        Connects to the browser.
+
+        Args:
+            url (str): The browser level websocket URL, see `devtools_url`.
+        """
+        self.socket = websocket.create_connection(url)
+        self.sessions = {}
+        self.responses = {}
+        self.events = []
+        self.last_id = 0
+        self.closed = False
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self._listen, name='devtools', daemon=True)
+        self.thread.start()
+
+    def _listen(self):
+        """Reads the responses and events of the connection until it is closed."""
+        while True:
+            try:
+                message = json.loads(self.socket.recv())
+            except (websocket.WebSocketException, OSError, ValueError):
+                with self.condition:
+                    self.closed = True
+                    self.condition.notify_all()
+                return
+            with self.condition:
+                if 'id' in message:
+                    self.responses[message['id']] = message
+                else:
+                    self.events.append(message)
+                self.condition.notify_all()
+
+    def send(self, method, params=None, session_id=None, timeout=30):
+        """
+        Sends a command and waits for its response.
+
+        Args:
+            method (str): The DevTools method.
+            params (dict, optional): The parameters of the command.
+            session_id (str, optional): The session of the target to send the command to, see `attach`.
+            timeout (float): time to wait for the response.
+
+        Returns:
+            dict: The result of the command.
+
+        Raises:
+            WebDriverException: If the command failed or the connection is closed.
+            TimeoutException: If the browser does not respond within the timeout.
+        """
+        with self.condition:
+            self.last_id += 1
+            message_id = self.last_id
+        message = {'id': message_id, 'method': method, 'params': params or {}}
+        if session_id:
+            message['sessionId'] = session_id
+        self.socket.send(json.dumps(message))
+        with self.condition:
+            if not self.condition.wait_for(lambda: message_id in self.responses or self.closed, timeout):
+                raise TimeoutException(f'{method} got no response within {timeout}s')
+            response = self.responses.pop(message_id, None)
+        if response is None:
+            raise WebDriverException(f'{method} failed: the DevTools connection is closed')
+        if 'error' in response:
+            raise WebDriverException(f"{method} failed: {response['error'].get('message')}")
+        return response['result']
+
+    def attach(self, target_id):
+        """
+        Attaches to a target once and returns its session.
+
+        Args:
+            target_id (str): The id of the target, which is also its window handle.
+
+        Returns:
+            str: The session id to pass to `send`.
+        """
+        if target_id not in self.sessions:
+            self.sessions[target_id] = self.send(
+                'Target.attachToTarget', {'targetId': target_id, 'flatten': True})['sessionId']
+        return self.sessions[target_id]
+
+    def take_events(self, session_id=None):
+        """
+        Removes the events received so far for a session and returns them.
+
+        Args:
+            session_id (str, optional): The session of the events, None for the events of the browser or
+                                        `ANY_SESSION` for all events.
+
+        Returns:
+            list: The events, dicts with 'method' and 'params' keys and the 'sessionId' of their target, in the
+                  order they were received.
+        """
+        with self.condition:
+            taken = [event for event in self.events if _matches(event, session_id)]
+            self.events = [event for event in self.events if not _matches(event, session_id)]
+        return taken
+
+    def wait_for_event(self, session_id=None, timeout=None):
+        """
+        Waits until an event of a session is received that was not taken yet.
+
+        Args:
+            session_id (str, optional): The session of the event, None for the events of the browser or
+                                        `ANY_SESSION` for any event.
+            timeout (float, optional): time to wait. By default without a limit.
+
+        Returns:
+            bool: True if there is an event to take, False after the timeout or when the connection is closed.
+        """
+        with self.condition:
+            return bool(self.condition.wait_for(
+                lambda: any(_matches(event, session_id) for event in self.events) or self.closed,
+                timeout)) and not self.closed
+
+    def close(self):
+        """Closes the connection, which also ends the reading thread and detaches its sessions."""
+        try:
+            self.socket.close()
+        except (websocket.WebSocketException, OSError):
+            pass
@@ -0,0 +1,162 @@
+import json
+import threading
+import time
+
+import websocket
+from selenium.common import TimeoutException, WebDriverException
+
+EVENTS = ('browsingContext.userPromptOpened', 'browsingContext.userPromptClosed')
+
+
+def supports_bidi(driver):
+    """
+    Checks whether the session was started with a WebDriver BiDi connection.
+
+    Args:
+        driver (WebDriver): The WebDriver instance.
+
+    Returns:
+        bool: True if the session returned a 'webSocketUrl' capability.
+    """
+    return isinstance(driver.capabilities.get('webSocketUrl'), str)
+
+
+class DialogListener:
+    """
+    Records every user prompt (alert, confirm, prompt or beforeunload dialog) the browser opens, as it opens.
+
+    The listener subscribes to the `browsingContext.userPromptOpened` and `browsingContext.userPromptClosed`
+    events on a WebDriver BiDi connection of its own and reads them on a daemon thread, so waiting for a dialog
+    blocks on the event instead of polling for an alert. The connection is closed by `close`, at the latest when
+    the session ends.
+    """
+
+    def __init__(self, driver):
+        """
+        Connects to the BiDi endpoint of the session and subscribes to the prompt events.
+
+        Args:
+            driver (WebDriver): A WebDriver instance started with the 'webSocketUrl' capability.
+
+        Raises:
+            WebDriverException: If the browser rejects the subscription.
+        """
+        self.dialogs = []
+        self.open = {}
+        self.handled = 0
+        self.condition = threading.Condition()
+        self.socket = websocket.create_connection(driver.capabilities['webSocketUrl'])
+        self.socket.send(json.dumps({'id': 1, 'method': 'session.subscribe', 'params': {'events': list(EVENTS)}}))
+        while True:
+            message = json.loads(self.socket.recv())
+            if message.get('id') == 1:
+                break
+            self._handle(message)
+        if 'error' in message:
+            self.socket.close()
+            raise WebDriverException(f"Subscribing to the prompt events failed: {message['error']}: "
+                                     f"{message.get('message', '')}")
+        self.thread = threading.Thread(target=self._listen, name='dialog-listener', daemon=True)
+        self.thread.start()
+
+    def _listen(self):
+        """Reads the events of the connection until it is closed."""
+        while True:
+            try:
+                message = json.loads(self.socket.recv())
+            except (websocket.WebSocketException, OSError, ValueError):
+                return
+            self._handle(message)
+
+    def _handle(self, message):
+        """Records a prompt event and wakes up the waiting threads."""
+        params = message.get('params', {})
+        with self.condition:
+            if message.get('method') == EVENTS[0]:
+                dialog = {'type': params.get('type'), 'message': params.get('message', ''),
+                          'default_value': params.get('defaultValue'), 'context': params.get('context'),
+                          'opened_at': time.monotonic()}
+                self.dialogs.append(dialog)
+                self.open[dialog['context']] = dialog
+            elif message.get('method') == EVENTS[1]:
+                self.open.pop(params.get('context'), None)
+            self.condition.notify_all()
+
+    def mark(self):
+        """
+        Marks the current position in the recorded dialogs.
+
+        Returns:
+            int: The number of dialogs recorded so far, to be passed to `next_dialog`.
+        """
+        with self.condition:
+            return len(self.dialogs)
+
+    def next_dialog(self, mark, timeout):
+        """
+        Waits for the first dialog opened after a mark. Later calls of `open_dialog` do not return it again.
+
+        Args:
+            mark (int): The value returned by `mark`.
+            timeout (float): time to wait for the dialog.
+
+        Returns:
+            dict: The dialog with its 'type', 'message', 'default_value', browsing 'context' and the monotonic
+                  time it was 'opened_at'.
+
+        Raises:
+            TimeoutException: If no dialog opens within the timeout.
+        """
+        def opened():
+            if len(self.dialogs) <= mark:
+                return None
+            self.handled = max(self.handled, mark + 1)
+            return self.dialogs[mark]
+
+        return self._wait(opened, timeout)
+
+    def open_dialog(self, timeout):
+        """
+        Waits until a dialog is open that no earlier call returned.
+
+        A dialog accepted or dismissed through WebDriver stays in `open` until its closed event arrives, so every
+        call only considers the dialogs recorded after the one it returned last, like `next_dialog` after a mark.
+
+        Args:
+            timeout (float): time to wait for the dialog.
+
+        Returns:
+            dict: The open dialog, see `next_dialog`.
+
+        Raises:
+            TimeoutException: If no such dialog is open within the timeout.
+        """
+        def unhandled():
+            for index in range(self.handled, len(self.dialogs)):
+                dialog = self.dialogs[index]
+                if self.open.get(dialog['context']) is dialog:
+                    self.handled = index + 1
+                    return dialog
+            return None
+
+        return self._wait(unhandled, timeout)
+
+    def forget(self):
+        """Treats every dialog recorded so far as handled, so `open_dialog` only returns dialogs opened later."""
+        with self.condition:
+            self.handled = len(self.dialogs)
+
+    def _wait(self, condition, timeout):
+        """Waits until the condition, evaluated under the lock, returns a truthy value."""
+        with self.condition:
+            result = self.condition.wait_for(condition, timeout)
+        if not result:
+            raise TimeoutException(f'No dialog opened within {timeout}s')
+        return result
+
+    def close(self):
+        """Closes the connection, which also ends the listening thread."""
+        try:
+            self.socket.close()
+        except (websocket.WebSocketException, OSError):
+            pass
@@ -0,0 +1,115 @@
+import os
+
+from selenium import webdriver
+
+from .dialog_events import DialogListener, supports_bidi
+
+RESOURCES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'resources')
+
+
+def create_driver(test_browser, headless, extension, blocker=None, bidi='false'):
+    """
+    Launches a new WebDriver instance based on the selected browser, headless mode and extension options.
+
+    Args:
+        test_browser (str): The name of the browser to use ('chrome' or 'firefox').
+        headless (str): Specifies whether to run the browser in headless mode ('true' or 'false').
+        extension (str): Specifies whether to load the 'coordinates' extension ('true' or 'false').
+        blocker (RequestBlocker, optional): Blocks unneeded resources in the launched browser.
+        bidi (str): Specifies whether to open a WebDriver BiDi connection that records dialogs as they open
+                    ('true' or 'false'). The listener is available as `driver.dialog_listener`, None otherwise.
+
+    Returns:
+        WebDriver: The initialized WebDriver instance.
+
+    Raises:
+        ValueError: If an unsupported browser is specified.
+    """
+    if test_browser == 'firefox':
+        geco_options = webdriver.FirefoxOptions()
+        if headless == 'true':
+            geco_options.add_argument("-headless")
+        if bidi == 'true':
+            enable_bidi(geco_options)
+        driver = webdriver.Firefox(options=geco_options)
+    elif test_browser == 'chrome':
+        chrome_options = webdriver.ChromeOptions()
+        if headless == 'true':
+            chrome_options.add_argument("--headless=new")
+        if extension == 'true':
+            chrome_options.add_extension(os.path.join(RESOURCES_DIR, '0.2_0.crx'))
+        if blocker:
+            blocker.configure_options(chrome_options)
+        if bidi == 'true':
+            enable_bidi(chrome_options)
+        driver = webdriver.Chrome(options=chrome_options)
+        if blocker:
+            blocker.apply(driver)
+    else:
+        raise ValueError(f'--browser="{test_browser}" is not chrome or firefox')
+    driver.implicitly_wait(0)  # Waits are explicit and configured by WaitPolicy
+    driver.set_script_timeout(120)  # In-page waits carry their own, shorter timeouts
+    driver.dialog_listener = DialogListener(driver) if supports_bidi(driver) else None
+    return driver
+
+
+def quit_driver(driver):
+    """
+    Shuts down a browser together with the dialog listener `create_driver` attached to it.
+
+    Args:
+        driver (WebDriver): The WebDriver instance to shut down.
+    """
+    listener = getattr(driver, 'dialog_listener', None)
+    if listener is not None:
+        listener.close()
+    driver.quit()
+
+
+def enable_bidi(options):
+    """
+    Requests a WebDriver BiDi connection for the session.
+
+    Dialogs are left open for the test to handle, BiDi sessions would otherwise dismiss them as they open.
+
+    Args:
+        options (ArgOptions): The options of the browser about to be launched.
+    """
+    options.set_capability('webSocketUrl', True)
+    options.set_capability('unhandledPromptBehavior', 'ignore')
+
+
+class DriverLauncher:
+    """
+    Launches and shuts down browsers on the test's critical path.
+    """
+
+    def __init__(self, factory):
+        """
+        Initializes the launcher.
+
+        Args:
+            factory (callable): A callable without arguments that launches a new WebDriver instance.
+        """
+        self.factory = factory
+
+    def launch(self):
+        """
+        Launches a new browser.
+
+        Returns:
+            WebDriver: The launched WebDriver instance.
+        """
+        return self.factory()
+
+    def retire(self, driver):
+        """
+        Shuts down a browser that is no longer needed.
+
+        Args:
+            driver (WebDriver): The WebDriver instance to shut down.
+        """
+        quit_driver(driver)
+
+    def close(self):
+        """Releases resources held by the launcher."""
@@ -0,0 +1,149 @@
+from selenium.common import NoAlertPresentException, WebDriverException
+
+from .driver_factory import quit_driver
+
+BLANK_PAGE = 'about:blank'
+
+
+class DriverPool:
+    """
+    Keeps live WebDriver instances for the lifetime of a pytest worker and hands them out to tests.
+
+    Between tests every browser is reset to a clean state instead of being relaunched. A browser that
+    crashed or cannot be reset is discarded and replaced by a freshly spawned one.
+    """
+
+    def __init__(self, factory, size=1):
+        """
+        Initializes the pool.
+
+        Args:
+            factory (callable): A callable without arguments that launches a new WebDriver instance.
+            size (int): The maximum number of idle browsers kept alive by the pool.
+        """
+        self.factory = factory
+        self.size = max(size, 1)
+        self.idle = []
+        self.window_sizes = {}
+
+    def spawn(self):
+        """
+        Launches a new browser and remembers its initial window size for later viewport resets.
+
+        Returns:
+            WebDriver: The launched WebDriver instance.
+        """
+        driver = self.factory()
+        self.window_sizes[driver.session_id] = driver.get_window_size()
+        return driver
+
+    def warm_up(self):
+        """Launches browsers until the pool holds `size` idle instances."""
+        while len(self.idle) < self.size:
+            self.idle.append(self.spawn())
+
+    def acquire(self):
+        """
+        Hands out a live browser, respawning it if the pooled instance has crashed.
+
+        Returns:
+            WebDriver: A live WebDriver instance in a clean state.
+        """
+        while self.idle:
+            driver = self.idle.pop()
+            if self.is_alive(driver):
+                return driver
+            self.discard(driver)
+        return self.spawn()
+
+    def release(self, driver):
+        """
+        Returns a browser to the pool after resetting its state.
+
+        Browsers that fail to reset, or exceed the pool size, are shut down.
+
+        Args:
+            driver (WebDriver): The WebDriver instance handed out by `acquire`.
+        """
+        try:
+            self.reset_state(driver)
+        except WebDriverException:
+            self.discard(driver)
+            return
+        if len(self.idle) < self.size:
+            self.idle.append(driver)
+        else:
+            self.discard(driver)
+
+    def reset_state(self, driver):
+        """
+        Brings a browser back to a clean state: dismisses dialogs, closes extra windows, clears cookies
+        and storage, restores the initial viewport and navigates to a blank page.
+
+        Args:
+            driver (WebDriver): The WebDriver instance to reset.
+
+        Raises:
+            WebDriverException: If the browser does not respond.
+        """
+        try:
+            driver.switch_to.alert.dismiss()
+        except NoAlertPresentException:
+            pass
+        if getattr(driver, 'dialog_listener', None) is not None:
+            driver.dialog_listener.forget()
+
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        driver.delete_all_cookies()
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except WebDriverException:
+            pass  # Storage is not accessible on opaque origins such as about:blank
+        if hasattr(driver, 'execute_cdp_cmd'):
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+
+        initial_size = self.window_sizes.get(driver.session_id)
+        if initial_size and driver.get_window_size() != initial_size:
+            driver.set_window_size(initial_size['width'], initial_size['height'])
+
+        driver.get(BLANK_PAGE)
+
+    @staticmethod
+    def is_alive(driver):
+        """
+        Checks whether the browser behind the driver still responds.
+
+        Args:
+            driver (WebDriver): The WebDriver instance to check.
+
+        Returns:
+            bool: True if the browser responds, False otherwise.
+        """
+        try:
+            driver.current_window_handle
+        except WebDriverException:
+            return False
+        return True
+
+    def discard(self, driver):
+        """
+        Shuts down a browser, ignoring errors from an already crashed instance.
+
+        Args:
+            driver (WebDriver): The WebDriver instance to shut down.
+        """
+        self.window_sizes.pop(driver.session_id, None)
+        try:
+            quit_driver(driver)
+        except WebDriverException:
+            pass
+
+    def close(self):
+        """Shuts down all idle browsers held by the pool."""
+        while self.idle:
+            self.discard(self.idle.pop())
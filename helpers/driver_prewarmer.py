@@ -0,0 +1,96 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium.common import WebDriverException
+
+from .driver_factory import DriverLauncher, quit_driver
+from .metrics import metrics
+
+
+class DriverPrewarmer(DriverLauncher):
+    """
+    Launches the next browser on a background thread while the current test runs.
+
+    Shutting down retired browsers also happens in the background, so the teardown of one test
+    overlaps with the setup of the next one. The launch time hidden from the tests is recorded
+    in `metrics` as 'prewarm.hidden_launch_time'.
+    """
+
+    def __init__(self, factory):
+        """
+        Initializes the prewarmer.
+
+        Args:
+            factory (callable): A callable without arguments that launches a new WebDriver instance.
+        """
+        super().__init__(factory)
+        self.launcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix='driver-prewarm')
+        self.reaper = ThreadPoolExecutor(max_workers=1, thread_name_prefix='driver-reaper')
+        self.pending = None
+
+    def _launch_timed(self):
+        """
+        Launches a browser and measures how long the launch took.
+
+        Returns:
+            tuple: The launched WebDriver instance and the launch duration in seconds.
+        """
+        start = time.perf_counter()
+        driver = self.factory()
+        return driver, time.perf_counter() - start
+
+    def start(self):
+        """Starts launching the next browser in the background unless one is already on its way."""
+        if self.pending is None:
+            self.pending = self.launcher.submit(self._launch_timed)
+
+    def launch(self):
+        """
+        Hands out the pre-launched browser and immediately starts warming up the next one.
+
+        Returns:
+            WebDriver: The launched WebDriver instance.
+        """
+        self.start()
+        wait_start = time.perf_counter()
+        try:
+            driver, launch_time = self.pending.result()
+        finally:
+            self.pending = None
+        waited = time.perf_counter() - wait_start
+        metrics.record('prewarm.launch_time', launch_time)
+        metrics.record('prewarm.hidden_launch_time', max(launch_time - waited, 0.0))
+        self.start()
+        return driver
+
+    def retire(self, driver):
+        """
+        Shuts down a browser in the background.
+
+        Args:
+            driver (WebDriver): The WebDriver instance to shut down.
+        """
+        self.reaper.submit(self._quit, driver)
+
+    @staticmethod
+    def _quit(driver):
+        """
+        Shuts down a browser, ignoring errors from an already crashed instance.
+
+        Args:
+            driver (WebDriver): The WebDriver instance to shut down.
+        """
+        try:
+            quit_driver(driver)
+        except WebDriverException:
+            pass
+
+    def close(self):
+        """Shuts down the browser that was warmed up but never used and waits for background work."""
+        if self.pending is not None:
+            if self.pending.exception() is None:
+                driver, _ = self.pending.result()
+                self._quit(driver)
+            self.pending = None
+        self.launcher.shutdown(wait=True)
+        self.reaper.shutdown(wait=True)
@@ -0,0 +1,351 @@
+import argparse
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import namedtuple
+from email.utils import format_datetime, parsedate_to_datetime
+from datetime import timedelta
+from html.parser import HTMLParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urljoin, urlsplit
+
+MIRRORED_HOST = 'parsinger.ru'
+MIRROR_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'resources', 'mirror')
+MANIFEST = 'manifest.json'
+
+REMOTE_ORIGIN_RE = re.compile(rf'https?://{re.escape(MIRRORED_HOST)}(?=[/"\'\s)]|$)')
+COOKIE_EXPIRES_RE = re.compile(r'(;\s*expires=)([^;]+)', re.IGNORECASE)
+COOKIE_DOMAIN_RE = re.compile(r';\s*domain=[^;]*', re.IGNORECASE)
+COOKIE_SECURE_RE = re.compile(r';\s*secure\s*(?=;|$)', re.IGNORECASE)
+COOKIE_SAMESITE_NONE_RE = re.compile(r'(;\s*samesite=)none', re.IGNORECASE)
+LINKED_PAGE_RE = re.compile(r'''["']([^"'\s]+\.html?)["']''')
+LOCATOR_URL_RE = re.compile(rf'''URL_\w+ = ["'](https?://{re.escape(MIRRORED_HOST)}[^"']*)["']''')
+PAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'pages')
+TEXT_TYPES = ('text/', 'application/javascript', 'application/json', 'application/x-javascript')
+HOP_BY_HOP_HEADERS = {'connection', 'keep-alive', 'transfer-encoding', 'content-length', 'content-encoding'}
+
+Snapshot = namedtuple('Snapshot', ['status', 'headers', 'body', 'captured_at'])
+
+
+def is_text(headers):
+    """
+    Checks whether a response holds text that may contain links to the mirrored host.
+
+    Args:
+        headers (list): The response headers as (name, value) pairs.
+
+    Returns:
+        bool: True for HTML, CSS, JavaScript and other text responses.
+    """
+    content_type = next((value for name, value in headers if name.lower() == 'content-type'), '')
+    return content_type.startswith(TEXT_TYPES)
+
+
+def localize_cookie(header, age):
+    """
+    Adapts a recorded `Set-Cookie` header to the local origin.
+
+    The `Domain` and `Secure` attributes are dropped so that the browser accepts the cookie over plain
+    http on 127.0.0.1, and `Expires` is moved forward by the age of the recording so that relative
+    expiries stay exactly as they were when the page was captured.
+
+    Args:
+        header (str): The recorded `Set-Cookie` value.
+        age (float): Seconds elapsed since the response was recorded.
+
+    Returns:
+        str: The `Set-Cookie` value to send.
+    """
+    def shift(match):
+        try:
+            expires = parsedate_to_datetime(match.group(2).strip())
+        except (TypeError, ValueError):
+            return match.group(0)
+        return match.group(1) + format_datetime(expires + timedelta(seconds=age), usegmt=True)
+
+    header = COOKIE_EXPIRES_RE.sub(shift, header)
+    header = COOKIE_DOMAIN_RE.sub('', header)
+    header = COOKIE_SECURE_RE.sub('', header)
+    return COOKIE_SAMESITE_NONE_RE.sub(r'\1Lax', header)
+
+
+class SnapshotStore:
+    """
+    In-memory store of the page snapshots kept in `resources/mirror`.
+
+    The manifest maps every request path to the recorded status and headers, the bodies are kept
+    as plain files next to it.
+    """
+
+    def __init__(self, mirror_dir=MIRROR_DIR):
+        """
+        Loads all snapshots into memory.
+
+        Args:
+            mirror_dir (str): The directory with the manifest and the snapshot bodies.
+        """
+        self.mirror_dir = mirror_dir
+        self.responses = {}
+        manifest_path = os.path.join(mirror_dir, MANIFEST)
+        if not os.path.exists(manifest_path):
+            return
+        with open(manifest_path, encoding='utf-8') as file:
+            manifest = json.load(file)
+        for path, entry in manifest['entries'].items():
+            with open(os.path.join(mirror_dir, entry['file']), 'rb') as file:
+                body = file.read()
+            self.responses[path] = Snapshot(entry['status'], [tuple(header) for header in entry['headers']],
+                                            body, manifest['captured_at'])
+
+    def lookup(self, method, path, headers, body=b''):
+        """
+        Finds the snapshot for a request.
+
+        Args:
+            method (str): The HTTP method of the request.
+            path (str): The path and query of the request.
+            headers (Message): The headers of the request.
+            body (bytes): The body of the request.
+
+        Returns:
+            Snapshot: The recorded response, or None if the page was not captured.
+        """
+        if method not in ('GET', 'HEAD'):
+            return None
+        return self.responses.get(path) or self.responses.get(path.split('?')[0])
+
+
+class MirrorRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves responses of the server's store over keep-alive HTTP/1.1 connections.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        """Serves a GET request."""
+        self.respond(send_body=True)
+
+    def do_HEAD(self):
+        """Serves a HEAD request."""
+        self.respond(send_body=False)
+
+    def do_POST(self):
+        """Serves a POST request."""
+        self.respond(send_body=True)
+
+    def respond(self, send_body):
+        """
+        Looks up the request in the store and writes the response.
+
+        Args:
+            send_body (bool): Whether to write the response body.
+        """
+        request_body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        snapshot = self.server.store.lookup(self.command, self.path, self.headers, request_body)
+        if snapshot is None:
+            self.send_error(404, f'{self.path} is not mirrored, capture it with "python -m helpers.local_server"')
+            return
+        body = self.server.localize_body(snapshot)
+        age = time.time() - snapshot.captured_at
+        self.send_response(snapshot.status)
+        for name, value in snapshot.headers:
+            if name.lower() in HOP_BY_HOP_HEADERS:
+                continue
+            if name.lower() == 'set-cookie':
+                value = localize_cookie(value, age)
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Keeps the test output free of access logs."""
+
+
+class MirrorServer(ThreadingHTTPServer):
+    """
+    Local HTTP server that replaces the remote site during a test run.
+
+    Runs on a background thread on a free port of 127.0.0.1 and serves every response from memory.
+    Absolute links to the remote host in text responses are rewritten to the local origin.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, store, host='127.0.0.1', port=0):
+        """
+        Initializes the server.
+
+        Args:
+            store: The store of responses, any object with a `lookup(method, path, headers, body)` method.
+            host (str): The interface to listen on.
+            port (int): The port to listen on, 0 picks a free one.
+        """
+        super().__init__((host, port), MirrorRequestHandler)
+        self.store = store
+        self.origin = f'http://{host}:{self.server_address[1]}'
+        self.localized_bodies = {}
+        self.thread = None
+
+    def localize_body(self, snapshot):
+        """
+        Rewrites links to the remote host in a text response to the local origin.
+
+        Rewritten bodies are cached by the digest of their content, so the cache holds one entry per distinct
+        body of the store, also when a recording store replaces body objects.
+
+        Args:
+            snapshot (Snapshot): The response to rewrite.
+
+        Returns:
+            bytes: The body to send.
+        """
+        if not is_text(snapshot.headers):
+            return snapshot.body
+        key = hashlib.sha1(snapshot.body).hexdigest()
+        if key not in self.localized_bodies:
+            text = snapshot.body.decode('utf-8', errors='surrogateescape')
+            self.localized_bodies[key] = REMOTE_ORIGIN_RE.sub(self.origin, text).encode(
+                'utf-8', errors='surrogateescape')
+        return self.localized_bodies[key]
+
+    def local_url(self, url):
+        """
+        Translates a URL of the remote site into the matching URL of this server.
+
+        Args:
+            url (str): The remote URL.
+
+        Returns:
+            str: The local URL.
+        """
+        return REMOTE_ORIGIN_RE.sub(self.origin, url)
+
+    def start(self):
+        """Starts serving requests on a background thread."""
+        self.thread = threading.Thread(target=self.serve_forever, name='mirror-server', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stops the server and closes its socket."""
+        self.shutdown()
+        self.server_close()
+
+
+class LinkParser(HTMLParser):
+    """Collects the URLs of linked resources and pages from an HTML document."""
+
+    def __init__(self):
+        """Initializes an empty list of links."""
+        super().__init__()
+        self.links = []
+
+    def handle_starttag(self, tag, attrs):
+        """Collects `src` and `href` attributes of every tag."""
+        self.links.extend(value for name, value in attrs if name in ('src', 'href') and value)
+
+
+def snapshot_file(path):
+    """
+    Maps a request path to the file that stores its body.
+
+    Args:
+        path (str): The path and query of the request.
+
+    Returns:
+        str: The file name relative to the mirror directory.
+    """
+    file = path.lstrip('/').replace('?', '%3F')
+    if not file or file.endswith('/'):
+        file += 'index.html'
+    return file
+
+
+def capture(urls, mirror_dir=MIRROR_DIR, depth=1):
+    """
+    Downloads the given pages with their same-host resources and linked pages into the mirror directory.
+
+    Args:
+        urls (list): The remote URLs to capture.
+        mirror_dir (str): The directory to write the manifest and the snapshot bodies to.
+        depth (int): How many levels of linked pages to follow.
+
+    Returns:
+        int: The number of captured responses.
+    """
+    entries = {}
+    queue = [(url, 0) for url in urls]
+    seen = set()
+    while queue:
+        url, level = queue.pop(0)
+        url = url.split('#')[0]
+        parts = urlsplit(url)
+        path = parts.path + (f'?{parts.query}' if parts.query else '')
+        if parts.hostname != MIRRORED_HOST or path in seen:
+            continue
+        seen.add(path)
+        try:
+            response = urllib.request.urlopen(url, timeout=30)
+        except urllib.error.HTTPError as error:
+            response = error
+        body = response.read()
+        headers = [(name, value) for name, value in response.headers.items()
+                   if name.lower() not in HOP_BY_HOP_HEADERS]
+        if not any(name.lower() == 'content-type' for name, _ in headers):
+            headers.append(('Content-Type', mimetypes.guess_type(parts.path)[0] or 'application/octet-stream'))
+        file = snapshot_file(path)
+        os.makedirs(os.path.dirname(os.path.join(mirror_dir, file)), exist_ok=True)
+        with open(os.path.join(mirror_dir, file), 'wb') as out:
+            out.write(body)
+        entries[path] = {'status': response.status, 'headers': headers, 'file': file}
+
+        if is_text(headers):
+            text = body.decode('utf-8', errors='replace')
+            parser = LinkParser()
+            parser.feed(text)
+            pages = set(LINKED_PAGE_RE.findall(text))
+            for link in parser.links:
+                if link.endswith(('.html', '.htm', '/')):
+                    pages.add(link)
+                else:
+                    queue.append((urljoin(url, link), level))
+            if level < depth:
+                queue.extend((urljoin(url, link), level + 1) for link in pages)
+
+    with open(os.path.join(mirror_dir, MANIFEST), 'w', encoding='utf-8') as out:
+        json.dump({'host': MIRRORED_HOST, 'captured_at': time.time(), 'entries': entries}, out, indent=1,
+                  sort_keys=True)
+    return len(entries)
+
+
+def locator_urls():
+    """
+    Collects the URLs of every `*Locators` class from the page object sources.
+
+    The sources are scanned instead of imported, so capturing works without Selenium installed.
+
+    Returns:
+        list: The remote URLs the tests open.
+    """
+    urls = []
+    for name in sorted(os.listdir(PAGES_DIR)):
+        if name.endswith('.py'):
+            with open(os.path.join(PAGES_DIR, name), encoding='utf-8') as file:
+                urls.extend(LOCATOR_URL_RE.findall(file.read()))
+    return urls
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='Capture the pages used by the tests into resources/mirror.')
+    arg_parser.add_argument('urls', nargs='*', help='URLs to capture, defaults to every URL of the page objects')
+    arg_parser.add_argument('--depth', type=int, default=1, help='levels of linked pages to follow')
+    args = arg_parser.parse_args()
+    print(f'Captured {capture(args.urls or locator_urls(), depth=args.depth)} responses into {MIRROR_DIR}')
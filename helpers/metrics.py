@@ -0,0 +1,136 @@
+import time
+from contextlib import contextmanager
+
+
+class Metrics:
+    """
+    Collects counters and timings of the current test process.
+
+    Each pytest process (the main one or an xdist worker) owns a single instance, `metrics`, which is
+    reported in the terminal summary at the end of the run.
+    """
+
+    def __init__(self):
+        """Initializes empty counters and timings."""
+        self.counters = {}
+        self.timings = {}
+
+    def increment(self, name, amount=1):
+        """
+        Increases a counter.
+
+        Args:
+            name (str): The name of the counter.
+            amount (int or float): The value to add to the counter.
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record(self, name, seconds, label=None):
+        """
+        Records a single timing sample.
+
+        Args:
+            name (str): The name of the timing.
+            seconds (float): The measured duration in seconds.
+            label (str, optional): What was measured, used to list the slowest samples.
+        """
+        self.timings.setdefault(name, []).append((seconds, label))
+
+    @contextmanager
+    def timer(self, name, label=None):
+        """
+        Measures the duration of the wrapped block and records it as a timing sample.
+
+        Args:
+            name (str): The name of the timing.
+            label (str, optional): What was measured, used to list the slowest samples.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, label)
+
+    def as_dict(self):
+        """
+        Returns the collected data in a form that can be sent from an xdist worker to the controller.
+
+        Returns:
+            dict: A dictionary with 'counters' and 'timings' keys.
+        """
+        return {'counters': dict(self.counters),
+                'timings': {name: list(samples) for name, samples in self.timings.items()}}
+
+
+metrics = Metrics()
+
+worker_reports = {}
+
+
+class CommandCounter:
+    """
+    Counts the WebDriver commands sent by a driver while the counter is active.
+
+    Usage:
+        with CommandCounter(driver) as counter:
+            ...
+        counter.total
+    """
+
+    def __init__(self, driver):
+        """
+        Initializes the counter.
+
+        Args:
+            driver (WebDriver): The WebDriver instance whose commands are counted.
+        """
+        self.driver = driver
+        self.counts = {}
+        self.previous = None
+
+    def __enter__(self):
+        self.previous = self.driver.__dict__.get('execute')
+        execute = self.driver.execute
+
+        def counted_execute(driver_command, params=None):
+            self.counts[driver_command] = self.counts.get(driver_command, 0) + 1
+            return execute(driver_command, params)
+
+        self.driver.execute = counted_execute
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.previous is None:
+            del self.driver.execute
+        else:
+            self.driver.execute = self.previous
+
+    @property
+    def total(self):
+        """int: The number of commands sent while the counter was active."""
+        return sum(self.counts.values())
+
+
+def format_report(reports, slowest=5):
+    """
+    Formats the collected metrics of every worker as lines for the terminal summary.
+
+    Args:
+        reports (dict): Mapping of worker id to the data returned by `Metrics.as_dict`.
+        slowest (int): How many of the slowest labelled samples to list per timing.
+
+    Returns:
+        list: The lines of the report.
+    """
+    lines = []
+    for worker_id, report in sorted(reports.items()):
+        for name, value in sorted(report['counters'].items()):
+            lines.append(f"[{worker_id}] {name}: {value:g}")
+        for name, samples in sorted(report['timings'].items()):
+            durations = [seconds for seconds, _ in samples]
+            lines.append(f"[{worker_id}] {name}: total {sum(durations):.3f}s over {len(durations)}, "
+                         f"mean {sum(durations) / len(durations):.3f}s, max {max(durations):.3f}s")
+            labelled = sorted((sample for sample in samples if sample[1]), key=lambda x: x[0], reverse=True)
+            for seconds, label in labelled[:slowest]:
+                lines.append(f"    {seconds:.3f}s {label}")
+    return lines
@@ -0,0 +1,149 @@
+import base64
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from .local_server import HOP_BY_HOP_HEADERS, MIRRORED_HOST, Snapshot
+
+ARCHIVE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'resources',
+                            'archive.json.gz')
+UPSTREAM_ORIGIN = f'https://{MIRRORED_HOST}'
+NOT_FORWARDED_HEADERS = HOP_BY_HOP_HEADERS | {'host', 'accept-encoding', 'referer', 'origin'}
+
+
+class ArchiveStore:
+    """
+    Record/replay store of HTTP exchanges for the local mirror server.
+
+    In record mode every request missing from the archive is forwarded to the remote site and the
+    response is added to the archive. In replay mode only recorded responses are served and the
+    network is never touched.
+
+    Exchanges are indexed by method and URL first and then by the values of the request headers named
+    in the response's `Vary` header, so a lookup costs two dictionary accesses regardless of the size
+    of the archive. Identical bodies are stored once.
+    """
+
+    def __init__(self, archive_path=ARCHIVE_PATH, record=False, upstream=UPSTREAM_ORIGIN):
+        """
+        Loads the archive into memory.
+
+        Args:
+            archive_path (str): The path of the gzip compressed JSON archive.
+            record (bool): Whether to forward and record requests missing from the archive.
+            upstream (str): The origin of the remote site that requests are forwarded to when recording.
+        """
+        self.archive_path = archive_path
+        self.record = record
+        self.upstream = upstream
+        self.index = {}
+        self.bodies = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if os.path.exists(archive_path):
+            with gzip.open(archive_path, 'rt', encoding='utf-8') as file:
+                archive = json.load(file)
+            self.bodies = {digest: base64.b64decode(body) for digest, body in archive['bodies'].items()}
+            for entry in archive['entries']:
+                self.add(entry)
+
+    @staticmethod
+    def vary_key(vary, headers):
+        """
+        Builds the part of the index key that depends on the request headers.
+
+        Args:
+            vary (tuple): Lower-case names of the headers the response varies on.
+            headers: The request headers, any mapping with a case-insensitive `get`.
+
+        Returns:
+            tuple: The values of the named headers.
+        """
+        return tuple(headers.get(name) or '' for name in vary)
+
+    def add(self, entry):
+        """
+        Adds a recorded exchange to the index.
+
+        Args:
+            entry (dict): The exchange with 'method', 'path', 'vary', 'request_headers', 'status',
+                          'headers', 'body' (digest) and 'captured_at' keys.
+        """
+        variants = self.index.setdefault((entry['method'], entry['path']), {'vary': tuple(entry['vary']),
+                                                                          'entries': {}})
+        request_headers = {name.lower(): value for name, value in entry['request_headers']}
+        variants['entries'][self.vary_key(variants['vary'], request_headers)] = entry
+
+    def lookup(self, method, path, headers, body=b''):
+        """
+        Finds the recorded response for a request, recording it first in record mode.
+
+        Args:
+            method (str): The HTTP method of the request.
+            path (str): The path and query of the request.
+            headers (Message): The headers of the request.
+            body (bytes): The body of the request.
+
+        Returns:
+            Snapshot: The recorded response, or None if it is missing in replay mode.
+        """
+        variants = self.index.get((method, path))
+        entry = variants and variants['entries'].get(self.vary_key(variants['vary'], headers))
+        if entry is None and self.record:
+            entry = self.fetch(method, path, headers, body)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return Snapshot(entry['status'], entry['headers'], self.bodies[entry['body']], entry['captured_at'])
+
+    def fetch(self, method, path, headers, body):
+        """
+        Forwards a request to the remote site and records the exchange.
+
+        Args:
+            method (str): The HTTP method of the request.
+            path (str): The path and query of the request.
+            headers (Message): The headers of the request.
+            body (bytes): The body of the request.
+
+        Returns:
+            dict: The recorded exchange.
+        """
+        request_headers = [(name, value) for name, value in headers.items()
+                           if name.lower() not in NOT_FORWARDED_HEADERS]
+        request = urllib.request.Request(self.upstream + path, data=body or None, method=method,
+                                         headers=dict(request_headers))
+        try:
+            response = urllib.request.urlopen(request, timeout=30)
+        except urllib.error.HTTPError as error:
+            response = error
+        response_body = response.read()
+        response_headers = [(name, value) for name, value in response.headers.items()
+                            if name.lower() not in HOP_BY_HOP_HEADERS]
+        vary = sorted({name.strip().lower() for value in response.headers.get_all('Vary', [])
+                       for name in value.split(',') if name.strip() and name.strip() != '*'}
+                      - NOT_FORWARDED_HEADERS)
+        digest = hashlib.sha1(response_body).hexdigest()
+        entry = {'method': method, 'path': path, 'vary': vary,
+                 'request_headers': [(name, value) for name, value in request_headers if name.lower() in vary],
+                 'status': response.status, 'headers': response_headers, 'body': digest,
+                 'captured_at': time.time()}
+        with self.lock:
+            self.bodies[digest] = response_body
+            self.add(entry)
+        return entry
+
+    def save(self):
+        """Writes the archive to disk."""
+        entries = [entry for variants in self.index.values() for entry in variants['entries'].values()]
+        archive = {'host': MIRRORED_HOST, 'entries': entries,
+                   'bodies': {digest: base64.b64encode(body).decode('ascii') for digest, body in self.bodies.items()}}
+        with gzip.open(self.archive_path, 'wt', encoding='utf-8') as file:
+            json.dump(archive, file, separators=(',', ':'))
@@ -0,0 +1,207 @@
+import json
+import os
+import time
+from urllib.parse import urlsplit
+
+from .cookies import from_cdp_cookie, supports_cdp, to_cdp_cookie
+from .driver_factory import RESOURCES_DIR
+
+STATES_DIR = os.path.join(RESOURCES_DIR, 'states')
+RESTORED_FLAG = '__storage_state_restored'
+
+READ_STORAGE = """
+if (window.location.origin === 'null') {
+    return null;
+}
+function items(storage) {
+    var result = {};
+    for (var i = 0; i < storage.length; i++) {
+        result[storage.key(i)] = storage.getItem(storage.key(i));
+    }
+    return result;
+}
+return {origin: window.location.origin, localStorage: items(window.localStorage),
+        sessionStorage: items(window.sessionStorage)};
+"""
+
+# Seeds the storage of an origin once per tab, on the first document of the origin, before any page script runs
+SEED_STORAGE = """
+(function (origins) {
+    var entry = origins[window.location.origin];
+    if (!entry || window.sessionStorage.getItem('%(flag)s')) {
+        return;
+    }
+    Object.keys(entry.localStorage).forEach(function (key) {
+        window.localStorage.setItem(key, entry.localStorage[key]);
+    });
+    Object.keys(entry.sessionStorage).forEach(function (key) {
+        window.sessionStorage.setItem(key, entry.sessionStorage[key]);
+    });
+    window.sessionStorage.setItem('%(flag)s', '1');
+})(%(origins)s);
+"""
+
+
+def capture(driver):
+    """
+    Captures the storage state of a browser: every cookie and the storage of the origin of the current page.
+
+    Only the local and session storage of the current origin is read, the storage of other origins the session
+    visited, including the origins of frames on the current page, is not part of the state. Capture the state on
+    the page whose origin has to be restored.
+
+    Args:
+        driver (WebDriver): The WebDriver instance.
+
+    Returns:
+        dict: The state with a 'cookies' list in the format of WebDriver.get_cookies and an 'origins' list of
+              dicts with 'origin', 'localStorage' and 'sessionStorage' keys.
+    """
+    if supports_cdp(driver):
+        cookies = driver.execute_cdp_cmd('Network.getAllCookies', {})['cookies']
+        cookies = [from_cdp_cookie(cookie) for cookie in cookies]
+    else:
+        cookies = driver.get_cookies()
+    storage = driver.execute_script(READ_STORAGE)
+    return {'cookies': cookies, 'origins': [storage] if storage else []}
+
+
+def save(state, path):
+    """
+    Writes a storage state to a compact JSON file.
+
+    Args:
+        state (dict): The state returned by `capture`.
+        path (str): The path of the file.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(state, file, separators=(',', ':'))
+
+
+def load(path):
+    """
+    Reads a storage state from a JSON file.
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        dict: The state.
+    """
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def restore(driver, state):
+    """
+    Applies a storage state to a browser.
+
+    Chromium based browsers get all cookies with one DevTools command and a script that seeds the storage of
+    every origin on its first document, before the page scripts run, so no page is loaded. Other browsers load
+    the root of every origin of the state, add the cookies of its host and write its storage; cookies of other
+    domains are not restored there.
+
+    Args:
+        driver (WebDriver): The WebDriver instance.
+        state (dict): The state returned by `capture` or `load`.
+
+    Returns:
+        str: The identifier of the seeding script, to be passed to `forget`, or None.
+    """
+    origins = {entry['origin']: entry for entry in state['origins']}
+    if supports_cdp(driver):
+        if state['cookies']:
+            driver.execute_cdp_cmd(
+                'Network.setCookies', {'cookies': [_to_cdp_cookie(cookie) for cookie in state['cookies']]})
+        if not origins:
+            return None
+        source = SEED_STORAGE % {'flag': RESTORED_FLAG, 'origins': json.dumps(origins)}
+        return driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': source})['identifier']
+
+    for origin, entry in origins.items():
+        host = urlsplit(origin).hostname
+        driver.get(origin + '/')
+        for cookie in state['cookies']:
+            domain = cookie.get('domain', '')
+            if not domain.startswith('.'):
+                if host == domain:
+                    driver.add_cookie({key: value for key, value in cookie.items() if key != 'domain'})
+            elif host == domain[1:] or host.endswith(domain):
+                driver.add_cookie(cookie)
+        driver.execute_script(
+            SEED_STORAGE % {'flag': RESTORED_FLAG, 'origins': json.dumps({origin: entry})})
+    return None
+
+
+def _to_cdp_cookie(cookie):
+    """
+    Converts a captured cookie into a `Network.CookieParam`, keeping host-only cookies host-only.
+
+    A domain without a leading dot marks a host-only cookie, DevTools would turn it into a domain cookie that is
+    also sent to subdomains, so it is set for the URL of its host instead.
+
+    Args:
+        cookie (dict): A cookie in the format of WebDriver.get_cookies.
+
+    Returns:
+        dict: The cookie in the DevTools format.
+    """
+    domain = cookie.get('domain', '')
+    if domain.startswith('.'):
+        return to_cdp_cookie(cookie, None)
+    url = f"{'https' if cookie.get('secure') else 'http'}://{domain}{cookie.get('path', '/')}"
+    return to_cdp_cookie({key: value for key, value in cookie.items() if key != 'domain'}, url)
+
+
+def forget(driver, identifier):
+    """
+    Stops seeding the storage of new documents after `restore`.
+
+    Args:
+        driver (WebDriver): The WebDriver instance.
+        identifier (str): The identifier returned by `restore`, or None.
+    """
+    if identifier is not None:
+        driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument', {'identifier': identifier})
+
+
+def build_once(path, builder, driver, timeout=300):
+    """
+    Builds a storage state file once, shared by all pytest workers of a run.
+
+    The first worker to claim the lock file runs the builder and saves the captured state, the others wait for
+    the file to appear, or take over the lock if the builder failed.
+
+    Args:
+        path (str): The path of the state file.
+        builder (callable): Called with the driver to bring the browser into the wanted state.
+        driver (WebDriver): The WebDriver instance of the calling worker.
+        timeout (float): How long to wait for another worker to build the state.
+
+    Returns:
+        dict: The state.
+
+    Raises:
+        TimeoutError: If another worker does not finish the state within the timeout.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    deadline = time.monotonic() + timeout
+    while True:
+        if os.path.exists(path):
+            return load(path)
+        try:
+            os.close(os.open(path + '.lock', os.O_CREAT | os.O_EXCL))
+            break
+        except FileExistsError:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f'Storage state {path} was not built within {timeout}s')
+            time.sleep(0.1)
+    try:
+        builder(driver)
+        state = capture(driver)
+        save(state, path + '.tmp')
+        os.replace(path + '.tmp', path)
+    finally:
+        os.remove(path + '.lock')
+    return state
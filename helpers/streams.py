@@ -0,0 +1,49 @@
+def stream_sum(values, convert=int):
+    """
+    Sums a stream of values without materializing it.
+
+    Args:
+        values (iterable): The values, e.g. the text of harvested items.
+        convert (callable): Converts every value to a number before it is added.
+
+    Returns:
+        int or float: The sum of the converted values.
+    """
+    total = 0
+    for value in values:
+        total += convert(value)
+    return total
+
+
+def stream_count(values, predicate=None):
+    """
+    Counts the values of a stream without materializing it.
+
+    Args:
+        values (iterable): The values to count.
+        predicate (callable, optional): Counts only the values for which it returns a truthy value.
+
+    Returns:
+        int: The number of counted values.
+    """
+    count = 0
+    for value in values:
+        if predicate is None or predicate(value):
+            count += 1
+    return count
+
+
+def stream_filter(values, predicate):
+    """
+    Lazily yields the values of a stream for which the predicate returns a truthy value.
+
+    Args:
+        values (iterable): The values to filter.
+        predicate (callable): Decides whether a value is kept.
+
+    Yields:
+        The kept values, in stream order.
+    """
+    for value in values:
+        if predicate(value):
+            yield value
@@ -0,0 +1,190 @@
+import time
+
+from selenium.common import TimeoutException, WebDriverException
+
+from .cookies import supports_cdp
+from .devtools import ANY_SESSION, DevToolsConnection, devtools_url
+
+# The ready state, title and URL of a document are read together, so the title belongs to the loaded document.
+WINDOW_STATE = {'expression': '({readyState: document.readyState, title: document.title, url: location.href})',
+                'returnByValue': True}
+
+
+def is_loaded(window):
+    """
+    Checks whether a window has finished loading a document.
+
+    Args:
+        window (dict): The state of the window with the 'readyState' and 'url' of its document.
+
+    Returns:
+        bool: True if the window shows a completely loaded document other than the initial blank page.
+    """
+    return window.get('readyState') == 'complete' and window['url'] != 'about:blank'
+
+
+def read_window(devtools, target_id):
+    """
+    Reads the ready state, title and URL of the document of a target in a single evaluation.
+
+    The first read attaches to the target and enables its page events, so a later `Page.loadEventFired` tells
+    when the document has to be read again.
+
+    Args:
+        devtools (DevToolsConnection): The connection to the browser.
+        target_id (str): The id of the target.
+
+    Returns:
+        dict: The 'targetId', 'readyState', 'title' and 'url' of the window, or None if the target cannot be
+              evaluated, e.g. because it was closed or is navigating.
+    """
+    try:
+        if target_id not in devtools.sessions:
+            devtools.send('Page.enable', session_id=devtools.attach(target_id))
+        state = devtools.send('Runtime.evaluate', WINDOW_STATE, devtools.sessions[target_id])['result']
+    except WebDriverException:
+        devtools.sessions.pop(target_id, None)
+        return None
+    return dict(state['value'], targetId=target_id) if 'value' in state else None
+
+
+class WindowTracker:
+    """
+    Tracks the windows and tabs opened by a page and reads their titles without switching to them.
+
+    Chromium based browsers are observed through a `DevToolsConnection` of the tracker instead of polling: target
+    discovery reports the new windows, which are read again whenever their target info changes or their document
+    fires its load event, and windows are closed with `Target.closeTarget`.
+    Other browsers, and Chromium based browsers without a reachable debugger address, fall back to window handles
+    and switch to the new windows.
+    The windows known when the tracker is created are never reported or closed.
+    """
+
+    def __init__(self, driver, wait_policy):
+        """
+        Initializes the tracker with the windows that are open now.
+
+        Args:
+            driver (WebDriver): The WebDriver instance.
+            wait_policy (WaitPolicy): The policy of the 'windows' wait.
+        """
+        self.driver = driver
+        self.wait_policy = wait_policy
+        self.cdp = supports_cdp(driver)
+        if self.cdp:
+            self.driver.execute_cdp_cmd('Performance.enable', {})
+        self.known = set(self.windows())
+
+    def windows(self):
+        """
+        Lists the open windows.
+
+        Returns:
+            dict: The target info of every open window by its id, which is also its window handle. Without
+                  DevTools the values are None.
+        """
+        if self.cdp:
+            targets = self.driver.execute_cdp_cmd('Target.getTargets', {})['targetInfos']
+            return {target['targetId']: target for target in targets if target['type'] == 'page'}
+        return {handle: None for handle in self.driver.window_handles}
+
+    def _read(self, handle):
+        """Reads the title of a window by switching to it, for browsers without DevTools."""
+        current = self.driver.current_window_handle
+        self.driver.switch_to.window(handle)
+        window = {'targetId': handle, 'title': self.driver.title, 'url': self.driver.current_url,
+                  'readyState': self.driver.execute_script('return document.readyState;')}
+        self.driver.switch_to.window(current)
+        return window
+
+    def _watch(self, devtools, count, timeout):
+        """Waits for the windows with the target events of a DevTools connection, see `wait_for_windows`."""
+        deadline = time.monotonic() + timeout
+        windows = {}
+        devtools.send('Target.setDiscoverTargets', {'discover': True})
+        while True:
+            targets = {session: target_id for target_id, session in devtools.sessions.items()}
+            stale = set()
+            for event in devtools.take_events(ANY_SESSION):
+                params = event.get('params', {})
+                if event['method'] in ('Target.targetCreated', 'Target.targetInfoChanged'):
+                    info = params['targetInfo']
+                    if info['type'] == 'page' and info['targetId'] not in self.known:
+                        stale.add(info['targetId'])
+                elif event['method'] == 'Target.targetDestroyed':
+                    windows.pop(params['targetId'], None)
+                    stale.discard(params['targetId'])
+                elif event['method'] == 'Page.loadEventFired' and event.get('sessionId') in targets:
+                    stale.add(targets[event['sessionId']])
+            for target_id in stale:
+                windows[target_id] = read_window(devtools, target_id)
+            ready = [window for window in windows.values() if window and is_loaded(window)]
+            if len(ready) >= count:
+                return ready
+            if devtools.closed:
+                raise WebDriverException('The DevTools connection closed while waiting for windows')
+            if not devtools.wait_for_event(ANY_SESSION, deadline - time.monotonic()) and not devtools.closed:
+                raise TimeoutException(f'{len(ready)} of {count} windows loaded within {timeout}s')
+
+    def wait_for_windows(self, count, timeout=None):
+        """
+        Waits until a number of windows opened since the last call have finished loading a document.
+
+        Args:
+            count (int): The number of new windows to wait for.
+            timeout (float, optional): time to wait. Defaults to the wait policy.
+
+        Returns:
+            list: The new windows, dicts with 'targetId', 'title', 'url' and 'readyState' keys.
+
+        Raises:
+            TimeoutException: If the windows do not open or load within the timeout.
+        """
+        url = devtools_url(self.driver) if self.cdp else None
+        if url:
+            devtools = DevToolsConnection(url)
+            try:
+                with self.wait_policy.measure('windows', f'{count} windows'):
+                    windows = self._watch(devtools, count, self.wait_policy.timeout('windows', timeout))
+            finally:
+                devtools.close()
+        else:
+            def loaded(driver):
+                new = [self._read(handle) for handle in driver.window_handles if handle not in self.known]
+                ready = [window for window in new if is_loaded(window)]
+                return ready if len(ready) >= count else False
+
+            windows = self.wait_policy.wait(self.driver, loaded, 'windows', timeout, label=f'{count} windows')
+        self.known.update(window['targetId'] for window in windows)
+        return windows
+
+    def close(self, windows):
+        """
+        Closes windows, with DevTools without switching to them.
+
+        Args:
+            windows (list): The windows returned by `wait_for_windows`.
+        """
+        if not self.cdp:
+            current = self.driver.current_window_handle
+            for window in windows:
+                self.driver.switch_to.window(window['targetId'])
+                self.driver.close()
+            self.driver.switch_to.window(current)
+            return
+        for window in windows:
+            self.driver.execute_cdp_cmd('Target.closeTarget', {'targetId': window['targetId']})
+
+    def memory(self):
+        """
+        Reads how many windows are open and how much memory the page of the current window uses.
+
+        Returns:
+            dict: The number of open 'windows' and, with DevTools, the 'js_heap' and DOM 'nodes' of the page.
+        """
+        report = {'windows': len(self.windows())}
+        if self.cdp:
+            values = {metric['name']: metric['value']
+                      for metric in self.driver.execute_cdp_cmd('Performance.getMetrics', {})['metrics']}
+            report.update(js_heap=values.get('JSHeapUsedSize'), nodes=values.get('Nodes'))
+        return report
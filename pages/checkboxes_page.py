@@ -1,4 +1,5 @@
 from ..common.base_methods import BasePage
+from ..common.conditions import present
 from ..helpers.allure_helper import step
 from selenium.webdriver.common.by import By
 
@@ -57,7 +58,7 @@ class Checkboxes(BasePage):
         Args:
             url (str): The URL to open.
         """
-        self.driver.get(url)
+        super().open_url(url)
 
     @step
     def find_containers(self):
@@ -100,7 +101,7 @@ class Checkboxes(BasePage):
         Returns:
             str: The text of the result element.
         """
-        return self.find_element(CheckboxesLocators.RESULT).text
+        return self.wait_for(present(CheckboxesLocators.RESULT), text=True)['text']
 
     @step
     def wait_for_checkbox_selection(self):
@@ -145,10 +146,7 @@ class Checkboxes(BasePage):
         Returns:
             str: The text associated with the checkbox.
         """
-        text = ''
-        while text == '':
-            text = self.find_element(CheckboxesLocators.DYNAMIC_CHECKBOX(position)).text
-        return text
+        return self.observe_text(CheckboxesLocators.DYNAMIC_CHECKBOX(position))
 
     @step
     def click_dynamic_checkbox(self, position):
@@ -168,15 +166,18 @@ class Checkboxes(BasePage):
         self.click(CheckboxesLocators.CLOSE_ADD_BTN)
 
     @step
-    def wait_for_page_title(self, partial_title, poll_frequency=0.05):
+    def wait_for_page_title(self, partial_title, timeout=60):
         """
-        Waits until the page title contains the specified partial text.
+        Waits until the page title contains the specified partial text, resolving as soon as the title changes.
 
         Args:
             partial_title (str): The partial title text to wait for.
-            poll_frequency (float): The frequency in seconds to poll for the title. Default is 0.05 seconds.
+            timeout (float): time to wait for the title. Default is 60 seconds.
+
+        Returns:
+            str: The title of the page.
         """
-        return self.wait_title_contain_text(partial_title, timeout=60, poll_frequency=poll_frequency)
+        return self.observe_title(partial_title, timeout)
 
     @step
     def click_click_button(self):
@@ -210,11 +211,14 @@ class Checkboxes(BasePage):
         self.click(CheckboxesLocators.CHECK_ALL_ELS_BTN)
 
     @step
-    def get_alert_text(self):
+    def get_alert_text(self, timeout=None):
         """
-        Retrieves the text from an alert popup.
+        Retrieves the text from an alert popup, waiting for it to open.
+
+        Args:
+            timeout (float, optional): time to wait for the alert. Defaults to the wait policy.
 
         Returns:
             str: The text of the alert popup.
         """
-        return self.driver.switch_to.alert.text
+        return self.wait_for_alert(timeout).text
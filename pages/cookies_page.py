@@ -1,7 +1,11 @@
+from selenium.common import WebDriverException
 from selenium.webdriver.common.by import By
 
 from ..common.base_methods import BasePage
 from ..helpers.allure_helper import step
+from ..helpers.cookies import from_cdp_cookie, parse_set_cookie, same_origin, supports_cdp, to_cdp_cookie
+from ..helpers.devtools import DevToolsConnection, devtools_url
+from ..helpers.metrics import metrics
 
 
 class CookiesLocators:
@@ -55,6 +59,49 @@ class CookiesPage(BasePage):
         for cookie in cookies:
             self.driver.add_cookie(cookie)
 
+    @step
+    def set_cookies(self, cookies, use_cdp=True):
+        """
+        Adds many cookies to the browser session for the current page with a single command.
+
+        Chromium based browsers receive all cookies through DevTools `Network.setCookies`, other browsers
+        fall back to one WebDriver command per cookie.
+
+        Args:
+            cookies (list): A list of dictionaries, where each dictionary represents a cookie with
+                            'name' and 'value' keys and the optional keys accepted by WebDriver.add_cookie.
+            use_cdp (bool): Whether DevTools may be used.
+        """
+        if not (use_cdp and supports_cdp(self.driver)):
+            self.add_cookies(cookies)
+            return
+        url = self.driver.current_url
+        self.driver.execute_cdp_cmd(
+            'Network.setCookies', {'cookies': [to_cdp_cookie(cookie, url) for cookie in cookies]})
+
+    @step
+    def get_all_cookies(self, use_cdp=True, url=None):
+        """
+        Retrieves all cookies visible to the current page with a single command.
+
+        Chromium based browsers read the cookies through DevTools `Network.getCookies`, other browsers
+        fall back to WebDriver.
+
+        Args:
+            use_cdp (bool): Whether DevTools may be used.
+            url (str, optional): Reads the cookies visible to this URL instead. DevTools reads them without
+                                 loading it, WebDriver loads the URL first.
+
+        Returns:
+            A list of dictionaries in the format of WebDriver.get_cookies, each representing a cookie.
+        """
+        if not (use_cdp and supports_cdp(self.driver)):
+            if url is not None:
+                self.open_url(url)
+            return self.get_cookies()
+        cookies = self.driver.execute_cdp_cmd('Network.getCookies', {'urls': [url or self.driver.current_url]})
+        return [from_cdp_cookie(cookie) for cookie in cookies['cookies']]
+
     @step
     def delete_all_cookies(self):
         """Deletes all cookies from the current browser session."""
@@ -79,30 +126,38 @@ class CookiesPage(BasePage):
             The total sum of cookie values that meet the criteria.
         """
         total = 0
-        cookies = self.get_cookies()
+        cookies = self.get_all_cookies()
         for cookie in cookies:
             if int(cookie['name'].split("_")[-1]) % 2 == 0:
                 total += int(cookie['value'])
         return total
 
     @step
-    def find_max_expiry_cookie_url(self, urls):
+    def find_max_expiry_cookie_url(self, urls, concurrency=1):
         """
         Finds the URL with the cookie that has the maximum expiry value.
 
         Args:
             urls: A list of URLs to visit.
+            concurrency (int): The number of tabs loading URLs at the same time, see `sweep_cookies`. With 1, or
+                               without DevTools, the URLs are visited one after another in the current tab.
 
         Returns:
             The URL corresponding to the cookie with the maximum expiry value.
         """
+        if concurrency > 1 and supports_cdp(self.driver):
+            cookies_by_url = self.sweep_cookies(urls, concurrency)
+        else:
+            cookies_by_url = {}
+            for link in urls:
+                self.open_url(link)
+                cookies_by_url[link] = self.get_all_cookies()
+
         max_expiry_value = 0
         max_expiry_link = None
 
         for link in urls:
-            self.open_url(link)
-            cookies = self.get_cookies()
-            for cookie in cookies:
+            for cookie in cookies_by_url[link]:
                 if 'expiry' in cookie:
                     expiry_value = cookie['expiry']
                     if expiry_value > max_expiry_value:
@@ -112,15 +167,74 @@ class CookiesPage(BasePage):
         return max_expiry_link
 
     @step
-    def sum_secret_cookies(self):
+    def sweep_cookies(self, urls, concurrency=4):
+        """
+        Loads URLs in several tabs at the same time and collects the cookies every page set.
+
+        The tabs share one cookie jar, so the cookies of a page are not read from the jar but from the
+        `Set-Cookie` headers of the responses its own tab received. A DevTools connection of its own attaches to
+        every tab and records the network events of the tab by its session; cookies the browser blocked are
+        left out.
+
+        Args:
+            urls (list): The URLs to visit.
+            concurrency (int): The number of tabs loading at the same time.
+
+        Returns:
+            dict: The list of cookies, in the format of WebDriver.get_cookies, set by every URL.
+
+        Raises:
+            WebDriverException: If the browser does not report a DevTools debugger address.
+        """
+        endpoint = devtools_url(self.driver)
+        if endpoint is None:
+            raise WebDriverException('Sweeping cookies in tabs needs a local Chromium based browser')
+        devtools = DevToolsConnection(endpoint)
+        enabled = set()
+
+        def prepare(url):
+            session = devtools.attach(self.driver.current_window_handle)
+            if session not in enabled:
+                devtools.send('Network.enable', {}, session)
+                enabled.add(session)
+            devtools.take_events(session)
+            return session
+
+        def collect(url, session):
+            events = devtools.take_events(session)
+            sources = {event['params']['requestId']: event['params']['response']['url']
+                       for event in events if event['method'] == 'Network.responseReceived'}
+            cookies = []
+            for event in events:
+                if event['method'] != 'Network.responseReceivedExtraInfo':
+                    continue
+                params = event['params']
+                blocked = {cookie['cookieLine'] for cookie in params.get('blockedCookies', [])}
+                source = sources.get(params['requestId'], url)
+                cookies.extend(parse_set_cookie(line, source)
+                               for name, value in params['headers'].items() if name.lower() == 'set-cookie'
+                               for line in value.split('\n') if line.strip() and line not in blocked)
+            return cookies
+
+        try:
+            return self.sweep_tabs(urls, collect, concurrency, prepare=prepare)
+        finally:
+            devtools.close()
+
+    @step
+    def sum_secret_cookies(self, url=None):
         """
         Sums the values of cookies that contain 'secret_cookie_' in their names.
 
+        Args:
+            url (str, optional): Sums the cookies visible to this URL instead of the current page, see
+                                 `get_all_cookies`.
+
         Returns:
             The total sum of the values of these cookies.
         """
         total = 0
-        cookies = self.get_cookies()
+        cookies = self.get_all_cookies(url=url)
         for cookie in cookies:
             if 'secret_cookie_' in cookie['name']:
                 total += int(cookie['value'])
@@ -144,6 +258,37 @@ class CookiesPage(BasePage):
         self.add_cookie(cookie)
         self.refresh_page()
 
+    @step
+    def open_with_cookies(self, url, cookies):
+        """
+        Opens a page with exactly the given cookies already set for it.
+
+        Chromium based browsers seed the cookies through DevTools before the navigation, so the page is loaded
+        once. Other browsers can only add cookies for the current page: they first load the page if it is not on
+        the same origin yet, then replace the cookies and load it again.
+
+        Args:
+            url (str): The URL to be opened.
+            cookies (list): A list of dictionaries, each representing a cookie to be set for the URL.
+
+        Returns:
+            int: The number of page loads it took.
+        """
+        if supports_cdp(self.driver):
+            self.driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            self.driver.execute_cdp_cmd(
+                'Network.setCookies', {'cookies': [to_cdp_cookie(cookie, url) for cookie in cookies]})
+            self.open_url(url)
+            return 1
+        loads = 0
+        if not same_origin(self.driver.current_url, url):
+            self.open_url(url)
+            loads += 1
+        self.delete_all_cookies()
+        self.add_cookies(cookies)
+        self.open_url(url)
+        return loads + 1
+
     @step
     def get_hacker_info(self):
         """
@@ -161,7 +306,7 @@ class CookiesPage(BasePage):
         return age, languages_count
 
     @step
-    def find_youngest_hacker(self, cookies):
+    def find_youngest_hacker(self, cookies, url=None):
         """
         Identifies the cookie value of the youngest hacker with the most programming languages.
 
@@ -169,18 +314,29 @@ class CookiesPage(BasePage):
         It collects information on the hacker's age and the number of programming languages.
         Finally, it determines the youngest hacker and, among them, the one with the most languages.
 
+        When the URL is given, the page does not need to be open: every cookie is seeded before the page is
+        loaded with it, and the page loads saved compared to opening the page and refreshing it per cookie are
+        recorded in `metrics` under 'cookies.page_loads_saved'.
+
         Args:
             cookies (list): A list of dictionaries, each representing a cookie to be added.
+            url (str, optional): The URL of the hacker page.
 
         Returns:
             str: The value of the cookie corresponding to the youngest hacker with the most programming languages.
         """
         hackers = []
+        loads = 0
 
         for cookie in cookies:
-            self.set_and_refresh(cookie)
+            if url is None:
+                self.set_and_refresh(cookie)
+            else:
+                loads += self.open_with_cookies(url, [cookie])
             age, languages = self.get_hacker_info()
             hackers.append({'age': age, 'languages': languages, 'value': cookie['value']})
+        if url is not None:
+            metrics.increment('cookies.page_loads_saved', len(cookies) + 1 - loads)
 
         # Sort hackers by age
         sorted_hackers = sorted(hackers, key=lambda x: x['age'])
@@ -202,11 +358,12 @@ class CookiesPage(BasePage):
         Returns:
             list: A list of URLs found on the page.
         """
-        hrefs = self.find_elements(CookiesLocators.A_TAG)
-        return [item.get_attribute('href') for item in hrefs]
+        self.wait_for_element_to_be_present(CookiesLocators.A_TAG)
+        anchors = self.snapshot(CookiesLocators.A_TAG, text=False, attrs=['href'])
+        return [anchor['attrs']['href'] for anchor in anchors]
 
     @step
-    def find_max_expiry_url(self, urls):
+    def find_max_expiry_url(self, urls, concurrency=1):
         """
         Finds the URL with the cookie that has the maximum expiry value.
 
@@ -215,11 +372,12 @@ class CookiesPage(BasePage):
 
         Args:
             urls (list): A list of URLs to be checked for cookies.
+            concurrency (int): The number of tabs loading URLs at the same time.
 
         Returns:
             str: The URL that corresponds to the cookie with the maximum expiry value.
         """
-        return self.find_max_expiry_cookie_url(urls)
+        return self.find_max_expiry_cookie_url(urls, concurrency)
 
     @step
     def retrieve_result_text(self):
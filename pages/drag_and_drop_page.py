@@ -1,9 +1,18 @@
-from selenium.webdriver.common.action_chains import ActionChains
+import time
+import warnings
+
+import numpy as np
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.color import Color
+from selenium.webdriver.remote.webelement import WebElement
 
 from ..helpers.allure_helper import step
+from ..common.action_sequence import ActionSequence
 from ..common.base_methods import BasePage
+from ..common.conditions import present
+from ..common.scripts import HTML5_DRAG_AND_DROP, HTML5_DRAG_LISTENERS, HTML5_DRAG_SUPPORT, STASH_DRAG_PAIRS
+from ..helpers.color_matching import match_colors
+from ..helpers.cookies import supports_cdp
+from ..helpers.metrics import metrics
 
 
 class DragAndDropLocators:
@@ -61,18 +70,137 @@ class DragAndDropPage(BasePage):
             driver (WebDriver): The Selenium WebDriver instance used to interact with the browser.
         """
         super().__init__(driver)
-        self.action = ActionChains(driver)
+
+    def actions(self, move_duration=250):
+        """
+        Starts a new pointer action sequence that is dispatched with a single command.
+
+        Args:
+            move_duration (int): The default duration of a pointer move in milliseconds.
+
+        Returns:
+            ActionSequence: An empty sequence.
+        """
+        return ActionSequence(self.driver, move_duration)
 
     @step
-    def drag_and_drop(self, source, target):
+    def drag_and_drop(self, source, target, duration=None, strategy='auto'):
         """
         Drags a source element and drops it onto a target element.
 
         Args:
-            source (WebElement): The element to be dragged.
-            target (WebElement): The element where the source should be dropped.
+            source (WebElement or tuple): The element to be dragged, or its (x, y) viewport coordinates.
+            target (WebElement or tuple): The element where the source should be dropped, or its coordinates.
+            duration (int, optional): The duration of the pointer move in milliseconds.
+            strategy (str): 'auto', 'html5' or 'pointer', see `drag_batch`.
+
+        Returns:
+            dict: The 'strategy' used for the drag, the 'seconds' it took and the 'reason' the HTML5 fast path
+                  was not taken, if any.
+        """
+        return self.drag_batch([(source, target)], duration, label='drag_and_drop', strategy=strategy)[0]
+
+    @step
+    def drag_batch(self, drags, duration=None, label='drag_batch', strategy='auto'):
         """
-        self.action.drag_and_drop(source, target).perform()
+        Performs a batch of independent drags in the given order with as few commands as possible.
+
+        Drags between elements that use native HTML5 drag and drop are dispatched as synthetic dragstart,
+        dragenter, dragover, drop and dragend events sharing one DataTransfer, the other drags, e.g. those of
+        pages that handle mouse events, are performed with pointer actions. Consecutive drags of the same
+        strategy are sent together, one script call or one W3C Actions command per run.
+
+        Support is detected before anything is performed and without dispatching events, from the draggable
+        attribute or a dragstart handler of the source and a dragover or drop handler on the target, its
+        ancestors or the window. Chromium based browsers see handlers added with addEventListener through the
+        DevTools `getEventListeners`, other browsers only handler properties, so there with 'auto' targets with
+        listeners only get pointer drags; 'html5' requires only a draggable source. An HTML5 drag the target
+        does not accept is continued as a pointer drag with 'auto'.
+
+        Args:
+            drags (iterable): (source, target) pairs of WebElements or (x, y) viewport coordinates.
+            duration (int, optional): The duration of every pointer move in milliseconds.
+            label (str): What the batch does, used to list the slowest drags.
+            strategy (str): 'auto' to detect the strategy per drag, 'html5' to require the HTML5 fast path
+                            or 'pointer' to always use pointer actions.
+
+        Returns:
+            list: Per drag, a dict with the 'strategy' used, the 'seconds' it took and the 'reason' the HTML5
+                  fast path was not taken, if any.
+
+        Raises:
+            ValueError: If the strategy is unknown, or 'html5' is required and a drag does not support it. An
+                        unsupported drag is reported before any drag is performed, a target that does not
+                        accept the drop when it happens.
+        """
+        if strategy not in ('auto', 'html5', 'pointer'):
+            raise ValueError(f'Unknown drag strategy "{strategy}"')
+        drags = list(drags)
+        results = [self._plan_drag(drag, support, strategy, i)
+                   for i, (drag, support) in enumerate(zip(drags, self._html5_support(drags, strategy)))]
+
+        i = 0
+        while i < len(drags):
+            kind = results[i]['strategy']
+            end = i
+            while end < len(drags) and results[end]['strategy'] == kind:
+                end += 1
+            if kind == 'html5':
+                outcomes = self.driver.execute_script(HTML5_DRAG_AND_DROP, [list(drag) for drag in drags[i:end]])
+                for outcome in outcomes:
+                    if not outcome['dropped']:
+                        if strategy == 'html5':
+                            raise ValueError(f"HTML5 drop was not accepted by drag {i}: {outcome['reason']}")
+                        results[i].update(strategy='pointer', reason=outcome['reason'])
+                        break
+                    results[i]['seconds'] = outcome['seconds']
+                    i += 1
+                continue
+            sequence = self.actions()
+            for drag in drags[i:end]:
+                sequence.drag(*drag, duration=duration)
+            start = time.perf_counter()
+            sequence.perform(label)
+            seconds = (time.perf_counter() - start) / (end - i)
+            for result in results[i:end]:
+                result['seconds'] = seconds
+            i = end
+
+        for result in results:
+            metrics.record(f"drag.{result['strategy']}", result['seconds'], label)
+        return results
+
+    def _html5_support(self, drags, strategy):
+        """Reads the HTML5 drag support of every drag between elements, without dispatching events."""
+        if strategy == 'pointer':
+            return [None] * len(drags)
+        candidates = [i for i, (source, target) in enumerate(drags)
+                      if isinstance(source, WebElement) and isinstance(target, WebElement)]
+        if not candidates:
+            return [{'source': 'coordinates given', 'target': None} for _ in drags]
+        pairs = [list(drags[i]) for i in candidates]
+        support = None
+        if supports_cdp(self.driver):
+            self.driver.execute_script(STASH_DRAG_PAIRS, pairs)
+            support = self.driver.execute_cdp_cmd(
+                'Runtime.evaluate', {'expression': HTML5_DRAG_LISTENERS, 'includeCommandLineAPI': True,
+                                     'returnByValue': True})['result'].get('value')
+        if support is None:
+            support = self.driver.execute_script(HTML5_DRAG_SUPPORT, pairs)
+        found = dict(zip(candidates, support))
+        return [found.get(i, {'source': 'coordinates given', 'target': None}) for i in range(len(drags))]
+
+    @staticmethod
+    def _plan_drag(drag, support, strategy, index):
+        """Chooses the strategy of a drag from its HTML5 support, see `drag_batch`."""
+        if support is None:
+            return {'strategy': 'pointer', 'seconds': None, 'reason': 'pointer strategy requested'}
+        reason = support['source'] if strategy == 'html5' else support['source'] or support['target']
+        if reason is None:
+            return {'strategy': 'html5', 'seconds': None, 'reason': None}
+        if strategy == 'html5':
+            raise ValueError(f"HTML5 drag and drop is not supported by drag {index}: {reason}")
+        return {'strategy': 'pointer', 'seconds': None, 'reason': reason}
 
     @step
     def click_and_drag_by_offset(self, element, x_offset, y_offset=0):
@@ -84,59 +212,106 @@ class DragAndDropPage(BasePage):
             x_offset (int): The horizontal offset by which to move the element.
             y_offset (int, optional): The vertical offset by which to move the element. Defaults to 0.
         """
-        self.action.click_and_hold(element).move_by_offset(x_offset, y_offset).release().perform()
+        self.actions().drag_by(element, x_offset, y_offset).perform('click_and_drag_by_offset')
 
     @step
     def move_sliders_to_position(self, sliders, cur_pos_elem, new_positions):
         """
         Moves sliders to their target positions.
 
+        All sliders are set in a single script execution.
+
         Args:
-            sliders (list): List of WebElements representing sliders.
+            sliders (list or tuple): List of WebElements representing sliders, or a locator for them.
             cur_pos_elem (tuple): Locator for the current position input element of each slider.
             new_positions (tuple): Locator for the element displaying the target position for each slider.
+
+        Returns:
+            list[dict]: A before/after report per slider, see `BasePage.set_control_values`.
+
+        Raises:
+            ValueError: If a slider does not hold its target position afterwards.
+        """
+        reports = self.set_control_values(sliders, cur_pos_elem, new_positions)
+        failed = [report for report in reports if not report['ok']]
+        if failed:
+            raise ValueError(f"{len(failed)} of {len(reports)} sliders were not moved: {failed}")
+        return reports
+
+    @staticmethod
+    def match_by_color(sources, targets, source_property, target_property, tolerance=None, space='rgb',
+                       strict=False, unique=False):
         """
-        for slider in sliders:
-            cur_pos_element = slider.find_element(*cur_pos_elem)
-            new_pos = slider.find_element(*new_positions).text
+        Pairs every source record with the target record of the nearest color.
+
+        When several targets are equally near, the last one is taken. With `unique` every target takes a single
+        source, sources that end up on the same target are reported with a warning, or raise with `strict`.
+
+        Args:
+            sources (list): Snapshot records of the elements to match, read with the source CSS property.
+            targets (list): Snapshot records of the elements to match against, read with the target CSS property.
+            source_property (str): The CSS color property of the sources.
+            target_property (str): The CSS color property of the targets.
+            tolerance (float, optional): The largest color distance of a match, see `match_colors`.
+            space (str): 'rgb' or the perceptual 'lab' color space.
+            strict (bool): Whether more than one target within the tolerance of a source color, or with `unique`
+                           more than one source matching the same target, is an error.
+            unique (bool): Whether every target is meant for a single source.
+
+        Returns:
+            list: The matching target record of every source record.
 
-            self.execute_script(
-                "arguments[0].setAttribute('value', arguments[1]);", cur_pos_element, new_pos)
-            self.execute_script(
-                "arguments[0].dispatchEvent(new Event('input', {bubbles: true}));", cur_pos_element)
-            self.execute_script(
-                "arguments[0].dispatchEvent(new Event('change', {bubbles: true}));", cur_pos_element)
+        Raises:
+            ValueError: If no target color is within the tolerance of a source color, or with `strict` more
+                        than one is or, with `unique`, sources share a target.
+        """
+        source_colors = [source['css'][source_property] for source in sources]
+        match = match_colors(source_colors, [target['css'][target_property] for target in targets], tolerance, space)
+        for i in np.flatnonzero(~match.matched | (match.ambiguous & strict)):
+            problem = 'No matching droppable' if not match.matched[i] else 'More than one matching droppable'
+            raise ValueError(f"{problem} found for color: {source_colors[i]}")
+        shared = np.flatnonzero(match.duplicates) if unique else []
+        if len(shared):
+            message = (f"{len(shared)} colors share a matching droppable: "
+                       f"{', '.join(f'{source_colors[i]} -> droppable {match.indices[i]}' for i in shared)}")
+            if strict:
+                raise ValueError(message)
+            warnings.warn(message, stacklevel=2)
+        return [targets[i] for i in match.indices]
 
     @step
-    def drag_and_drop_with_color_matching(self, draggables, droppables, color_property='background-color'):
+    def drag_and_drop_with_color_matching(self, draggables, droppables, color_property='background-color',
+                                          tolerance=None, space='rgb', strict=False):
         """
         Performs drag-and-drop actions by matching draggable elements with droppable targets based on a color property.
 
+        Colors match within a tolerance, so anti-aliased colors and rgba/hex variants of the same color pair up.
+
         Args:
             draggables (list): List of draggable WebElements.
             droppables (list): List of droppable WebElements.
             color_property (str, optional): The CSS property used for color comparison (e.g., 'border-color').
                                             Defaults to 'background-color'.
+            tolerance (float, optional): The largest color distance of a match, see `match_colors`.
+            space (str): 'rgb' or the perceptual 'lab' color space.
+            strict (bool): Whether ambiguous matches are an error, see `match_by_color`. Several draggables may
+                           share a droppable.
 
         Raises:
-            ValueError: If no matching droppable is found for a given draggable element's color.
+            ValueError: If no matching droppable is found for a given draggable element's color, or with `strict`
+                        a match is ambiguous.
         """
-        droppables_map = {
-            Color.from_string(drop.value_of_css_property(color_property)): drop
-            for drop in droppables
-        }
-
-        for draggable in draggables:
-            draggable_color = Color.from_string(draggable.value_of_css_property('background-color'))
-            matching_droppable = droppables_map.get(draggable_color)
-
-            if matching_droppable:
-                self.drag_and_drop(draggable, matching_droppable)
-            else:
-                raise ValueError(f"No matching droppable found for color: {draggable_color}")
+        draggables = self.snapshot(draggables, text=False, css=['background-color'])
+        droppables = self.snapshot(droppables, text=False, css=[color_property])
+        matches = self.match_by_color(draggables, droppables, 'background-color', color_property, tolerance, space,
+                                      strict)
+        self.drag_batch([(draggable['element'], droppable['element'])
+                         for draggable, droppable in zip(draggables, matches)],
+                        label='drag_and_drop_with_color_matching')
 
     @step
-    def drag_pieces_to_ranges(self, pieces, ranges, p_tag, color_property='background-color'):
+    def drag_pieces_to_ranges(self, pieces, ranges, p_tag, color_property='background-color', tolerance=None,
+                              space='rgb', strict=False):
         """
         Drags pieces to their corresponding ranges based on matching colors and verifies the result.
 
@@ -147,16 +322,25 @@ class DragAndDropPage(BasePage):
                        (e.g., the `<p>` tag element showing the offset).
             color_property (str, optional): The CSS property used for color comparison (e.g., 'border-color').
                                             Defaults to 'background-color'.
+            tolerance (float, optional): The largest color distance of a match, see `match_colors`.
+            space (str): 'rgb' or the perceptual 'lab' color space.
+            strict (bool): Whether ambiguous or shared matches are an error, see `match_by_color`. Every range
+                           takes one piece, pieces sharing a range are reported with a warning otherwise.
+
+        Raises:
+            ValueError: If no matching range is found for a given piece's color, or with `strict` a match is
+                        ambiguous or shared.
         """
-        range_map = {
-            Color.from_string(rng.value_of_css_property(color_property)): rng
-            for rng in ranges
-        }
+        ranges = self.snapshot(ranges, text=False, css=[color_property], child_text=p_tag)
+        pieces = self.snapshot(pieces, text=False, css=[color_property])
+        matches = self.match_by_color(pieces, ranges, color_property, color_property, tolerance, space, strict,
+                                      unique=True)
 
-        for piece in pieces:
-            color = Color.from_string(piece.value_of_css_property(color_property))
-            offset = range_map[color].find_element(*p_tag).text.split(': ')[1].replace("px", "")
-            self.click_and_drag_by_offset(piece, int(offset))
+        sequence = self.actions()
+        for piece, rng in zip(pieces, matches):
+            offset = rng['child_text'].split(': ')[1].replace("px", "")
+            sequence.drag_by(piece['element'], int(offset))
+        sequence.perform('drag_pieces_to_ranges')
 
     @step
     def locate_pieces_and_ranges(self):
@@ -227,25 +411,28 @@ class DragAndDropPage(BasePage):
 
         Args:
             sliders (list): List of slider elements.
+
+        Returns:
+            list[dict]: A before/after report per slider.
+
+        Raises:
+            ValueError: If a slider does not hold its target position afterwards.
         """
-        self.move_sliders_to_position(sliders,
-                                      DragAndDropLocators.CUR_POS_ELEMENT,
-                                      DragAndDropLocators.NEW_POS)
+        return self.move_sliders_to_position(sliders,
+                                             DragAndDropLocators.CUR_POS_ELEMENT,
+                                             DragAndDropLocators.NEW_POS)
 
     @step
     def get_final_message(self):
         """
         Retrieves the final message (secret code) is displayed on the page.
 
-        This method waits for the expected text to be present in the specified message element
-        and returns text
+        This method waits for the message element to be present and reads its text in the same round trip
 
         Returns:
             str: Text of found message
         """
-        self.wait_for_element_to_be_present(DragAndDropLocators.MESSAGE)
-        message = self.find_element(DragAndDropLocators.MESSAGE)
-        return message.text
+        return self.wait_for(present(DragAndDropLocators.MESSAGE), text=True)['text']
 
     @step
     def locate_balls(self):
@@ -328,14 +515,13 @@ class DragAndDropPage(BasePage):
         Drags and drops the square element through each drop zone sequentially.
 
         This method performs the drag-and-drop operation for the draggable square, moving it into
-        each drop zone in the provided list.
+        each drop zone in the provided list. All drags are dispatched with a single command.
 
         Args:
             draggable (WebElement): The draggable square element.
             drop_zones (list): A list of drop zone elements where the square will be dropped.
         """
-        for drop_zone in drop_zones:
-            self.drag_and_drop(draggable, drop_zone)
+        self.drag_batch(((draggable, drop_zone) for drop_zone in drop_zones), label='drag_square_through_zones')
 
     @step
     def locate_green_squares(self):
@@ -367,14 +553,13 @@ class DragAndDropPage(BasePage):
         Drags and drops each green square into the single drop zone.
 
         This method performs the drag-and-drop operation for each green square, moving them into
-        the specified drop zone.
+        the specified drop zone. All drags are dispatched with a single command.
 
         Args:
             green_squares (list): A list of green square elements to be dragged.
             drop_zone (WebElement): The drop zone element where the squares will be dropped.
         """
-        for square in green_squares:
-            self.drag_and_drop(square, drop_zone)
+        self.drag_batch(((square, drop_zone) for square in green_squares), label='drag_squares_to_drop_zone')
 
     @step
     def get_draggable_element(self):
@@ -407,15 +592,13 @@ class DragAndDropPage(BasePage):
 
         This method performs a click-and-hold action on the draggable element, then moves it
         through each control point sequentially and finally releases it back at the first control point.
+        The whole gesture is dispatched with a single command.
 
         Args:
             draggable (WebElement): The draggable element.
             control_points (list): A list of control point elements to move over.
         """
-        self.action.click_and_hold(draggable).perform()
-        for point in control_points:
-            self.action.move_to_element(point).perform()
-        self.action.move_to_element(control_points[0]).release().perform()
+        self.actions().drag(draggable, *control_points, control_points[0]).perform('drag_through_control_points')
 
     @step
     def get_red_block(self):
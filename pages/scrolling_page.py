@@ -1,6 +1,11 @@
+import uuid
+
+from selenium.common import TimeoutException
 from selenium.webdriver.common.by import By
 from ..helpers.allure_helper import step
 from ..common.base_methods import BasePage
+from ..common.scripts import HARVEST, to_query
+from ..helpers.streams import stream_sum
 
 
 class ScrollingLocators:
@@ -49,10 +54,10 @@ class ScrollingPage(BasePage):
             container (WebElement): The WebElement container holding the checkboxes.
             checkboxes_locator (tuple): Locator for the checkboxes within the container.
         """
-        checkboxes = container.find_elements(*checkboxes_locator)
+        checkboxes = self.snapshot(checkboxes_locator, text=False, attrs=['value'], root=container)
         for checkbox in checkboxes:
-            if int(checkbox.get_attribute('value')) % 2 == 0:
-                checkbox.click()
+            if int(checkbox['attrs']['value']) % 2 == 0:
+                checkbox['element'].click()
 
     @step
     def get_next_span(self, current_span, next_span_locator):
@@ -66,7 +71,7 @@ class ScrollingPage(BasePage):
         Returns:
             WebElement: The next sibling span element.
         """
-        return current_span.find_element(*next_span_locator)
+        return self.find_child(current_span, next_span_locator)
 
     @step
     def collect_spans(self, container_locator, span_locator, last_span_class, following_span):
@@ -84,7 +89,7 @@ class ScrollingPage(BasePage):
         """
         spans = [self.find_element(container_locator).find_element(*span_locator)]
         while True:
-            next_span = spans[-1].find_element(*following_span)
+            next_span = self.find_child(spans[-1], following_span)
             self.scroll_to_element(next_span)
             spans.append(next_span)
             if next_span.get_attribute("class") == last_span_class:
@@ -107,42 +112,134 @@ class ScrollingPage(BasePage):
         """
         spans = [self.find_element(container_locator).find_element(*span_locator)]
         while True:
-            next_span = spans[-1].find_element(*following_sibling)
+            next_span = self.find_child(spans[-1], following_sibling)
             self.scroll_into_view(next_span)
             spans.append(next_span)
             if next_span.get_attribute("class") == last_span_class:
                 break
         return spans
 
+    def _harvest_chunk(self, container_locator, item_locator, last_item_class, timeout, chunk_size, key,
+                       prune=False, keep=False):
+        """
+        Runs the in-page harvester until it collects a chunk of items, reaches the last item or times out.
+
+        Args:
+            container_locator (tuple): Locator for the container holding the items.
+            item_locator (tuple): Locator for the first item, relative to the container.
+            last_item_class (str): The class name that identifies the last item.
+            timeout (int): time to wait for new items. Defaults to the wait policy.
+            chunk_size (int): The maximum number of items to collect in this call.
+            key (str): Identifies the harvester state kept in the page between calls.
+            prune (bool): Whether to remove processed items from the page.
+            keep (bool): Whether to keep the harvester state in the page for the next chunk.
+
+        Returns:
+            dict: The collected 'values', whether the last item was 'finished' and the 'reason' the call stopped.
+
+        Raises:
+            TimeoutException: If no further items appear within the timeout.
+        """
+        with self.wait_policy.measure('harvest', label=str(container_locator)):
+            result = self.driver.execute_async_script(
+                HARVEST, to_query(container_locator), to_query(item_locator), last_item_class,
+                self.wait_policy.timeout('harvest', timeout), chunk_size, key, prune, keep)
+        if not result['finished'] and result['reason'] != 'chunk complete':
+            raise TimeoutException(
+                f"Harvest of {container_locator} stopped after {len(result['values'])} items: {result['reason']}")
+        return result
+
     @step
-    def find_all_loaded_divs(self):
+    def harvest_values(self, container_locator, item_locator, last_item_class, timeout=None, max_items=100000):
         """
-        Finds and returns all div elements loaded in the main container.
+        Collects the text of all items of an infinite-scroll container in a single async script call.
+
+        The script starts at the first item matching the item locator, walks the following siblings of the
+        same tag, scrolls the container to load more items and observes inserted nodes with a MutationObserver
+        until the item with the last item class appears.
+
+        Args:
+            container_locator (tuple): Locator for the container holding the items.
+            item_locator (tuple): Locator for the first item, relative to the container.
+            last_item_class (str): The class name that identifies the last item.
+            timeout (int): time to wait for the last item. Defaults to the wait policy.
+            max_items (int): The maximum number of items to collect.
 
         Returns:
-            list: A list of WebElement objects representing the loaded div elements.
+            list: The text of every collected item.
+
+        Raises:
+            TimeoutException: If the last item does not appear within the timeout.
+        """
+        return self._harvest_chunk(container_locator, item_locator, last_item_class, timeout, max_items,
+                                   key=uuid.uuid4().hex)['values']
+
+    def iter_values(self, container_locator, item_locator, last_item_class, chunk_size=500, timeout=None,
+                    prune=False):
+        """
+        Streams the text of the items of an infinite-scroll container in chunks while the page scrolls.
+
+        Only the current chunk is held in Python and no element references are created. The harvester keeps
+        a single cursor node in the page between chunks, with `prune` processed items are also removed from
+        the page, so memory stays flat regardless of the feed length.
+
+        Args:
+            container_locator (tuple): Locator for the container holding the items.
+            item_locator (tuple): Locator for the first item, relative to the container.
+            last_item_class (str): The class name that identifies the last item.
+            chunk_size (int): The number of items fetched per script call.
+            timeout (int): time to wait for new items of every chunk. Defaults to the wait policy.
+            prune (bool): Whether to remove processed items from the page.
+
+        Yields:
+            str: The text of every item, in page order.
+
+        Raises:
+            TimeoutException: If no further items appear within the timeout.
+        """
+        key = uuid.uuid4().hex
+        finished = False
+        try:
+            while not finished:
+                result = self._harvest_chunk(container_locator, item_locator, last_item_class, timeout, chunk_size,
+                                             key, prune=prune, keep=True)
+                finished = result['finished']
+                yield from result['values']
+        finally:
+            if not finished:
+                self.driver.execute_script("delete (window.__harvesters || {})[arguments[0]];", key)
+
+    def iter_checkbox_rows(self, first_row, max_rows):
         """
-        return [self.find_element(ScrollingLocators.MAIN_CONTAINER).find_element(*ScrollingLocators.DIV)]
+        Streams the rows of the checkbox feed, scrolling to load the next row once the current one is processed.
+
+        Only the current row is referenced, the rows are not accumulated.
+
+        Args:
+            first_row (WebElement): The first loaded row.
+            max_rows (int): The number of rows to load after the first one.
+
+        Yields:
+            WebElement: Every row, starting with the first one.
+        """
+        row = first_row
+        yield row
+        for _ in range(max_rows):
+            row = self.get_next_span(row, ScrollingLocators.NEXT_DIV)
+            yield row
+            self.scroll_into_view(row)
 
     @step
-    def scroll_and_click_even_checkboxes(self, checkbox_rows, max_rows):
+    def stream_and_click_even_checkboxes(self, max_rows):
         """
-        Scrolls through the rows and clicks checkboxes with even values.
+        Scrolls through the rows and clicks checkboxes with even values without keeping processed rows.
 
         Args:
-            checkbox_rows (list): A list of WebElement objects representing the rows of checkboxes.
-            max_rows (int): The maximum number of rows to process.
+            max_rows (int): The number of rows to process after the first one.
         """
-        counter = 0
-        self.click_even_checkboxes(checkbox_rows[0], ScrollingLocators.CHECKBOX)
-        while True:
-            next_span = self.get_next_span(checkbox_rows[-1], ScrollingLocators.NEXT_DIV)
-            self.click_even_checkboxes(next_span, ScrollingLocators.CHECKBOX)
-            self.scroll_into_view(next_span)
-            checkbox_rows.append(next_span)
-            counter += 1
-            if counter == max_rows:
-                break
+        first_row = self.find_element(ScrollingLocators.MAIN_CONTAINER).find_element(*ScrollingLocators.DIV)
+        for row in self.iter_checkbox_rows(first_row, max_rows):
+            self.click_even_checkboxes(row, ScrollingLocators.CHECKBOX)
 
     @step
     def click_alert_btn(self):
@@ -164,12 +261,9 @@ class ScrollingPage(BasePage):
         """
         total_sum = 0
         for i in range(1, 6):
-            container_locator = ScrollingLocators.SCROLL_CONTAINER(i)
-            spans = self.collect_spans(
-                container_locator, ScrollingLocators.SPAN,
-                ScrollingLocators.LAST_SPAN_CLASS, ScrollingLocators.FOLLOWING_SPAN)
-            sum_i = sum(int(span.text) for span in spans)
-            total_sum += sum_i
+            values = self.iter_values(
+                ScrollingLocators.SCROLL_CONTAINER(i), ScrollingLocators.SPAN, ScrollingLocators.LAST_SPAN_CLASS)
+            total_sum += stream_sum(values)
         return total_sum
 
     @step
@@ -188,6 +282,18 @@ class ScrollingPage(BasePage):
         )
         return spans
 
+    @step
+    def sum_all_paragraphs(self):
+        """
+        Harvests all paragraphs of the scrollable container inside the browser and sums their text values.
+
+        Returns:
+            int: The total sum of the text values in the paragraphs.
+        """
+        values = self.iter_values(
+            ScrollingLocators.SCROLL_CONTAINER_ID, ScrollingLocators.PARAGRAPH_TAG, ScrollingLocators.LAST_SPAN_CLASS)
+        return stream_sum(values)
+
     @step
     def sum_span_text_in_scrollbox(self, spans):
         """
@@ -199,4 +305,4 @@ class ScrollingPage(BasePage):
         Returns:
             int: The total sum of the text values in the spans.
         """
-        return sum(int(span.text) for span in spans)
+        return sum(int(span['text']) for span in self.snapshot(spans))
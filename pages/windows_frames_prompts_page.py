@@ -1,10 +1,13 @@
-from selenium.common import NoSuchElementException
+from selenium.common import NoAlertPresentException, NoSuchElementException, TimeoutException
 from selenium.webdriver.common.by import By
 
+from ..common.conditions import has_text
+from ..common.scripts import SETTLE_VIEWPORT, to_query
 from ..helpers.allure_helper import step
+from ..helpers.cookies import supports_cdp
+from ..helpers.metrics import metrics
+from ..helpers.window_tracker import WindowTracker
 from ..common.base_methods import BasePage
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 
 
 class WFPsPageLocators:
@@ -26,6 +29,7 @@ class WFPsPageLocators:
     WIDTH = (By.ID, 'width')
     HEIGHT = (By.ID, 'height')
     PINS = (By.XPATH, "//span[@class='pin']")
+    WRONG_PIN = 'Неверный пин-код'
 
 
 class WindowsFramesPromptsPage(BasePage):
@@ -43,22 +47,25 @@ class WindowsFramesPromptsPage(BasePage):
         super().__init__(driver)
 
     @step
-    def get_secret_from_alert(self):
+    def get_secret_from_alert(self, timeout=0):
         """
         Attempts to retrieve text from a JavaScript alert and close it.
 
-        This method switches the driver's context to a JavaScript alert,
-        captures the text displayed in the alert, and then accepts (closes) the alert.
-        If no alert is present, the method returns False.
+        This method waits for a JavaScript alert, captures the text displayed in the alert, and then accepts
+        (closes) the alert. If no alert opens within the timeout, or it is gone before it is read, the method
+        returns False.
+
+        Args:
+            timeout (float): time to wait for the alert. Defaults to 0, only an alert that is already open counts.
 
         Returns:
             str: The text from the alert if present; otherwise, False.
         """
         try:
-            prompt = self.driver.switch_to.alert
+            prompt = self.wait_for_alert(timeout)
             secret = prompt.text
             prompt.accept()
-        except:
+        except (NoAlertPresentException, TimeoutException):
             return False
         return secret
 
@@ -97,35 +104,80 @@ class WindowsFramesPromptsPage(BasePage):
         self.driver.set_window_size(width, height)
 
     @step
-    def wait_for_text_to_be_present_in_element(self, locator, text, timeout=10):
+    def sweep_viewport(self, sizes, locator=WFPsPageLocators.RESULT, timeout=None):
+        """
+        Reads the result the page shows for every inner viewport size in a list, in the current session.
+
+        Chromium based browsers emulate every size exactly through DevTools device metrics, the OS window is not
+        resized. Other browsers resize the window by the size of its frame measured once. After every change the
+        result is read as soon as the viewport has had the requested size for two animation frames.
+
+        Args:
+            sizes (iterable): The (width, height) inner viewport sizes, applied in order.
+            locator (tuple): Locator of the element whose text is the result.
+            timeout (float, optional): time to wait for the viewport to settle per size. Defaults to the wait
+                                       policy.
+
+        Returns:
+            dict: The result text per (width, height) size, None if the result element is not found.
+
+        Raises:
+            TimeoutException: If the viewport does not reach a size within the timeout.
+        """
+        cdp = supports_cdp(self.driver)
+        if not cdp:
+            inner_width, inner_height = self.get_inner_size()
+            outer_width, outer_height = self.get_outer_size()
+        query, timeout = to_query(locator), self.wait_policy.timeout('viewport', timeout)
+        results = {}
+        try:
+            for width, height in sizes:
+                if cdp:
+                    self.driver.execute_cdp_cmd('Emulation.setDeviceMetricsOverride', {
+                        'width': width, 'height': height, 'deviceScaleFactor': 0, 'mobile': False})
+                else:
+                    self.set_window_size(width + outer_width - inner_width, height + outer_height - inner_height)
+                with self.wait_policy.measure('viewport', label=f'{width}x{height}'):
+                    reply = self.driver.execute_async_script(SETTLE_VIEWPORT, width, height, query, timeout)
+                if not reply['settled']:
+                    raise TimeoutException(f"Viewport did not settle at {width}x{height} within {timeout}s, "
+                                           f"it is {reply['width']}x{reply['height']}")
+                results[(width, height)] = reply['result']
+        finally:
+            if cdp:
+                self.driver.execute_cdp_cmd('Emulation.clearDeviceMetricsOverride', {})
+        return results
+
+    @step
+    def wait_for_text_to_be_present_in_element(self, locator, text, timeout=None):
         """
         Waits for a specific text to be present in an element located by the given locator.
 
         Args:
             locator (tuple): Locator for the element.
             text (str): The text to wait for.
-            timeout (int): Maximum time to wait for the text.
+            timeout (int): Maximum time to wait for the text. Defaults to the wait policy.
 
         Returns:
             str: The text from the element if present; otherwise, an empty string.
         """
         try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.text_to_be_present_in_element(locator, text)
-            )
-            return self.driver.find_element(*locator).text
-        except:
+            return self.wait_for(has_text(locator, text), text=True, timeout=timeout)['text']
+        except TimeoutException:
             return ""
 
     @step
-    def switch_to_alert(self):
+    def switch_to_alert(self, timeout=None):
         """
-        Switches the driver's context to the currently active alert.
+        Switches the driver's context to the active alert, waiting for it to open.
+
+        Args:
+            timeout (float, optional): time to wait for the alert. Defaults to the wait policy.
 
         Returns:
             Alert: The active alert object to interact with.
         """
-        return self.driver.switch_to.alert
+        return self.wait_for_alert(timeout)
 
     @step
     def switch_to_alert_and_send_keys(self, key):
@@ -238,6 +290,23 @@ class WindowsFramesPromptsPage(BasePage):
             raise NoSuchElementException("No iframes found on the page.")
         return iframes
 
+    @step
+    def get_passwords_from_iframes(self, timeout=None):
+        """
+        Clicks the 'Press Me' button of every iframe and reads the revealed passwords without switching into the
+        same-origin iframes.
+
+        Args:
+            timeout (float, optional): time to wait for a password after the click. Defaults to the wait policy.
+
+        Returns:
+            list: The passwords of the iframes in document order, iframes without a password are left out.
+        """
+        results = self.query_frames({'password': WFPsPageLocators.IFRAME_TXT}, click=WFPsPageLocators.PRESS_ME_BTN,
+                                    timeout=timeout)
+        return [result['values']['password'] for result in results.values()
+                if result['values'] and result['values']['password']]
+
     @step
     def find_buttons(self):
         """
@@ -283,6 +352,46 @@ class WindowsFramesPromptsPage(BasePage):
         new_window_handle = [handle for handle in handles if handle != original_window_handle][-1]
         return new_window_handle
 
+    @step
+    def collect_new_window_titles(self, buttons, timeout=None):
+        """
+        Clicks buttons that open new windows and collects the titles of the opened windows without switching.
+
+        The windows are tracked through DevTools target info where available and closed together once all
+        titles are read. The time of the sweep is recorded in `metrics` under 'windows.sweep', the open
+        windows and the JS heap of the page before and after the sweep under 'windows.before.*' and
+        'windows.after.*'.
+
+        Args:
+            buttons (list): The WebElements of the buttons to click.
+            timeout (float, optional): time to wait for the windows to load. Defaults to the wait policy.
+
+        Returns:
+            list: The titles of the opened windows.
+        """
+        tracker = WindowTracker(self.driver, self.wait_policy)
+        self.record_window_memory('before', tracker.memory())
+        with metrics.timer('windows.sweep', label=f'{len(buttons)} windows'):
+            for button in buttons:
+                self.click_button(button)
+            windows = tracker.wait_for_windows(len(buttons), timeout)
+            tracker.close(windows)
+        self.record_window_memory('after', tracker.memory())
+        return [window['title'] for window in windows]
+
+    @staticmethod
+    def record_window_memory(stage, report):
+        """
+        Records a memory report of the window tracker in `metrics`.
+
+        Args:
+            stage (str): When the report was taken, e.g. 'before' or 'after'.
+            report (dict): The report returned by `WindowTracker.memory`.
+        """
+        for name, value in report.items():
+            if value is not None:
+                metrics.increment(f'windows.{stage}.{name}', value)
+
     @step
     def switch_back_to_original_window(self, original_window_handle):
         """
@@ -294,13 +403,13 @@ class WindowsFramesPromptsPage(BasePage):
         self.switch_to_window(original_window_handle)
 
     @step
-    def get_result_text(self, expected_text, timeout=10):
+    def get_result_text(self, expected_text, timeout=None):
         """
         Retrieve the result text from the result element on the page after waiting for the specified text to be present.
 
         Args:
             expected_text (str): The text to wait for before retrieving the result.
-            timeout (int): The maximum time to wait for the text to appear (default is 10 seconds).
+            timeout (int): The maximum time to wait for the text to appear. Defaults to the wait policy.
 
         Returns:
             str: The result text that is present in the result element.
@@ -317,7 +426,7 @@ class WindowsFramesPromptsPage(BasePage):
 
         :return: A list of WebElements representing PIN codes.
         """
-        return self.driver.find_elements(*WFPsPageLocators.PINS)
+        return self.find_elements(WFPsPageLocators.PINS)
 
     @step
     def enter_pin_in_alert(self, pin_code):
@@ -331,18 +440,29 @@ class WindowsFramesPromptsPage(BasePage):
         alert.accept()
 
     @step
-    def find_correct_pin(self):
+    def find_correct_pin(self, stub_prompts=True):
         """
-        Iterates through the PIN codes and returns the correct one.
+        Iterates through the PIN codes and returns the secret of the correct one.
 
-        :return: The correct PIN code or None if not found.
+        By default all PIN codes are fed to the page in a single script with stubbed dialogs, see
+        `BasePage.feed_prompts`. With `stub_prompts=False` every PIN code is entered into the native prompt.
+
+        :param stub_prompts: Whether to answer the prompts in the page instead of through native dialogs.
+        :return: The secret of the correct PIN code or None if not found.
         """
+        if stub_prompts:
+            pins = [record['text'] for record in self.snapshot(WFPsPageLocators.PINS)]
+            outcomes = self.feed_prompts(WFPsPageLocators.INPUT_FLD, WFPsPageLocators.RESULT, pins,
+                                         rejected=WFPsPageLocators.WRONG_PIN)
+            secret = outcomes[-1]['result'] if outcomes else None
+            return secret if secret and secret != WFPsPageLocators.WRONG_PIN else None
+
         pins = self.get_all_pin_elements()
         for pin in pins:
             pin_code = pin.text
             self.click(WFPsPageLocators.INPUT_FLD)
             self.switch_to_alert_and_send_keys(pin_code)
             secret = self.get_text_from_element(WFPsPageLocators.RESULT)
-            if secret != 'Неверный пин-код':
+            if secret != WFPsPageLocators.WRONG_PIN:
                 return secret
         return None
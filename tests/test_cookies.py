@@ -3,6 +3,17 @@ import pytest
 from ..pages.cookies_page import CookiesPage, CookiesLocators
 
 
+def open_secret_cookies_page(driver):
+    """
+    Brings a browser into the state of the secret cookies test: the page at `CookiesLocators.URL_1` has set
+    its cookies.
+
+    Args:
+        driver: WebDriver instance the storage state is built with.
+    """
+    CookiesPage(driver).open_url(CookiesLocators.URL_1)
+
+
 class TestCookies:
     @pytest.fixture(autouse=True)
     def setup(self, driver):
@@ -59,6 +70,28 @@ class TestCookies:
         assert result_text == expected, \
             f"Expected result text to be '{expected}', but got '{result_text}'"
 
+    def test_max_expiry_cookie_parallel(self):
+        """
+        Tests the retrieval of the text from a page with the cookie that has the maximum expiry value, loading
+        the linked pages in several tabs at the same time.
+
+        Steps:
+        1. Open the main URL specified by `CookiesLocators.URL_2`.
+        2. Retrieve all URLs from anchor elements (`<a>`).
+        3. Load the URLs in 8 tabs at the same time and read the cookies every tab's responses set.
+        4. Navigate to the URL with the maximum expiry cookie and retrieve the text from the 'result' element.
+        5. Assert that the retrieved text matches the expected value.
+        """
+        expected = '563244506345412334251234560541'
+        self.page.open_url(CookiesLocators.URL_2)
+        urls = self.page.get_all_urls()
+        max_expiry_link = self.page.find_max_expiry_url(urls, concurrency=8)
+        self.page.open_url(max_expiry_link)
+        result_text = self.page.retrieve_result_text()
+
+        assert result_text == expected, \
+            f"Expected result text to be '{expected}', but got '{result_text}'"
+
     def test_sum_secret_cookies(self):
         """
         Tests the summation of values from cookies with 'secret_cookie_' in their names.
@@ -80,6 +113,26 @@ class TestCookies:
 
         assert total == expected, f"Expected secret cookie sum to be '{expected}', but got {total}"
 
+    @pytest.mark.storage_state('secret_cookies.json', build=open_secret_cookies_page)
+    def test_sum_secret_cookies_from_storage_state(self, storage_state):
+        """
+        Tests the summation of the secret cookies restored from a storage state instead of set by a page load.
+
+        The state is built once per run by `open_secret_cookies_page`, captured and shared with every worker,
+        and restored before the test body starts.
+
+        Steps:
+        1. Read the cookies the browser holds for the URL specified by `CookiesLocators.URL_1`, without loading it.
+        2. Filter cookies that contain 'secret_cookie_' in their names.
+        3. Sum the values of the filtered cookies.
+        4. Assert that the total sum matches the expected value.
+        """
+        expected = 4901217
+        total = self.page.sum_secret_cookies(url=CookiesLocators.URL_1)
+
+        assert storage_state['cookies'], "Expected the storage state to hold cookies"
+        assert total == expected, f"Expected secret cookie sum to be '{expected}', but got {total}"
+
     @pytest.mark.parametrize("cookies", [
         [{'name': 'KXIYO4xMrWh', 'value': 'ibyAZPfXAsPqptPaNyL'},
          {'name': '0OIJ4G4ZLzK', 'value': 'kJcPzQu5Jr8ELK'},
@@ -186,12 +239,11 @@ class TestCookies:
         """
         Test method to find the cookie value of the youngest hacker with the most programming languages.
 
-        The test adds each cookie one by one, refreshes the page, and retrieves the age and number
+        The test opens the page once per cookie with the cookie already set, and retrieves the age and number
         of languages listed. It then identifies the youngest hacker with the most languages and
         prints the corresponding cookie value.
         """
         expected_value = "ibyAZPfXAsPqptPaNyL"
 
-        self.page.open_url(CookiesLocators.URL_3)
-        result_value = self.page.find_youngest_hacker(cookies)
+        result_value = self.page.find_youngest_hacker(cookies, CookiesLocators.URL_3)
         assert result_value == expected_value, f"Expected {expected_value}, but got {result_value}"
@@ -1,7 +1,31 @@
+from urllib.parse import quote
+
 import pytest
+from selenium.webdriver.common.by import By
 
+from ..helpers.streams import stream_count, stream_filter, stream_sum
 from ..pages.scrolling_page import ScrollingPage, ScrollingLocators
 
+FEED_ITEMS = 1000
+FEED_PAGE = 'data:text/html;charset=utf-8,' + quote(
+    '<html><body><div id="feed" style="height: 300px; overflow-y: scroll"></div><script>'
+    'var feed = document.getElementById("feed"), loaded = 0;'
+    'function load() {'
+    '  var end = Math.min(loaded + 100, %d), html = "";'
+    '  for (; loaded < end; loaded++) {'
+    '    html += "<span style=\\"display: block\\"" +'
+    '      (loaded === %d - 1 ? " class=\\"last-of-list\\"" : "") + ">" + loaded + "</span>";'
+    '  }'
+    '  feed.insertAdjacentHTML("beforeend", html);'
+    '}'
+    'feed.addEventListener("scroll", function () {'
+    '  if (feed.scrollTop + feed.clientHeight >= feed.scrollHeight - 10 && loaded < %d) { load(); }'
+    '});'
+    'load();'
+    '</script></body></html>' % (FEED_ITEMS, FEED_ITEMS, FEED_ITEMS))
+FEED = (By.ID, 'feed')
+FEED_ITEM = (By.TAG_NAME, 'span')
+
 
 class TestScrolling:
     @pytest.fixture(autouse=True)
@@ -17,16 +41,17 @@ class TestScrolling:
         """
         Tests the functionality of infinite scrolling and interaction with dynamically loaded elements on the webpage.
         This test navigates to the specified URL and interacts with checkboxes inside a scrolling container.
-        It iterates over checkboxes in each dynamically loaded div, clicking only those with even values.
+        It streams the dynamically loaded divs without keeping processed ones, clicking only checkboxes with even
+        values.
         The process continues until 99 div elements have been loaded, after which the test asserts that the
         correct alert text is displayed.
         """
         expected = '5402f04236450f263540jk406504l506'
         self.page.open_url(ScrollingLocators.URL_1)
-        checkbox_rows = self.page.find_all_loaded_divs()
-        self.page.scroll_and_click_even_checkboxes(checkbox_rows, 99)
-        self.page.click_alert_btn()
-        alert_text = self.page.get_alert_text()
+        self.page.stream_and_click_even_checkboxes(99)
+        with self.page.expect_dialog() as dialog:
+            self.page.click_alert_btn()
+        alert_text = dialog['message']
 
         assert alert_text == expected, f"Should be - {expected}, got - {alert_text}"
 
@@ -57,3 +82,39 @@ class TestScrolling:
         total_sum = self.page.sum_span_text_in_scrollbox(spans)
 
         assert total_sum == 499917600, f"Should be - {expected}, got - {total_sum}"
+
+    def test_harvest_and_sum_paragraphs(self):
+        """
+        Tests the in-page harvesting of paragraph values within a scrollable container.
+        This test navigates to a specific URL, streams the values of all paragraphs from the browser in chunks,
+        sums them as they arrive and asserts the total sum.
+        """
+        expected = 499917600
+        self.page.open_url(ScrollingLocators.URL_3)
+        total_sum = self.page.sum_all_paragraphs()
+
+        assert total_sum == expected, f"Should be - {expected}, got - {total_sum}"
+
+    def test_stream_reducers(self):
+        """
+        Tests the streaming reducers over the values of a synthetic infinite-scroll feed of the numbers 0 to 999.
+        Every reducer consumes `iter_values` directly, in chunks smaller than the feed, so several chunks are
+        harvested while the page scrolls.
+        """
+        def values():
+            return self.page.iter_values(FEED, FEED_ITEM, ScrollingLocators.LAST_SPAN_CLASS, chunk_size=150)
+
+        def even(value):
+            return int(value) % 2 == 0
+
+        self.page.open_url(FEED_PAGE)
+        count = stream_count(values())
+        self.page.open_url(FEED_PAGE)
+        even_count = stream_count(values(), even)
+        self.page.open_url(FEED_PAGE)
+        even_sum = stream_sum(stream_filter(values(), even))
+
+        assert count == FEED_ITEMS, f"Should be - {FEED_ITEMS}, got - {count}"
+        assert even_count == FEED_ITEMS // 2, f"Should be - {FEED_ITEMS // 2}, got - {even_count}"
+        assert even_sum == sum(range(0, FEED_ITEMS, 2)), \
+            f"Should be - {sum(range(0, FEED_ITEMS, 2))}, got - {even_sum}"
@@ -14,18 +14,18 @@ class TestWindowsFramesPromptsPage:
         """
         self.page = WindowsFramesPromptsPage(driver)
 
-    def test_iframe(self):
+    @pytest.mark.parametrize("dialogs", [
+        "default", pytest.param("bidi", marks=pytest.mark.bidi)], ids=["default", "bidi"])
+    def test_iframe(self, dialogs):
         """
             Test method to interact with iframes on the page and retrieve a secret code.
+            The bidi variant reads the alert, which may open before its BiDi event arrives, through the dialog
+            listener.
             """
         self.page.open_url(WFPsPageLocators.URL_1)
 
         secret_code = None
-        for iframe in self.page.find_iframes():
-            self.page.switch_to_iframe(iframe)
-            self.page.click_press_me_button()
-            pwd = self.page.get_password_from_iframe()
-            self.page.switch_to_default_content()
+        for pwd in self.page.get_passwords_from_iframes():
             self.page.enter_password(pwd)
             self.page.click_check_button()
             secret_code = self.page.get_secret_from_alert()
@@ -41,67 +41,47 @@ class TestWindowsFramesPromptsPage:
         Steps:
         1. Navigate to the URL defined in `WFPsPageLocators.URL_2`.
         2. Locate all input fields (buttons) using the locator specified in `WFPsPageLocators.INPUT_FLD`.
-        3. For each button:
-           - Click the button.
-           - Switch to the newly opened window.
-           - Convert the window title to an integer and add it to the total sum.
-           - Switch back to the original window.
+        3. Click every button and collect the titles of the opened windows without switching to them.
         4. Verify that the total sum of integers from the window titles equals the expected value.
         """
         expected_total = 77725787998028643152187739088279
-        total = 0
         self.page.open_url(WFPsPageLocators.URL_2)
         buttons = self.page.find_buttons()
-        original_window_handle = self.page.get_current_window_handle()
-
-        for button in buttons:
-            self.page.click_button(button)
-            new_window_handle = self.page.get_new_window_handle(original_window_handle)
-            self.page.switch_to_window(new_window_handle)
-            total += int(self.page.get_page_title())
-            self.page.switch_back_to_original_window(original_window_handle)
+        titles = self.page.collect_new_window_titles(buttons)
+        total = sum(int(title) for title in titles)
 
         assert total == expected_total, f"Expected total: {expected_total}, but got: {total}"
 
-    @pytest.mark.parametrize("x, y, expected_result",
-                             [
-                                 (516, 270, ''),
-                                 (648, 300, ''),
-                                 (680, 340, ''),
-                                 (701, 388, ''),
-                                 (730, 400, ''),
-                                 (750, 421, ''),
-                                 (805, 474, ''),
-                                 (820, 505, ''),
-                                 (855, 557, ''),
-                                 (890, 600, ''),
-                                 (955, 600, '9874163854135461654'),
-                                 (1000, 1000, ''),
-                             ])
-    def test_window_size(self, x, y, expected_result):
+    def test_window_size(self):
         """
-        Test method to validate the behavior of the page when resizing the browser window.
+        Test method to validate the behavior of the page for a list of inner window sizes.
 
         This test:
         1. Opens the specified URL.
-        2. Retrieves inner and outer dimensions of the window.
-        3. Calculates target dimensions to set the browser window size.
-        4. Sets the window size and checks if the result text matches the expected value.
+        2. Applies every inner viewport size in turn within the same browser.
+        3. Checks that the result text of every size matches the expected value.
         """
+        expected_results = {
+            (516, 270): '',
+            (648, 300): '',
+            (680, 340): '',
+            (701, 388): '',
+            (730, 400): '',
+            (750, 421): '',
+            (805, 474): '',
+            (820, 505): '',
+            (855, 557): '',
+            (890, 600): '',
+            (955, 600): '9874163854135461654',
+            (1000, 1000): '',
+        }
         self.page.open_url(WFPsPageLocators.URL_3)
+        results = self.page.sweep_viewport(expected_results)
 
-        inner_width, inner_height = self.page.get_inner_size()
-        outer_width, outer_height = self.page.get_outer_size()
-
-        target_width = outer_width - inner_width
-        target_height = outer_height - inner_height
-
-        self.page.set_window_size(x + target_width, y + target_height)
-
-        result_text = self.page.get_result_text(expected_result)
-        assert result_text == expected_result, f"Expected result: {expected_result}, but got: {result_text}"
+        assert results == expected_results, f"Expected results: {expected_results}, but got: {results}"
 
-    def test_find_correct_pin(self):
+    @pytest.mark.parametrize("stub_prompts", [True, False], ids=["stubbed", "native"])
+    def test_find_correct_pin(self, stub_prompts):
         """
         Tests the functionality of finding the correct PIN code on a webpage.
 
@@ -113,7 +93,7 @@ class TestWindowsFramesPromptsPage:
         Steps:
         1. Open the URL specified by `WFPsPageLocators.URL_4`.
         2. Find all elements representing PIN codes using the locator `WFPsPageLocators.PINS`.
-        3. Iterate over each PIN code:
+        3. Iterate over each PIN code, with stubbed prompts in a single script or through the native prompt:
             - Click on the input field located by `WFPsPageLocators.INPUT_FLD`.
             - Enter the PIN code into the alert prompt.
             - Accept the alert.
@@ -125,6 +105,6 @@ class TestWindowsFramesPromptsPage:
             AssertionError: If the correct secret code is not found.
         """
         self.page.open_url(WFPsPageLocators.URL_4)
-        secret = self.page.find_correct_pin()
+        secret = self.page.find_correct_pin(stub_prompts)
 
         assert secret == '1261851212132345456274632', f"Failed to find the correct PIN code, found - {secret}"